@@ -0,0 +1,104 @@
+"""
+Benchmarks for ynab-unlinked.
+
+Benchmarks run over synthetic budgets of different sizes. Sizes above the `max_size` marker of a
+benchmark (10k by default) are skipped unless `--bench-large` is passed, since some of the code
+being measured is quadratic on the number of transactions.
+
+Run them with `hatch run dev:bench`. Results are stored under `.benchmarks` and can be compared
+against the latest stored run with `hatch run dev:bench-compare`.
+"""
+
+from functools import cache
+from typing import Any
+
+import pytest
+
+from tests.factories import CurrencyFormatFactory
+from tests.helpers.generators import BudgetSpec, SyntheticBudget, generate_budget
+from tests.helpers.statements import BANK_CSV_FORMAT
+from ynab_unlinked.config import ConfigV2
+from ynab_unlinked.config.models.v2 import Budget
+
+BUDGET_SIZES = [1_000, 10_000, 100_000]
+DEFAULT_MAX_SIZE = 10_000
+
+# Name of the benchmark and its extra info, for the benchmarks that measure parsers
+type ParserReport = list[tuple[str, dict[str, Any]]]
+parser_report_key = pytest.StashKey[ParserReport]()
+
+
+def pytest_addoption(parser: pytest.Parser):
+    parser.addoption(
+        "--bench-large",
+        action="store_true",
+        help="Run benchmarks with every budget size regardless of their max_size marker.",
+    )
+
+
+def pytest_configure(config: pytest.Config):
+    config.addinivalue_line(
+        "markers", "max_size(size): largest budget size the benchmark runs with by default"
+    )
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]):
+    if config.getoption("--bench-large"):
+        return
+
+    for item in items:
+        callspec = getattr(item, "callspec", None)
+        if callspec is None or (size := callspec.params.get("budget_size")) is None:
+            continue
+
+        marker = item.get_closest_marker("max_size")
+        max_size = marker.args[0] if marker else DEFAULT_MAX_SIZE
+        if size > max_size:
+            item.add_marker(pytest.mark.skip(reason=f"Size above {max_size}, use --bench-large"))
+
+
+def pytest_terminal_summary(terminalreporter: Any, exitstatus: int, config: pytest.Config):
+    if not (report := config.stash.get(parser_report_key, [])):
+        return
+
+    terminalreporter.section("parser throughput")
+    terminalreporter.write_line(f"{'Name':<50} {'Rows/s':>12} {'Peak RSS (MiB)':>15}")
+    for name, info in report:
+        terminalreporter.write_line(
+            f"{name:<50} {info['rows_per_second']:>12,.0f} {info['peak_rss_mib']:>15.1f}"
+        )
+
+
+@cache
+def cached_budget(size: int) -> SyntheticBudget:
+    return generate_budget(BudgetSpec(size=size))
+
+
+@pytest.fixture(params=BUDGET_SIZES, ids=lambda size: f"{size // 1000}k")
+def budget_size(request: pytest.FixtureRequest) -> int:
+    return request.param
+
+
+@pytest.fixture
+def budget(budget_size: int) -> SyntheticBudget:
+    return cached_budget(budget_size)
+
+
+@pytest.fixture
+def bench_config() -> ConfigV2:
+    return ConfigV2(
+        api_key="benchmark-api-key",
+        budget=Budget(
+            id="benchmark-budget",
+            name="Benchmark Budget",
+            date_format="DD/MM/YYYY",
+            currency_format=CurrencyFormatFactory(),
+        ),
+        payee_rules={"Mercadona": {"MERCADONA S.A."}, "Glovo": {"GLOVO *ONLINE"}},
+        csv_formats={"bank": BANK_CSV_FORMAT},
+    )
+
+
+@pytest.fixture
+def parser_report(request: pytest.FixtureRequest) -> ParserReport:
+    return request.config.stash.setdefault(parser_report_key, [])
@@ -0,0 +1,32 @@
+import os
+import sys
+from collections.abc import Callable
+
+
+def max_rss_of(function: Callable[[], object]) -> int:
+    """Run `function` in a forked process and return its maximum resident set size in bytes."""
+    pid = os.fork()
+    if pid == 0:
+        try:
+            function()
+        except BaseException:
+            os._exit(1)
+        os._exit(0)
+
+    _, status, usage = os.wait4(pid, 0)
+    if os.waitstatus_to_exitcode(status) != 0:
+        raise RuntimeError("The function measured for memory usage failed")
+
+    # Linux reports the maximum RSS in KiB while macOS does it in bytes
+    return usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+
+
+def peak_rss_mib(function: Callable[[], object]) -> float:
+    """
+    Peak memory, in MiB, that `function` needs on top of the memory already used by the process.
+
+    The forked process starts with the memory of the current one, so the usage of a process that
+    does nothing is subtracted.
+    """
+    baseline = max_rss_of(lambda: None)
+    return max(max_rss_of(function) - baseline, 0) / 2**20
@@ -0,0 +1,61 @@
+import json
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+from ynab.api_client import ApiClient
+from ynab.rest import RESTResponse
+
+from benchmarks.memory import peak_rss_mib
+from tests.helpers.generators import SyntheticBudget
+from ynab_unlinked.ynab_api.client import decode_transaction_records
+
+
+def transactions_response(budget: SyntheticBudget) -> RESTResponse:
+    """Response of YNAB with the transactions of the budget, already read"""
+    body = json.dumps(
+        {
+            "data": {
+                "transactions": [
+                    t.model_dump(mode="json", by_alias=True) for t in budget.ynab_transactions
+                ],
+                "server_knowledge": 1,
+            }
+        }
+    ).encode()
+    response = RESTResponse(
+        SimpleNamespace(
+            status=200,
+            reason="OK",
+            data=body,
+            headers={"content-type": "application/json; charset=utf-8"},
+        )
+    )
+    response.read()
+    return response
+
+
+def sdk_models(response: RESTResponse) -> list[Any]:
+    return (
+        ApiClient()
+        .response_deserialize(response, {"200": "TransactionsResponse"})
+        .data.data.transactions
+    )
+
+
+@pytest.mark.max_size(100_000)
+@pytest.mark.parametrize(
+    "decode",
+    [
+        pytest.param(sdk_models, id="sdk-models"),
+        pytest.param(decode_transaction_records, id="records"),
+    ],
+)
+def test_decode_transactions(benchmark: BenchmarkFixture, budget: SyntheticBudget, decode):
+    response = transactions_response(budget)
+
+    transactions = benchmark(decode, response)
+
+    benchmark.extra_info["peak_rss_mib"] = peak_rss_mib(lambda: decode(response))
+    assert len(transactions) == len(budget.ynab_transactions)
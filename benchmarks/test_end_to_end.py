@@ -0,0 +1,148 @@
+"""
+End-to-end benchmarks of `yul load` and `yul reconcile` against a local fake of the YNAB API.
+
+Requests go through the real client, over HTTP, to a server that answers with a latency of
+`FAKE_LATENCY` seconds. The server and the import ledger are reset before every round, so all
+rounds import to and reconcile the same budget.
+"""
+
+from collections.abc import Generator
+from functools import cache
+from itertools import batched
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+from pytest_mock import MockerFixture
+
+from tests.helpers.fake_ynab import FakeYnab
+from tests.helpers.generators import BudgetSpec, SyntheticBudget, generate_budget
+from tests.helpers.statements import write_sabadell_txt
+from ynab_unlinked.commands.reconcile import (
+    RECONCILE_CHUNK_SIZE,
+    accounts_to_reconcile,
+    build_choices,
+    fetch_transactions_to_reconcile,
+)
+from ynab_unlinked.config import ConfigV2
+from ynab_unlinked.config.models.shared import EntityConfig
+from ynab_unlinked.context_object import YnabUnlinkedContext
+from ynab_unlinked.entities.sabadell.sabadell import SabadellParser
+from ynab_unlinked.formatter import Formatter
+from ynab_unlinked.journal import JournalEntry
+from ynab_unlinked.ledger import ImportLedger
+from ynab_unlinked.models import PartialMatchPolicy
+from ynab_unlinked.process import PipelineResult, import_in_chunks, preprocess_transactions
+from ynab_unlinked.ynab_api import Client
+
+# Seconds each request to the fake server takes, roughly a round trip to YNAB
+FAKE_LATENCY = 0.02
+# Sabadell statements only have day and month, so every transaction is kept within one year
+STATEMENT_YEAR = 2025
+
+
+@cache
+def statement_budget(size: int) -> SyntheticBudget:
+    return generate_budget(BudgetSpec(size=size, date_spread_days=120))
+
+
+@pytest.fixture
+def fake_ynab(budget_size: int, bench_config: ConfigV2) -> Generator[FakeYnab]:
+    budget = statement_budget(budget_size)
+    with FakeYnab(budget, budget_id=bench_config.budget.id, latency=FAKE_LATENCY) as server:
+        yield server
+
+
+@pytest.fixture
+def client(fake_ynab: FakeYnab, bench_config: ConfigV2) -> Client:
+    return Client(bench_config.api_key, host=fake_ynab.url)
+
+
+@pytest.mark.parametrize("imported", [False, True], ids=["new", "imported"])
+def test_load(
+    benchmark: BenchmarkFixture,
+    fake_ynab: FakeYnab,
+    client: Client,
+    bench_config: ConfigV2,
+    tmp_path: Path,
+    mocker: MockerFixture,
+    imported: bool,
+):
+    """Import a statement, either new or already imported in a previous run"""
+    mocker.patch.object(ConfigV2, "save")
+    mocker.patch("ynab_unlinked.config.paths.cache_dir", return_value=tmp_path / "cache")
+    account_id = fake_ynab.budget.spec.account_id
+    entity = SabadellParser(year=STATEMENT_YEAR)
+    statement = write_sabadell_txt(tmp_path / "sabadell.txt", fake_ynab.budget.transactions)
+    context = YnabUnlinkedContext(
+        config=bench_config,
+        formatter=Formatter(
+            date_format=bench_config.budget.date_format,
+            currency_format=bench_config.budget.currency_format,
+        ),
+        extras=None,
+        assume_yes=True,
+        quiet=True,
+        partial_matches=PartialMatchPolicy.REJECT,
+    )
+
+    def setup():
+        fake_ynab.reset()
+        bench_config.entities[entity.name()] = EntityConfig(account_id=account_id)
+        ImportLedger.path(account_id).unlink(missing_ok=True)
+        if imported:
+            transactions = entity.parse(statement, context)
+            preprocess_transactions(transactions, None)
+            ImportLedger(account_id).add(transactions)
+        return (), {}
+
+    def load() -> PipelineResult:
+        return import_in_chunks(entity, statement, context, account_id, client=client)
+
+    result = benchmark.pedantic(load, setup=setup, rounds=3)
+
+    benchmark.extra_info["api_calls"] = len(fake_ynab.requests)
+    if imported:
+        assert result.skipped == result.parsed
+        assert fake_ynab.requests == []
+        return
+
+    assert result.created > 0
+    assert ("POST", f"/budgets/{bench_config.budget.id}/transactions") in fake_ynab.requests
+
+
+def test_reconcile(
+    benchmark: BenchmarkFixture, fake_ynab: FakeYnab, client: Client, bench_config: ConfigV2
+):
+    budget_id = bench_config.budget.id
+
+    def reconcile() -> int:
+        accounts = client.accounts(budget_id)
+        transactions = fetch_transactions_to_reconcile(
+            client, budget_id, accounts_to_reconcile(accounts, bench_config), since_date=None
+        )
+        choices = build_choices(transactions, accounts)
+        # As if every account was selected in the app
+        for choice in choices:
+            choice.select()
+        entries = [
+            JournalEntry(
+                id=child.transaction.id,
+                account_id=child.transaction.account_id,
+                date=child.transaction.var_date,
+            )
+            for choice in choices
+            for child in choice.selected_choices()
+        ]
+        for chunk in batched(entries, RECONCILE_CHUNK_SIZE, strict=False):
+            client.update_transactions(budget_id, chunk)
+        return len(entries)
+
+    def setup():
+        fake_ynab.reset()
+        return (), {}
+
+    n_reconciled = benchmark.pedantic(reconcile, setup=setup, rounds=3)
+
+    benchmark.extra_info["api_calls"] = len(fake_ynab.requests)
+    assert n_reconciled > 0
@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+from ynab import Payee
+
+from tests.helpers.generators import SyntheticBudget
+from ynab_unlinked.config import ConfigV2
+from ynab_unlinked.matcher import MatchingIndex, match_transactions, match_transactions_windowed
+from ynab_unlinked.models import Transaction, TransactionWithYnabData
+from ynab_unlinked.payee import set_payee_from_ynab
+from ynab_unlinked.process import preprocess_transactions
+
+
+@dataclass
+class PayeesClient:
+    """Client stand-in that only serves the payees of a synthetic budget"""
+
+    payees_list: list[Payee]
+
+    def payees(self, budget_id: str) -> list[Payee]:
+        return self.payees_list
+
+
+def fresh_transactions(budget: SyntheticBudget) -> list[TransactionWithYnabData]:
+    return [TransactionWithYnabData(t) for t in budget.transactions]
+
+
+@pytest.mark.max_size(1_000)
+def test_match_transactions(
+    benchmark: BenchmarkFixture, budget: SyntheticBudget, bench_config: ConfigV2
+):
+    def setup():
+        args = (fresh_transactions(budget), budget.ynab_transactions, False, bench_config)
+        return args, {}
+
+    benchmark.pedantic(match_transactions, setup=setup, rounds=3)
+
+
+@pytest.mark.max_size(10_000)
+def test_match_transactions_windowed(
+    benchmark: BenchmarkFixture, budget: SyntheticBudget, bench_config: ConfigV2
+):
+    ynab_transactions = sorted(budget.ynab_transactions, key=lambda t: t.var_date)
+
+    def setup():
+        index = MatchingIndex(ynab_transactions)
+        return (fresh_transactions(budget), index, False, bench_config), {}
+
+    benchmark.pedantic(match_transactions_windowed, setup=setup, rounds=3)
+
+
+@pytest.mark.max_size(1_000)
+def test_set_payee_from_ynab(
+    benchmark: BenchmarkFixture, budget: SyntheticBudget, bench_config: ConfigV2
+):
+    client = PayeesClient(budget.payees)
+
+    def setup():
+        return (fresh_transactions(budget), client, bench_config), {}
+
+    benchmark.pedantic(set_payee_from_ynab, setup=setup, rounds=3)
+
+
+@pytest.mark.max_size(100_000)
+def test_preprocess_transactions(benchmark: BenchmarkFixture, budget: SyntheticBudget):
+    def setup():
+        transactions = [Transaction(t.date, t.payee, t.amount) for t in budget.transactions]
+        return (transactions, None), {}
+
+    benchmark.pedantic(preprocess_transactions, setup=setup, rounds=5)
@@ -0,0 +1,235 @@
+import datetime as dt
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from benchmarks.conftest import ParserReport
+from benchmarks.memory import peak_rss_mib
+from tests.helpers import statements
+from tests.helpers.generators import BudgetSpec, SyntheticBudget, generate_transactions
+from ynab_unlinked.config import ConfigV2
+from ynab_unlinked.context_object import YnabUnlinkedContext
+from ynab_unlinked.entities.bbva.bbva import BBVA, PDF_HEADER, XLSX_ROW_TO_READ
+from ynab_unlinked.entities.cobee.cobee import Cobee, CobeeContext, Language
+from ynab_unlinked.entities.csv.csv import CsvParser
+from ynab_unlinked.entities.sabadell.sabadell import SabadellParser
+from ynab_unlinked.formatter import Formatter
+from ynab_unlinked.models import Transaction
+from ynab_unlinked.parsers import pdf, xls
+
+type Parse = Callable[[Path, YnabUnlinkedContext], object]
+
+
+@dataclass(frozen=True)
+class StatementFormat:
+    name: str
+    write: Callable[[Path, list[Transaction]], Path]
+    parse: Parse
+    extras: object = None
+
+
+def cobee_format(language: Language) -> StatementFormat:
+    return StatementFormat(
+        name=f"cobee-{language.value}",
+        write=lambda path, transactions: statements.write_cobee_html(
+            path / "cobee.html", transactions, language
+        ),
+        parse=Cobee().parse,
+        extras=CobeeContext(language=language),
+    )
+
+
+BANK_CSV = StatementFormat(
+    "bank-csv",
+    lambda path, transactions: statements.write_bank_csv(path / "bank.csv", transactions),
+    CsvParser("bank").parse,
+)
+SABADELL_TXT = StatementFormat(
+    "sabadell-txt",
+    lambda path, transactions: statements.write_sabadell_txt(path / "sabadell.txt", transactions),
+    SabadellParser(year=2025).parse,
+)
+SABADELL_XLS = StatementFormat(
+    "sabadell-xls",
+    lambda path, transactions: statements.write_sabadell_xls(path / "sabadell.xls", transactions),
+    SabadellParser(year=2025).parse,
+)
+BBVA_XLSX = StatementFormat(
+    "bbva-xlsx",
+    lambda path, transactions: statements.write_bbva_xlsx(path / "bbva.xlsx", transactions),
+    BBVA().parse,
+)
+BBVA_PDF = StatementFormat(
+    "bbva-pdf",
+    lambda path, transactions: statements.write_bbva_pdf(path / "bbva.pdf", transactions),
+    BBVA().parse,
+)
+
+ENTITY_FORMATS = [
+    pytest.param(BANK_CSV, marks=pytest.mark.max_size(100_000), id=BANK_CSV.name),
+    pytest.param(SABADELL_TXT, marks=pytest.mark.max_size(100_000), id=SABADELL_TXT.name),
+    pytest.param(SABADELL_XLS, id=SABADELL_XLS.name),
+    pytest.param(BBVA_XLSX, id=BBVA_XLSX.name),
+    pytest.param(BBVA_PDF, id=BBVA_PDF.name),
+    *(pytest.param(cobee_format(language), id=f"cobee-{language.value}") for language in Language),
+]
+
+# Raw readers measured on their own, without the entity on top
+PARSER_FORMATS = [
+    pytest.param(
+        StatementFormat(
+            "parsers.xls",
+            BBVA_XLSX.write,
+            lambda path, _: list(xls(path, read_after_row_like=XLSX_ROW_TO_READ)),
+        ),
+        id="parsers.xls",
+    ),
+    pytest.param(
+        StatementFormat(
+            "parsers.pdf",
+            BBVA_PDF.write,
+            lambda path, _: list(pdf(path, expected_number_of_columns=3)),
+        ),
+        # Table extraction from PDFs takes around a tenth of a second per page
+        marks=pytest.mark.max_size(1_000),
+        id="parsers.pdf",
+    ),
+    pytest.param(
+        StatementFormat(
+            "parsers.pdf-text",
+            BBVA_PDF.write,
+            lambda path, _: list(pdf(path, expected_number_of_columns=3, header=PDF_HEADER)),
+        ),
+        id="parsers.pdf-text",
+    ),
+]
+
+_statements: dict[tuple[str, int], Path] = {}
+
+
+@pytest.fixture
+def statement_file(
+    request: pytest.FixtureRequest,
+    tmp_path_factory: pytest.TempPathFactory,
+    budget: SyntheticBudget,
+) -> Path:
+    """Statement with the transactions of the budget, written once per format and size."""
+    statement_format: StatementFormat = request.node.callspec.params["statement_format"]
+    key = (statement_format.name, budget.spec.size)
+    if key not in _statements:
+        path = tmp_path_factory.mktemp(f"{statement_format.name}-{budget.spec.size}")
+        _statements[key] = statement_format.write(path, budget.transactions)
+    return _statements[key]
+
+
+def measure_parser(
+    benchmark: BenchmarkFixture,
+    report: ParserReport,
+    statement_format: StatementFormat,
+    statement_file: Path,
+    budget: SyntheticBudget,
+    config: ConfigV2,
+    since: dt.date | None = None,
+):
+    context = YnabUnlinkedContext(
+        config=config,
+        formatter=Formatter(config.budget.date_format, config.budget.currency_format),
+        extras=statement_format.extras,
+    )
+
+    kwargs = {} if since is None else {"since": since}
+    benchmark.pedantic(
+        statement_format.parse, args=(statement_file, context), kwargs=kwargs, rounds=3
+    )
+
+    # Nothing is measured with --benchmark-disable
+    if not benchmark.stats:
+        return
+
+    rows = budget.spec.size
+    benchmark.extra_info["rows"] = rows
+    benchmark.extra_info["rows_per_second"] = rows / benchmark.stats.stats.mean
+    benchmark.extra_info["peak_rss_mib"] = peak_rss_mib(
+        lambda: statement_format.parse(statement_file, context, **kwargs)
+    )
+    report.append((benchmark.name, benchmark.extra_info))
+
+
+@pytest.mark.parametrize("statement_format", ENTITY_FORMATS)
+def test_entity_parse(
+    benchmark: BenchmarkFixture,
+    statement_format: StatementFormat,
+    statement_file: Path,
+    budget: SyntheticBudget,
+    bench_config: ConfigV2,
+    parser_report: ParserReport,
+):
+    measure_parser(benchmark, parser_report, statement_format, statement_file, budget, bench_config)
+
+
+@pytest.mark.parametrize("statement_format", ENTITY_FORMATS)
+def test_entity_parse_since(
+    benchmark: BenchmarkFixture,
+    statement_format: StatementFormat,
+    statement_file: Path,
+    budget: SyntheticBudget,
+    bench_config: ConfigV2,
+    parser_report: ParserReport,
+):
+    """Parse only the newest tenth of the statement, as after a previous import"""
+    since = budget.transactions[len(budget.transactions) // 10].date
+    measure_parser(
+        benchmark, parser_report, statement_format, statement_file, budget, bench_config, since
+    )
+
+
+@pytest.mark.parametrize("statement_format", PARSER_FORMATS)
+def test_parser(
+    benchmark: BenchmarkFixture,
+    statement_format: StatementFormat,
+    statement_file: Path,
+    budget: SyntheticBudget,
+    bench_config: ConfigV2,
+    parser_report: ParserReport,
+):
+    measure_parser(benchmark, parser_report, statement_format, statement_file, budget, bench_config)
+
+
+@pytest.mark.parametrize("header", [None, PDF_HEADER], ids=["tables", "text"])
+def test_pdf_memory_by_pages(
+    benchmark: BenchmarkFixture,
+    tmp_path: Path,
+    header: list[str] | None,
+    parser_report: ParserReport,
+):
+    """Peak memory reading a PDF does not grow with its number of pages"""
+
+    def read(path: Path):
+        for _ in pdf(path, expected_number_of_columns=3, header=header):
+            pass
+
+    peaks: dict[int, float] = {}
+    for pages in (25, 250):
+        transactions = generate_transactions(
+            BudgetSpec(size=pages * (statements.PDF_ROWS_PER_PAGE - 1))
+        )
+        path = statements.write_bbva_pdf(tmp_path / f"bbva-{pages}.pdf", transactions)
+        peaks[pages] = peak_rss_mib(partial(read, path))
+
+    benchmark.pedantic(read, args=(path,), rounds=1)
+
+    # Nothing is measured with --benchmark-disable
+    if benchmark.stats:
+        rows = len(transactions)
+        benchmark.extra_info["rows"] = rows
+        benchmark.extra_info["rows_per_second"] = rows / benchmark.stats.stats.mean
+        benchmark.extra_info["peak_rss_mib"] = peaks[250]
+        benchmark.extra_info["peak_rss_mib_25_pages"] = peaks[25]
+        parser_report.append((benchmark.name, benchmark.extra_info))
+
+    # Allow for some noise, memory growing with the pages would be several times larger
+    assert peaks[250] < 1.5 * peaks[25] + 10
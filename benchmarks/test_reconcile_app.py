@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+from textual.widgets import DataTable
+
+from tests.factories import AccountFactory
+from tests.helpers.generators import SyntheticBudget
+from ynab_unlinked.commands.apps.reconcile import AccountTable, Reconcile
+from ynab_unlinked.commands.reconcile import build_choices
+from ynab_unlinked.config import ConfigV2
+from ynab_unlinked.formatter import Formatter
+
+N_ACCOUNTS = 25
+
+
+def build_app(budget: SyntheticBudget, config: ConfigV2) -> Reconcile:
+    accounts = AccountFactory.create_batch(N_ACCOUNTS)
+    transactions = [
+        t.model_copy(update={"account_id": accounts[idx % N_ACCOUNTS].id})
+        for idx, t in enumerate(budget.ynab_transactions)
+    ]
+    formatter = Formatter(
+        date_format=config.budget.date_format, currency_format=config.budget.currency_format
+    )
+    return Reconcile(config, build_choices(transactions, accounts), formatter=formatter)
+
+
+@pytest.mark.max_size(100_000)
+def test_time_to_first_frame(
+    benchmark: BenchmarkFixture, budget: SyntheticBudget, bench_config: ConfigV2
+):
+    async def run(app: Reconcile):
+        async with app.run_test() as pilot:
+            await pilot.pause()
+
+    def setup():
+        return (build_app(budget, bench_config),), {}
+
+    benchmark.pedantic(lambda app: asyncio.run(run(app)), setup=setup, rounds=3)
+
+
+def test_toggle_transaction(
+    benchmark: BenchmarkFixture, budget: SyntheticBudget, bench_config: ConfigV2
+):
+    app = build_app(budget, bench_config)
+
+    async def run():
+        async with app.run_test() as pilot:
+            account_table = app.query_one(AccountTable)
+            table = account_table.query_one(DataTable)
+            row_key = table.coordinate_to_cell_key(table.cursor_coordinate).row_key
+            event = DataTable.RowSelected(table, 0, row_key)
+
+            benchmark(account_table.on_data_table_row_selected, event)
+            await pilot.pause()
+
+    asyncio.run(run())
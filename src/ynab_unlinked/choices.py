@@ -1,13 +1,21 @@
 from __future__ import annotations
 
-from ynab import Account, TransactionDetail
+from collections.abc import Generator
+
+from ynab import Account
+
+from ynab_unlinked.models import YnabTransaction
+
+# Contribution of a choice to the selection counters of its parent:
+# (not forced, not forced and selected, forced to selected)
+type SelectionCounts = tuple[int, int, int]
 
 
 class Choice:
     def __init__(
         self,
         id: str,
-        transaction: TransactionDetail | None = None,
+        transaction: YnabTransaction | None = None,
         account: Account | None = None,
         title: str = "",
         choices: list[str | Choice] | None = None,
@@ -19,21 +27,48 @@ class Choice:
         self._transaction = transaction
         self._account = account
         self.choices: list[Choice] = []
-        self.selected = selected
+        self._selected = selected
         self._forced_selection: bool | None = None
         self.parent = parent
+        # Selection counters over the direct children, updated every time a child changes
+        # so that selection queries do not need to walk the children
+        self._free_children = 0
+        self._free_selected_children = 0
+        self._forced_selected_children = 0
+        self._by_id: dict[str, Choice] | None = None
         if choices is not None:
             n = 0
             for choice in choices:
                 if isinstance(choice, str):
-                    self.choices.append(Choice(title=choice, id=f"{self.id}-{n}", parent=self))
+                    self._add_child(Choice(title=choice, id=f"{self.id}-{n}", parent=self))
                     n += 1
                 else:
                     choice.parent = self
-                    self.choices.append(choice)
+                    self._add_child(choice)
+
+    def _add_child(self, child: Choice):
+        self.choices.append(child)
+        self._update_counts((0, 0, 0), child._selection_counts())
+
+    def _selection_counts(self) -> SelectionCounts:
+        if self._forced_selection is None:
+            return 1, int(self._selected), 0
+        return 0, 0, int(self._forced_selection)
+
+    def _update_counts(self, before: SelectionCounts, after: SelectionCounts):
+        self._free_children += after[0] - before[0]
+        self._free_selected_children += after[1] - before[1]
+        self._forced_selected_children += after[2] - before[2]
+
+    def _set_state(self, selected: bool, forced_selection: bool | None):
+        before = self._selection_counts()
+        self._selected = selected
+        self._forced_selection = forced_selection
+        if self.parent is not None:
+            self.parent._update_counts(before, self._selection_counts())
 
     @property
-    def transaction(self) -> TransactionDetail:
+    def transaction(self) -> YnabTransaction:
         if self._transaction is None:
             raise ValueError(
                 f"Transaction is needed in choice {self.id!r} but has not been provided."
@@ -49,6 +84,15 @@ class Choice:
     def has_choices(self) -> bool:
         return len(self.choices) > 0
 
+    @property
+    def selected(self) -> bool:
+        """The own selected flag of the choice, regardless of its parent or forced selection."""
+        return self._selected
+
+    @selected.setter
+    def selected(self, value: bool):
+        self._set_state(value, self._forced_selection)
+
     def select(self):
         """Mark the choice as selected. This implicitely select all child choices."""
         self.selected = True
@@ -66,43 +110,52 @@ class Choice:
     @property
     def is_selected(self) -> bool:
         """If the choice has a parent that is selected, it is considered selected."""
-        if self.is_forced_selected():
-            assert self._forced_selection is not None, (
-                "Cannot have forced seleciton and not have it set"
-            )
+        if self._forced_selection is not None:
             return self._forced_selection
 
-        if self.parent is not None and self.parent.is_selected:
-            return True
-        return self.selected
+        return self._selected or (self.parent is not None and self.parent.is_selected)
 
     def enable_forced_selected(self, value: bool | None):
-        self._forced_selection = value
+        self._set_state(self._selected, value)
 
     def disable_forced_selected(self):
-        self._forced_selection = None
+        self._set_state(self._selected, None)
 
     def is_forced_selected(self) -> bool:
         """Whether we need to ignore selected logic and apply any forced selection enforced from the outside"""
         return self._forced_selection is not None
 
+    @property
+    def selected_count(self) -> int:
+        """Number of inner choices that are selected"""
+        free_selected = self._free_children if self.is_selected else self._free_selected_children
+        return self._forced_selected_children + free_selected
+
     @property
     def has_selected_choices(self) -> bool:
         """Returns whether or not any of the inner choices is selected"""
-        return any(child.is_selected for child in self.choices)
+        return self.selected_count > 0
+
+    def selected_choices(self) -> Generator[Choice]:
+        """Yield the inner choices that are selected"""
+        if self.selected_count == 0:
+            return
+
+        yield from (child for child in self.choices if child.is_selected)
 
     def to_dict(self) -> dict[str, Choice]:
         """
         Return a dictionary where the key is the id of the Choice and the value is the choice.
 
-        This dictionary flattens out all children choices.
+        This dictionary flattens out all children choices. It is built only once since
+        choices cannot be added after creation.
         """
-        if not hasattr(self, "__dict"):
-            dict_value: dict[str, Choice] = {self.id: self}
+        if self._by_id is None:
+            by_id: dict[str, Choice] = {self.id: self}
 
             for choice in self.choices:
-                dict_value |= choice.to_dict()
+                by_id |= choice.to_dict()
 
-            self.__dict = dict_value
+            self._by_id = by_id
 
-        return self.__dict
+        return self._by_id
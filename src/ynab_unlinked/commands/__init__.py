@@ -1,5 +1,6 @@
 from .config import config_app
 from .load import load
 from .reconcile import reconcile
+from .sync import sync
 
-__all__ = ["config_app", "load", "reconcile"]
+__all__ = ["config_app", "load", "reconcile", "sync"]
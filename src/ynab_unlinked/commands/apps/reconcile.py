@@ -1,12 +1,22 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 from functools import partial
 
 from textual.app import App
 from textual.containers import Container, Grid, Horizontal, VerticalScroll
 from textual.message import Message
 from textual.screen import ModalScreen
-from textual.widgets import Button, DataTable, Footer, Header, Label, Static, Switch
+from textual.widgets import (
+    Button,
+    Collapsible,
+    DataTable,
+    Footer,
+    Header,
+    Label,
+    Static,
+    Switch,
+)
 from ynab import TransactionClearedStatus
 
 from ynab_unlinked.choices import Choice
@@ -16,6 +26,11 @@ from ynab_unlinked.models import TransactionWithYnabData
 
 POSITIVE_COLOR = "lightgreen"
 NEGATIVE_COLOR = "lightcoral"
+CLEARED_STATUS_COLUMN = "cleared-status"
+# Rows are added to the account tables in pages as the user scrolls through them
+PAGE_SIZE = 100
+# Number of rows before reaching the end of the table at which the next page is loaded
+PAGE_LOAD_MARGIN = 10
 
 
 class AccountTable(Container):
@@ -24,10 +39,12 @@ class AccountTable(Container):
             self.value = value
             super().__init__()
 
-    def __init__(self, choice: Choice, formatter: Formatter):
+    def __init__(self, choice: Choice, formatter: Formatter, collapsed: bool = False):
         self.formatter = formatter
         self.choice = choice
         self.include_uncleared = False
+        self.collapsed = collapsed
+        self._table: DataTable | None = None
         # By default lets mark the account for reconciliation
         self.choice.select()
         super().__init__()
@@ -40,7 +57,12 @@ class AccountTable(Container):
                 with Horizontal(id="switch-container"):
                     yield Label("Reconcile")
                     yield Switch(self.choice.is_selected, id=f"reconcile-{self.choice.id}")
-            yield self.choice_to_table()
+            # The transactions table is only built when the account is expanded
+            with Collapsible(
+                title=f"Transactions ({len(self.choice.choices)})", collapsed=self.collapsed
+            ):
+                if not self.collapsed:
+                    yield self.choice_to_table()
 
     def _account_balances(self) -> str:
         account = self.choice.account
@@ -75,9 +97,21 @@ class AccountTable(Container):
         table.add_column("Payee")
         table.add_column("Inflow")
         table.add_column("Outflow")
-        table.add_column("Cleared Status")
+        table.add_column("Cleared Status", key=CLEARED_STATUS_COLUMN)
 
-        for choice in self.choice.choices:
+        self._table = table
+        self.load_next_page()
+
+        self.log.info(table)
+        return table
+
+    def load_next_page(self):
+        """Add the next page of transactions to the table, if any is left."""
+        if self._table is None:
+            return
+
+        table = self._table
+        for choice in self.choice.choices[table.row_count : table.row_count + PAGE_SIZE]:
             t = choice.transaction
             amount = t.amount / 1000
             table.add_row(
@@ -89,15 +123,54 @@ class AccountTable(Container):
                 key=choice.id,
             )
 
-        self.log.info(table)
-        return table
+    def on_mount(self):
+        if self._table is not None:
+            self._track_table_scroll(self._table)
+
+    def _track_table_scroll(self, table: DataTable):
+        def load_if_needed(scroll_y: float):
+            if scroll_y >= table.max_scroll_y - PAGE_LOAD_MARGIN:
+                self.load_next_page()
+
+        self.watch(table, "scroll_y", load_if_needed, init=False)
+
+    async def on_collapsible_expanded(self, event: Collapsible.Expanded):
+        if self._table is not None:
+            return
+
+        table = self.choice_to_table()
+        await event.collapsible.query_one(Collapsible.Contents).mount(table)
+        self._track_table_scroll(table)
+
+    def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted):
+        if event.cursor_row >= event.data_table.row_count - PAGE_LOAD_MARGIN:
+            self.load_next_page()
+
+    def refresh_cleared_status(self, choices: Iterable[Choice] | None = None):
+        """
+        Update the cleared status cell of the given choices, or of every transaction if
+        none are given.
+
+        Only the cleared status depends on the selection, so there is no need to recompose the
+        table and format every row again when the selection changes. Rows that have not been
+        loaded yet are skipped, they get the right status when their page is loaded.
+        """
+        if (table := self._table) is None:
+            return
+
+        if choices is None:
+            choices = self.choice.choices[: table.row_count]
+
+        for choice in choices:
+            if choice.id in table.rows:
+                table.update_cell(choice.id, CLEARED_STATUS_COLUMN, self._cleared_status(choice))
 
     def on_switch_changed(self, event: Switch.Changed):
         if event.switch.value:
             self.choice.select()
         else:
             self.choice.deselect()
-        self.refresh(recompose=True)
+        self.refresh_cleared_status()
 
     def select(self):
         self.query_one(Switch).value = True
@@ -115,23 +188,25 @@ class AccountTable(Container):
             return
 
         child.toggle_selection()
-        self.refresh(recompose=True)
+        self.refresh_cleared_status([child])
 
     def refresh_forced_selection(self, value: bool):
-        for choice in self.choice.choices:
+        # Only uncleared transactions have their selection forced so they are the only
+        # rows that can change
+        uncleared = [
+            choice
+            for choice in self.choice.choices
+            if choice.transaction.cleared is TransactionClearedStatus.UNCLEARED
+        ]
+        for choice in uncleared:
             if value:
                 # Ensure uncleared are allowed to be selected
                 choice.disable_forced_selected()
             else:
                 # When uncleared, a transaction must always be unslected
-                forced_selection = (
-                    False
-                    if choice.transaction.cleared is TransactionClearedStatus.UNCLEARED
-                    else None
-                )
-                choice.enable_forced_selected(forced_selection)
+                choice.enable_forced_selected(False)
 
-        self.refresh(recompose=True)
+        self.refresh_cleared_status(uncleared)
 
 
 class ReconcileModal(ModalScreen[int]):
@@ -142,7 +217,7 @@ class ReconcileModal(ModalScreen[int]):
     def compose(self):
         accounts_lines = []
         for choice in self.choices:
-            n_child_selected = sum(child.is_selected for child in choice.choices)
+            n_child_selected = choice.selected_count
             counter_str = (
                 "All transactions"
                 if n_child_selected == len(choice.choices)
@@ -187,8 +262,9 @@ class Reconcile(App[int]):
             id="main-description",
         )
         with VerticalScroll(id="main-container"):
-            for choice in self.choices:
-                yield AccountTable(choice, formatter=self.formatter)
+            for idx, choice in enumerate(self.choices):
+                # Only the first account is expanded, the rest are built when expanded
+                yield AccountTable(choice, formatter=self.formatter, collapsed=idx > 0)
         with Horizontal(id="button-row"):
             yield Label("Include Uncleared")
             yield Switch(False, id="uncleared-switch")
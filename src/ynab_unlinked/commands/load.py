@@ -1,11 +1,13 @@
 import importlib
 import pkgutil
+from pathlib import Path
 from typing import Annotated
 
 import typer
 
 from ynab_unlinked import entities
 from ynab_unlinked.context_object import YnabUnlinkedContext
+from ynab_unlinked.models import PartialMatchPolicy
 
 load = typer.Typer(
     help="Load transactions from a bank statement into your YNAB account.",
@@ -45,6 +47,80 @@ def load_callback(
             show_default=True,
         ),
     ] = 15,
+    full: Annotated[
+        bool,
+        typer.Option(
+            "--full",
+            help=(
+                "Process every transaction in the input file, including the ones older than the "
+                "last import and the ones already imported in previous runs."
+            ),
+        ),
+    ] = False,
+    yes: Annotated[
+        bool,
+        typer.Option(
+            "--yes",
+            help=(
+                "Do not ask for confirmation. Partial matches are handled as set by "
+                "--partial-matches, rejecting them if it is left to ask."
+            ),
+        ),
+    ] = False,
+    quiet: Annotated[
+        bool,
+        typer.Option(
+            "-q",
+            "--quiet",
+            help=(
+                "Do not show the transactions to import. Together with --yes, transactions "
+                "are matched and uploaded in chunks, without any prompt or table."
+            ),
+        ),
+    ] = False,
+    partial_matches: Annotated[
+        PartialMatchPolicy,
+        typer.Option(
+            "--partial-matches",
+            help="What to do with transactions that match in date and amount but not in payee.",
+            case_sensitive=False,
+        ),
+    ] = PartialMatchPolicy.ASK,
+    profile: Annotated[
+        bool,
+        typer.Option(
+            "--profile",
+            envvar="YUL_PROFILE",
+            help=(
+                "Show how long each phase of the import took, with the rows processed and the "
+                "requests made to YNAB."
+            ),
+        ),
+    ] = False,
+    profile_output: Annotated[
+        Path | None,
+        typer.Option(
+            "--profile-output",
+            envvar="YUL_PROFILE_OUTPUT",
+            dir_okay=False,
+            help=(
+                "Write the profile to this file. A Chrome trace is written if it ends in .json, "
+                "otherwise a cProfile dump readable with pstats. Implies --profile."
+            ),
+        ),
+    ] = None,
+    metrics_file: Annotated[
+        Path | None,
+        typer.Option(
+            "--metrics-file",
+            envvar="YUL_METRICS_FILE",
+            dir_okay=False,
+            help=(
+                "Append a JSON line to this file with the metrics of the import: transaction "
+                "counts, requests to YNAB and their latency, and the duration of each phase."
+            ),
+        ),
+    ] = None,
 ):
     obj: YnabUnlinkedContext = context.obj
 
@@ -52,6 +128,38 @@ def load_callback(
     obj.reconcile = reconcile
     obj.choose_account = account
     obj.buffer = buffer
+    obj.full = full
+    obj.assume_yes = yes
+    obj.quiet = quiet
+    obj.partial_matches = partial_matches
+
+    enable_profiling(context, "load", profile, profile_output, metrics_file)
+
+
+def enable_profiling(
+    context: typer.Context,
+    command: str,
+    profile: bool,
+    profile_output: Path | None,
+    metrics_file: Path | None,
+):
+    """Profile the command if asked to, reporting the profile and the metrics once it ends"""
+    obj: YnabUnlinkedContext = context.obj
+
+    if profile or profile_output is not None or metrics_file is not None:
+        from ynab_unlinked.profiling import Profiler
+
+        obj.profiler = Profiler(
+            output=profile_output, summary=profile or profile_output is not None
+        )
+        context.call_on_close(obj.profiler.report)
+
+    if metrics_file is not None:
+        from ynab_unlinked.metrics import metrics_record, write_metrics
+
+        context.call_on_close(
+            lambda: write_metrics(metrics_file, metrics_record(command, obj.metrics, obj.profiler))
+        )
 
 
 # Dynamically load all entities commands when present
@@ -1,8 +1,12 @@
 import datetime as dt
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import batched
 from typing import Annotated
 
-from typer import Context, Option
-from ynab import Account, TransactionClearedStatus, TransactionDetail
+from typer import Context, Exit, Option
+from ynab import Account, TransactionClearedStatus
+from ynab.exceptions import ApiException
 
 from ynab_unlinked import app, display
 from ynab_unlinked.choices import Choice
@@ -10,11 +14,157 @@ from ynab_unlinked.commands.apps.reconcile import Reconcile
 from ynab_unlinked.config import ConfigV2
 from ynab_unlinked.config.constants import TRANSACTION_GRACE_PERIOD_DAYS
 from ynab_unlinked.context_object import YnabUnlinkedContext
-from ynab_unlinked.display import process
-from ynab_unlinked.ynab_api import Client
+from ynab_unlinked.display import confirm, process
+from ynab_unlinked.journal import JournalEntry, ReconcileJournal
+from ynab_unlinked.models import TransactionRecord
+from ynab_unlinked.ynab_api import Client, MetadataCache
 
+# Maximum number of accounts whose transactions are requested to YNAB at the same time
+MAX_PARALLEL_REQUESTS = 4
+# Number of transactions sent to YNAB in each update request when reconciling
+RECONCILE_CHUNK_SIZE = 200
 
-def build_choices(transactions: list[TransactionDetail], accounts: list[Account]) -> list[Choice]:
+
+def accounts_to_reconcile(
+    accounts: list[Account], config: ConfigV2, check_balances: bool = True
+) -> list[Account]:
+    """
+    Return the accounts that can have transactions pending to reconcile.
+
+    Closed and deleted accounts are skipped. When `check_balances` is set, accounts with no
+    uncleared balance whose cleared balance is the one left after the last reconciliation are
+    skipped as well, since nothing has been cleared in them since then.
+    """
+
+    def is_reconciled(account: Account) -> bool:
+        return (
+            account.uncleared_balance == 0
+            and config.reconciled_balances.get(account.id) == account.cleared_balance
+        )
+
+    return [
+        account
+        for account in accounts
+        if not account.closed
+        and not account.deleted
+        and not (check_balances and is_reconciled(account))
+    ]
+
+
+def fetch_transactions_to_reconcile(
+    client: Client,
+    budget_id: str,
+    accounts: list[Account],
+    since_date: dt.date | None,
+) -> list[TransactionRecord]:
+    """Fetch the transactions not yet reconciled of each account, requesting accounts in parallel"""
+
+    def account_transactions(account: Account) -> list[TransactionRecord]:
+        return [
+            transaction
+            for transaction in client.transaction_records(
+                budget_id=budget_id, account_id=account.id, since_date=since_date
+            )
+            if transaction.cleared is not TransactionClearedStatus.RECONCILED
+        ]
+
+    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_REQUESTS) as executor:
+        return [
+            transaction
+            for transactions in executor.map(account_transactions, accounts)
+            for transaction in transactions
+        ]
+
+
+def reconciled_balance(choice: Choice) -> int | None:
+    """
+    Cleared balance the account in `choice` will have once the selected transactions are reconciled.
+
+    Returns None when some cleared transactions are left unreconciled, since then the account
+    still has pending work the next time the cleared balance is checked.
+    """
+    uncleared_selected = 0
+    for child in choice.choices:
+        transaction = child.transaction
+        if transaction.cleared is TransactionClearedStatus.UNCLEARED:
+            uncleared_selected += transaction.amount if child.is_selected else 0
+        elif not child.is_selected:
+            return None
+
+    return choice.account.cleared_balance + uncleared_selected
+
+
+def commit_reconciliation(client: Client, config: ConfigV2, journal: ReconcileJournal):
+    """
+    Send the transactions in the journal that have not been committed yet, in chunks.
+
+    The journal is updated after every chunk so that, if any request fails, running the
+    reconciliation again only sends the transactions that were left.
+    """
+    remaining = journal.remaining()
+    n_sent = 0
+    start = time.perf_counter()
+
+    try:
+        with process(f"Reconciling {len(remaining)} transactions"):
+            for chunk in batched(remaining, RECONCILE_CHUNK_SIZE, strict=False):
+                client.update_transactions(budget_id=journal.budget_id, transactions=chunk)
+                journal.mark_committed(chunk)
+                n_sent += len(chunk)
+    except ApiException as e:
+        display.error(
+            f"Reconciliation interrupted after {n_sent} of {len(remaining)} transactions. "
+            "Run `yul reconcile` again to resume it."
+        )
+        raise Exit(1) from e
+
+    elapsed = time.perf_counter() - start
+    display.info(
+        f"Reconciled {n_sent} transactions in {elapsed:.1f}s "
+        f"({n_sent / elapsed if elapsed else n_sent:.0f} transactions/s)"
+    )
+
+    config.last_reconciliation_date = journal.latest_date - dt.timedelta(
+        days=TRANSACTION_GRACE_PERIOD_DAYS
+    )
+    config.reconciled_balances |= journal.reconciled_balances
+    config.save()
+    journal.delete()
+
+
+def resume_reconciliation(client: Client, config: ConfigV2) -> bool:
+    """Offer to resume an interrupted reconciliation. Returns whether it was resumed."""
+    if (journal := ReconcileJournal.load()) is None:
+        return False
+
+    if not journal.remaining():
+        journal.delete()
+        return False
+
+    if journal.budget_id != config.budget.id:
+        display.warning(
+            f"A reconciliation of another budget was interrupted with "
+            f"{len(journal.remaining())} transactions left to reconcile. It can only be resumed "
+            "with that budget selected."
+        )
+        if not confirm("Do you want to discard it and reconcile this budget?"):
+            raise Exit()
+        journal.delete()
+        return False
+
+    display.warning(
+        f"A previous reconciliation was interrupted with {len(journal.remaining())} "
+        "transactions left to reconcile."
+    )
+    if not confirm("Do you want to resume it?"):
+        journal.delete()
+        return False
+
+    commit_reconciliation(client, config, journal)
+    return True
+
+
+def build_choices(transactions: list[TransactionRecord], accounts: list[Account]) -> list[Choice]:
     accounts_by_id = {acc.id: acc for acc in accounts}
     choices_per_account: dict[str, list[Choice | str]] = {}
 
@@ -49,6 +199,8 @@ def reconcile(
             help=(
                 "Include all transactions, not just those since the last reconciliation. "
                 "Use this if some transactions were cleared with a significant delay. "
+                "Accounts are also checked even if their balances did not change since the last "
+                "reconciliation. "
                 "Note: This may take longer to run. "
                 "Alternatively, use the --buffer option to include more days before the last reconciliation."
             ),
@@ -79,17 +231,21 @@ def reconcile(
     if last_reconciliation_date:
         last_reconciliation_date -= dt.timedelta(days=buffer)
 
-    client = Client(api_key=config.api_key)
+    client = Client(api_key=config.api_key, profiler=ctx.profiler)
+
+    if resume_reconciliation(client, config):
+        display.success("🎉 Reconciliation done!")
+        return
 
     with process("Getting transactions from YNAB"):
-        transactions_to_reconcile = [
-            transaction
-            for transaction in client.transactions(
-                budget_id=budget_id, since_date=last_reconciliation_date
-            )
-            if transaction.cleared is not TransactionClearedStatus.RECONCILED
-        ]
-        accounts = client.accounts(budget_id=budget_id)
+        # Balances decide which accounts are checked, so the cached accounts are revalidated
+        accounts = MetadataCache(client, ctx.profiler).accounts(budget_id=budget_id, fresh=True)
+        transactions_to_reconcile = fetch_transactions_to_reconcile(
+            client,
+            budget_id=budget_id,
+            accounts=accounts_to_reconcile(accounts, config, check_balances=not all),
+            since_date=last_reconciliation_date,
+        )
 
     if not transactions_to_reconcile:
         display.success("All accounts are already reconciled!")
@@ -106,21 +262,25 @@ def reconcile(
         display.info("👋 Bye!")
         return
 
-    selected_transactions = [
-        child.transaction
-        for choice in choices
-        for child in choice.choices
-        if child.transaction and child.is_selected
-    ]
-
-    for transaction in selected_transactions:
-        transaction.cleared = TransactionClearedStatus.RECONCILED
-
-    with process("Updating transactions"):
-        client.update_transactions(budget_id=budget_id, transactions=selected_transactions)
+    journal = ReconcileJournal(
+        budget_id=budget_id,
+        entries=[
+            JournalEntry(
+                id=child.transaction.id,
+                account_id=child.transaction.account_id,
+                date=child.transaction.var_date,
+            )
+            for choice in choices
+            for child in choice.selected_choices()
+        ],
+        reconciled_balances={
+            choice.account.id: balance
+            for choice in choices
+            if (balance := reconciled_balance(choice)) is not None
+        },
+    )
+    journal.save()
 
-    latest_date = max(t.var_date for t in selected_transactions)
-    config.last_reconciliation_date = latest_date - dt.timedelta(days=TRANSACTION_GRACE_PERIOD_DAYS)
-    config.save()
+    commit_reconciliation(client, config, journal)
 
     display.success("🎉 Reconciliation done!")
@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import dataclasses
+import importlib
+import pkgutil
+import time
+import tomllib
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Annotated, Any, cast
+
+from pydantic import BaseModel, Field, ValidationError
+from typer import Argument, Context, Exit, Option
+
+from ynab_unlinked import app, display
+from ynab_unlinked.commands.load import enable_profiling
+from ynab_unlinked.config.models.shared import EntityConfig
+from ynab_unlinked.config.models.v2 import CONFIG_LOCK, ConfigV2
+from ynab_unlinked.context_object import YnabUnlinkedContext
+from ynab_unlinked.entities import Entity
+from ynab_unlinked.metrics import RunMetrics
+from ynab_unlinked.models import PartialMatchPolicy
+from ynab_unlinked.payee import PayeeCache
+from ynab_unlinked.process import PipelineResult, import_in_chunks
+from ynab_unlinked.ynab_api import Client
+
+# Builds an entity, and the extras of its context, from the options of a manifest entry
+type EntityBuilder = Callable[[dict[str, Any]], tuple[Entity, Any]]
+
+DEFAULT_WORKERS = 4
+
+
+class SyncEntry(BaseModel):
+    entity: str
+    file: Path
+    # Account to import to. If not given, the account set for the entity is used
+    account_id: str | None = None
+    options: dict[str, Any] = Field(default_factory=dict)
+
+
+class SyncManifest(BaseModel):
+    imports: list[SyncEntry]
+
+    @staticmethod
+    def load(path: Path) -> SyncManifest:
+        """Load a TOML manifest. Relative files are relative to the manifest location."""
+        with path.open("rb") as manifest_file:
+            manifest = SyncManifest.model_validate(tomllib.load(manifest_file))
+
+        for entry in manifest.imports:
+            entry.file = path.parent / entry.file
+        return manifest
+
+
+@dataclass
+class PreparedEntry:
+    entity: Entity
+    extras: Any
+    account_id: str
+
+
+@dataclass
+class SyncOutcome:
+    entry: SyncEntry
+    result: PipelineResult | None = None
+    error: str | None = None
+    seconds: float = 0.0
+
+
+def entity_builders() -> dict[str, EntityBuilder]:
+    """Entities that can be used in a manifest, by the name of their command"""
+    from ynab_unlinked import entities
+
+    builders: dict[str, EntityBuilder] = {}
+    for _finder, name, ispkg in pkgutil.iter_modules(entities.__path__):
+        if not ispkg:
+            continue
+
+        module = importlib.import_module(f"{entities.__name__}.{name}")
+        if callable(builder := getattr(module, "from_options", None)):
+            builders[name] = cast(EntityBuilder, builder)
+
+    return builders
+
+
+def resolve_entry(entry: SyncEntry, config: ConfigV2, builder: EntityBuilder) -> PreparedEntry:
+    """Build the entity of the entry and find the account it imports to"""
+    entity, extras = builder(entry.options)
+    with CONFIG_LOCK:
+        if entity.name() not in config.entities:
+            if entry.account_id is None:
+                raise ValueError(
+                    f"No account is set for {entry.entity!r}. Add account_id to the entry."
+                )
+            config.entities[entity.name()] = EntityConfig(account_id=entry.account_id)
+
+    return PreparedEntry(
+        entity, extras, entry.account_id or config.entities[entity.name()].account_id
+    )
+
+
+def error_message(error: Exception) -> str:
+    return getattr(error, "message", None) or str(error) or type(error).__name__
+
+
+def run_entry(
+    outcome: SyncOutcome,
+    prepared: PreparedEntry,
+    context: YnabUnlinkedContext,
+    client: Client,
+    payee_cache: PayeeCache,
+):
+    start = time.perf_counter()
+    try:
+        outcome.result = import_in_chunks(
+            prepared.entity,
+            outcome.entry.file,
+            dataclasses.replace(context, extras=prepared.extras),
+            prepared.account_id,
+            client=client,
+            payee_cache=payee_cache,
+        )
+    except Exception as e:
+        outcome.error = error_message(e)
+    finally:
+        outcome.seconds = time.perf_counter() - start
+
+
+def add_up_results(outcomes: list[SyncOutcome], metrics: RunMetrics):
+    """Fill in the metrics of the sync with the counts of all imports"""
+    for outcome in outcomes:
+        if (result := outcome.result) is None:
+            continue
+        metrics.parsed += result.parsed
+        metrics.matched += result.matched
+        metrics.partial_matches += result.partial_matches
+        metrics.created += result.created
+        metrics.skipped += result.skipped
+    metrics.completed = all(o.error is None for o in outcomes)
+
+
+def print_report(outcomes: list[SyncOutcome], seconds: float):
+    from rich.table import Table
+
+    table = Table(title="Sync report")
+    table.add_column("Entity")
+    table.add_column("File")
+    for column in ["Parsed", "Skipped", "Matched", "Partial", "Created", "Time (s)"]:
+        table.add_column(column, justify="right")
+    table.add_column("Status")
+
+    for outcome in outcomes:
+        result = outcome.result or PipelineResult()
+        table.add_row(
+            outcome.entry.entity,
+            outcome.entry.file.name,
+            str(result.parsed),
+            str(result.skipped),
+            str(result.matched),
+            str(result.partial_matches),
+            str(result.created),
+            f"{outcome.seconds:.2f}",
+            "[green]✔[/]" if outcome.error is None else "[red]✘[/]",
+        )
+
+    display.console().print(table)
+    for outcome in outcomes:
+        if outcome.error is not None:
+            display.error(f"✘ {outcome.entry.entity} ({outcome.entry.file}): {outcome.error}")
+    created = sum(o.result.created for o in outcomes if o.result is not None)
+    display.info(f"Created {created} transactions from {len(outcomes)} files in {seconds:.2f}s")
+
+
+@app.command()
+def sync(
+    context: Context,
+    manifest: Annotated[
+        Path,
+        Argument(exists=True, file_okay=True, dir_okay=False, readable=True),
+    ],
+    workers: Annotated[
+        int,
+        Option("-w", "--workers", min=1, help="Number of files imported at the same time."),
+    ] = DEFAULT_WORKERS,
+    partial_matches: Annotated[
+        PartialMatchPolicy,
+        Option(
+            "--partial-matches",
+            help=(
+                "What to do with transactions that match in date and amount but not in payee. "
+                "There is no prompt in sync, so ask rejects them."
+            ),
+            case_sensitive=False,
+        ),
+    ] = PartialMatchPolicy.REJECT,
+    buffer: Annotated[
+        int,
+        Option(
+            "-b",
+            "--buffer",
+            help=(
+                "The number of days before the earliest transaction in each file to load "
+                "transactions from YNAB."
+            ),
+            show_default=True,
+        ),
+    ] = 15,
+    profile: Annotated[
+        bool,
+        Option(
+            "--profile",
+            envvar="YUL_PROFILE",
+            help=(
+                "Show how long each phase of the imports took, added up for all files, with the "
+                "rows processed and the requests made to YNAB."
+            ),
+        ),
+    ] = False,
+    profile_output: Annotated[
+        Path | None,
+        Option(
+            "--profile-output",
+            envvar="YUL_PROFILE_OUTPUT",
+            dir_okay=False,
+            help=(
+                "Write the profile to this file. A Chrome trace is written if it ends in .json, "
+                "otherwise a cProfile dump readable with pstats. Implies --profile."
+            ),
+        ),
+    ] = None,
+    metrics_file: Annotated[
+        Path | None,
+        Option(
+            "--metrics-file",
+            envvar="YUL_METRICS_FILE",
+            dir_okay=False,
+            help=(
+                "Append a JSON line to this file with the metrics of the sync: transaction "
+                "counts of all files, requests to YNAB and their latency, and the duration of "
+                "each phase."
+            ),
+        ),
+    ] = None,
+):
+    """
+    Import several bank statements at once from a TOML manifest.
+
+    Every entry of the manifest imports one file, without asking for confirmation:
+
+    \b
+    [[imports]]
+    entity = "sabadell"
+    file = "sabadell.txt"
+    account_id = "<YNAB account id>"  # Optional once the entity has an account
+    options = { year = 2025 }
+    """
+    ctx: YnabUnlinkedContext = context.obj
+    enable_profiling(context, "sync", profile, profile_output, metrics_file)
+
+    try:
+        sync_manifest = SyncManifest.load(manifest)
+    except (tomllib.TOMLDecodeError, ValidationError) as e:
+        display.error(f"The manifest {manifest} is not valid:\n{e}")
+        raise Exit(1) from e
+
+    builders = entity_builders()
+    if unknown := {e.entity for e in sync_manifest.imports} - builders.keys():
+        display.error(
+            f"Unknown entities in the manifest: {', '.join(sorted(unknown))}. "
+            f"Available: {', '.join(sorted(builders))}"
+        )
+        raise Exit(1)
+
+    context_template = dataclasses.replace(
+        ctx, assume_yes=True, quiet=True, partial_matches=partial_matches, buffer=buffer
+    )
+    # The connection pool and the payees are shared by all imports
+    client = Client(ctx.config.api_key, profiler=ctx.profiler)
+    payee_cache = PayeeCache(ctx.profiler)
+
+    start = time.perf_counter()
+    outcomes = [SyncOutcome(entry) for entry in sync_manifest.imports]
+    # Imports to the same account run one after the other, so that they never write its
+    # checkpoint and its ledger at the same time
+    by_account: dict[str, list[tuple[SyncOutcome, PreparedEntry]]] = {}
+    for outcome in outcomes:
+        try:
+            prepared = resolve_entry(outcome.entry, ctx.config, builders[outcome.entry.entity])
+        except Exception as e:
+            outcome.error = error_message(e)
+            continue
+        by_account.setdefault(prepared.account_id, []).append((outcome, prepared))
+
+    def run_account(entries: list[tuple[SyncOutcome, PreparedEntry]]):
+        for outcome, prepared in entries:
+            run_entry(outcome, prepared, context_template, client, payee_cache)
+
+    with (
+        display.process(f"Importing {len(sync_manifest.imports)} files..."),
+        ThreadPoolExecutor(max_workers=workers) as executor,
+    ):
+        list(executor.map(run_account, by_account.values()))
+
+    ctx.metrics.input_file = manifest
+    add_up_results(outcomes, ctx.metrics)
+    print_report(outcomes, time.perf_counter() - start)
+
+    if any(o.error is not None for o in outcomes):
+        raise Exit(1)
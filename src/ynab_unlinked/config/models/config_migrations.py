@@ -6,7 +6,7 @@ from ynab_unlinked.config.migrations.base import Delta
 from ynab_unlinked.ynab_api import Client
 
 from .v1 import ConfigV1
-from .v2 import Budget, ConfigV2, CurrencyFormat
+from .v2 import Budget, ConfigV2
 
 
 class DeltaConfigV1ToV2(Delta[ConfigV1, ConfigV2]):
@@ -16,33 +16,15 @@ class DeltaConfigV1ToV2(Delta[ConfigV1, ConfigV2]):
     def on_migrate(self, origin: ConfigV1) -> ConfigV2:
         client = Client(origin.api_key)
 
-        budget_details = client.budget(origin.budget_id)
-        if budget_details is None:
-            raise ValueError(f"Could not find budget with ID {origin.budget_id}")
-
-        if budget_details.currency_format is None:
-            raise ValueError(f"Budget {budget_details.name!r} has no currency format")
-
-        if budget_details.date_format is None:
-            raise ValueError(f"Budget {budget_details.name!r} has no date format")
-
-        # Create CurrencyFormat from budget details
-        currency_format = CurrencyFormat(
-            iso_code=budget_details.currency_format.iso_code,
-            decimal_digits=budget_details.currency_format.decimal_digits,
-            decimal_separator=budget_details.currency_format.decimal_separator,
-            symbol_first=budget_details.currency_format.symbol_first,
-            group_separator=budget_details.currency_format.group_separator,
-            currency_symbol=budget_details.currency_format.currency_symbol,
-            display_symbol=budget_details.currency_format.display_symbol,
+        # Only the settings are needed, the full budget export can be huge
+        budget_summary = next(
+            (budget for budget in client.budgets() if budget.id == origin.budget_id), None
         )
+        if budget_summary is None:
+            raise ValueError(f"Could not find budget with ID {origin.budget_id}")
 
-        # Create Budget object
-        budget = Budget(
-            id=budget_details.id,
-            name=budget_details.name,
-            date_format=budget_details.date_format.format,
-            currency_format=currency_format,
+        budget = Budget.from_settings(
+            budget_summary.id, budget_summary.name, client.budget_settings(origin.budget_id)
         )
 
         # Create and return ConfigV2 with all fields
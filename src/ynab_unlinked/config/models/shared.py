@@ -1,13 +1,68 @@
+from __future__ import annotations
+
 import datetime as dt
+from collections.abc import Sequence
+from hashlib import sha256
+
+from pydantic import BaseModel, Field
 
-from pydantic import BaseModel
+from ynab_unlinked.config.constants import TRANSACTION_GRACE_PERIOD_DAYS
+from ynab_unlinked.models import Transaction
 
 
 class Checkpoint(BaseModel):
+    """
+    Newest transactions processed from the statements of an entity.
+
+    The transactions within the grace period of the newest one processed are kept as a digest
+    of their import IDs, which is stable across runs, so that a statement with nothing newer
+    can be told apart without requesting anything to YNAB.
+    """
+
     latest_date_processed: dt.date
-    latest_transaction_hash: int
+    # Checkpoints saved before the digest was introduced do not have one
+    latest_transactions_digest: str | None = None
+
+    @staticmethod
+    def digest(transactions: Sequence[Transaction], since: dt.date) -> str:
+        """Digest of the import IDs of the transactions from `since`, whatever their order"""
+        import_ids = sorted(t.id for t in transactions if t.date >= since)
+        return sha256("".join(import_ids).encode()).hexdigest()
+
+    @classmethod
+    def from_transactions(cls, transactions: Sequence[Transaction]) -> Checkpoint:
+        since = max(t.date for t in transactions) - dt.timedelta(days=TRANSACTION_GRACE_PERIOD_DAYS)
+        return cls(
+            latest_date_processed=since,
+            latest_transactions_digest=cls.digest(transactions, since),
+        )
+
+    def has_new_transactions(self, transactions: Sequence[Transaction]) -> bool:
+        """
+        Whether there are transactions newer than the checkpoint.
+
+        The counters of the transactions must be set already, since they are part of the
+        import IDs. Transactions older than the latest date processed are not new.
+        """
+        return self.latest_transactions_digest != self.digest(
+            transactions, self.latest_date_processed
+        )
 
 
 class EntityConfig(BaseModel):
     account_id: str
     checkpoint: Checkpoint | None = None
+    # Checkpoints of the imports to other accounts, as with `yul load -a` or a sync entry with
+    # its own account, so that they never take the place of the checkpoint of `account_id`
+    account_checkpoints: dict[str, Checkpoint] = Field(default_factory=dict)
+
+    def checkpoint_for(self, account_id: str) -> Checkpoint | None:
+        if account_id == self.account_id:
+            return self.checkpoint
+        return self.account_checkpoints.get(account_id)
+
+    def set_checkpoint(self, account_id: str, checkpoint: Checkpoint):
+        if account_id == self.account_id:
+            self.checkpoint = checkpoint
+        else:
+            self.account_checkpoints[account_id] = checkpoint
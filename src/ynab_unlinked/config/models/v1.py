@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 import datetime as dt
+from collections.abc import Sequence
 from pathlib import Path
 
 from pydantic import BaseModel, Field
 
-from ynab_unlinked.config.constants import TRANSACTION_GRACE_PERIOD_DAYS
 from ynab_unlinked.config.migrations import Version
 from ynab_unlinked.config.paths import config_path
 from ynab_unlinked.models import Transaction, TransactionWithYnabData
@@ -32,15 +32,14 @@ class ConfigV1(BaseModel):
         self.path().parent.mkdir(parents=True, exist_ok=True)
         self.path().write_text(self.model_dump_json(indent=4))
 
-    def update_and_save(self, last_transaction: Transaction, entity_name: str):
-        checkpoint = Checkpoint(
-            latest_date_processed=(
-                last_transaction.date - dt.timedelta(days=TRANSACTION_GRACE_PERIOD_DAYS)
-            ),
-            latest_transaction_hash=hash(last_transaction),
-        )
+    def update_and_save(
+        self, transactions: Sequence[Transaction], entity_name: str, account_id: str
+    ):
+        checkpoint = Checkpoint.from_transactions(transactions)
 
-        self.entities[entity_name].checkpoint = checkpoint
+        if (entity := self.entities.get(entity_name)) is None:
+            return
+        entity.set_checkpoint(account_id, checkpoint)
 
         self.save()
 
@@ -1,17 +1,25 @@
 from __future__ import annotations
 
 import datetime as dt
+import threading
+from collections.abc import Sequence
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from ynab_unlinked.config.constants import TRANSACTION_GRACE_PERIOD_DAYS
 from ynab_unlinked.config.migrations import Version
 from ynab_unlinked.config.paths import config_path
 from ynab_unlinked.models import Transaction, TransactionWithYnabData
 
 from .shared import Checkpoint, EntityConfig
 
+if TYPE_CHECKING:
+    from ynab.models.budget_settings import BudgetSettings
+
+# Guards updates to the config when several imports share it, as in `yul sync`
+CONFIG_LOCK = threading.RLock()
+
 
 class CurrencyFormat(BaseModel):
     iso_code: str
@@ -29,13 +37,71 @@ class Budget(BaseModel):
     date_format: str
     currency_format: CurrencyFormat
 
+    @staticmethod
+    def from_settings(budget_id: str, name: str, settings: BudgetSettings) -> Budget:
+        """Build the budget from the settings returned by YNAB"""
+        if settings.currency_format is None:
+            raise ValueError(f"Budget {name!r} has no currency format")
+
+        if settings.date_format is None:
+            raise ValueError(f"Budget {name!r} has no date format")
+
+        return Budget(
+            id=budget_id,
+            name=name,
+            date_format=settings.date_format.format,
+            currency_format=CurrencyFormat(
+                iso_code=settings.currency_format.iso_code,
+                decimal_digits=settings.currency_format.decimal_digits,
+                decimal_separator=settings.currency_format.decimal_separator,
+                symbol_first=settings.currency_format.symbol_first,
+                group_separator=settings.currency_format.group_separator,
+                currency_symbol=settings.currency_format.currency_symbol,
+                display_symbol=settings.currency_format.display_symbol,
+            ),
+        )
+
+
+class CsvSkipRule(BaseModel):
+    column: str | int
+    # Rows whose value in the column matches this regular expression are skipped
+    pattern: str
+
+
+class CsvFormat(BaseModel):
+    """
+    Layout of the CSV or TSV exports of a bank, read by the `csv` entity.
+
+    Columns are given by their name in the header or by their position, starting at 0.
+    """
+
+    date: str | int
+    payee: str | int
+    amount: str | int
+    date_format: str = "%d/%m/%Y"
+    # Tabs for .tsv files and commas for any other file if not given
+    delimiter: str | None = None
+    encoding: str = "utf-8-sig"
+    decimal_separator: str = "."
+    # Banks that show spending as a positive amount
+    outflows_positive: bool = False
+    # Lines before the header, or before the first row if there is no header
+    skip_lines: int = 0
+    has_header: bool = True
+    # Rows sorted newest first allow to stop reading at the first row already processed
+    newest_first: bool = False
+    skip: list[CsvSkipRule] = Field(default_factory=list)
+
 
 class ConfigV2(BaseModel):
     api_key: str
     budget: Budget
     last_reconciliation_date: dt.date | None = None
+    # Cleared balance, in milliunits, each account was left with after its last reconciliation
+    reconciled_balances: dict[str, int] = Field(default_factory=dict)
     entities: dict[str, EntityConfig] = Field(default_factory=dict)
     payee_rules: dict[str, set[str]] = Field(default_factory=dict)
+    csv_formats: dict[str, CsvFormat] = Field(default_factory=dict)
     version_number: str = Field(default="V2", alias="version")
 
     model_config = ConfigDict(validate_by_alias=True, serialize_by_alias=True)
@@ -49,20 +115,21 @@ class ConfigV2(BaseModel):
         return config_path(ConfigV2.version().version)
 
     def save(self):
-        self.path().parent.mkdir(parents=True, exist_ok=True)
-        self.path().write_text(self.model_dump_json(indent=4))
-
-    def update_and_save(self, last_transaction: Transaction, entity_name: str):
-        checkpoint = Checkpoint(
-            latest_date_processed=(
-                last_transaction.date - dt.timedelta(days=TRANSACTION_GRACE_PERIOD_DAYS)
-            ),
-            latest_transaction_hash=hash(last_transaction),
-        )
-
-        self.entities[entity_name].checkpoint = checkpoint
-
-        self.save()
+        with CONFIG_LOCK:
+            self.path().parent.mkdir(parents=True, exist_ok=True)
+            self.path().write_text(self.model_dump_json(indent=4))
+
+    def update_and_save(
+        self, transactions: Sequence[Transaction], entity_name: str, account_id: str
+    ):
+        checkpoint = Checkpoint.from_transactions(transactions)
+
+        with CONFIG_LOCK:
+            # Without an account set, the entity was imported with `-a` and nothing is kept
+            if (entity := self.entities.get(entity_name)) is None:
+                return
+            entity.set_checkpoint(account_id, checkpoint)
+            self.save()
 
     @staticmethod
     def load() -> ConfigV2:
@@ -87,8 +154,14 @@ class ConfigV2(BaseModel):
             if imported_payee == ynab_payee:
                 continue
 
-            self.payee_rules.setdefault(ynab_payee, set()).add(imported_payee)
-            self.save()
+            with CONFIG_LOCK:
+                # Replace the rules instead of updating them in place so that matching running
+                # in other threads never iterates over rules while they change
+                self.payee_rules = {
+                    **self.payee_rules,
+                    ynab_payee: self.payee_rules.get(ynab_payee, set()) | {imported_payee},
+                }
+                self.save()
 
     def payee_from_fules(self, payee: str) -> str | None:
         return next(
@@ -1,6 +1,6 @@
 from pathlib import Path
 
-from platformdirs import user_config_dir
+from platformdirs import user_cache_dir, user_config_dir
 
 from .constants import LATEST_VERSION
 
@@ -16,3 +16,7 @@ def config_path(version: str = LATEST_VERSION.version) -> Path:
         return v1_config_path()
 
     return Path(user_config_dir("ynab-unlinked", "committhatline")) / "config.json"
+
+
+def cache_dir() -> Path:
+    return Path(user_cache_dir("ynab-unlinked", "committhatline"))
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from typing import Protocol
 
 from ynab_unlinked.models import Transaction, TransactionWithYnabData
@@ -14,7 +15,9 @@ class Config(Versioned, Protocol):
     def save(self): ...
     @staticmethod
     def load() -> Config: ...
-    def update_and_save(self, last_transaction: Transaction, entity_name: str): ...
+    def update_and_save(
+        self, transactions: Sequence[Transaction], entity_name: str, account_id: str
+    ): ...
     def add_payee_rules(self, transactions: list[TransactionWithYnabData]): ...
     def payee_from_fules(self, payee: str) -> str | None: ...
     def entity(self, name: str) -> EntityConfig | None: ...
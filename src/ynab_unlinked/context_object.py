@@ -1,7 +1,10 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from ynab_unlinked.config import ConfigV2
 from ynab_unlinked.formatter import Formatter
+from ynab_unlinked.metrics import RunMetrics
+from ynab_unlinked.models import PartialMatchPolicy
+from ynab_unlinked.profiling import NullProfiler, Profiler
 
 
 @dataclass
@@ -13,3 +16,9 @@ class YnabUnlinkedContext[T]:
     reconcile: bool = False
     choose_account: bool = False
     buffer: int = 15
+    full: bool = False
+    assume_yes: bool = False
+    quiet: bool = False
+    partial_matches: PartialMatchPolicy = PartialMatchPolicy.ASK
+    profiler: Profiler = field(default_factory=NullProfiler)
+    metrics: RunMetrics = field(default_factory=RunMetrics)
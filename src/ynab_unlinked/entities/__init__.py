@@ -6,6 +6,7 @@ from ._protocol import Entity
 class InputType(StrEnum):
     TXT = "txt"
     CSV = "csv"
+    TSV = "tsv"
     HTML = "html"
     XLS = "xls"
     XLSX = "xlsx"
@@ -1,3 +1,5 @@
+import datetime as dt
+from collections.abc import Generator
 from pathlib import Path
 from typing import Protocol
 
@@ -6,7 +8,13 @@ from ynab_unlinked.models import Transaction
 
 
 class Entity(Protocol):
-    def parse(self, input_file: Path, context: YnabUnlinkedContext) -> list[Transaction]:
+    """
+    Entities implement either `parse` or `iter_parse`, the other one is built on top of it.
+    """
+
+    def parse(
+        self, input_file: Path, context: YnabUnlinkedContext, since: dt.date | None = None
+    ) -> list[Transaction]:
         """
         Parse an input file into a list of Transaction objects.
 
@@ -19,8 +27,23 @@ class Entity(Protocol):
 
         `ynab-unlinked` will understand these transactions and enrich them when necesary to
         ensure the best matching when pushing them to YNAB.
+
+        When `since` is set, transactions before that date were already processed and must be
+        left out. Parsers should skip them without fully parsing them, and stop reading the input
+        file when its order guarantees that no newer transaction follows.
         """
-        ...
+        return list(self.iter_parse(input_file, context, since))
+
+    def iter_parse(
+        self, input_file: Path, context: YnabUnlinkedContext, since: dt.date | None = None
+    ) -> Generator[Transaction]:
+        """
+        Parse an input file yielding the transactions as they are read.
+
+        Same as `parse`, but the transactions can be processed while the rest of the input file
+        is still being read. Entities that only implement `parse` yield them once it is parsed.
+        """
+        yield from self.parse(input_file, context, since)
 
     def name(self) -> str:
         """
@@ -5,6 +5,8 @@ from typing import TYPE_CHECKING, assert_never, cast
 from ynab_unlinked.entities import Entity, InputType
 
 if TYPE_CHECKING:
+    import datetime as dt
+    from collections.abc import Generator
     from pathlib import Path
 
     from ynab_unlinked.context_object import YnabUnlinkedContext
@@ -12,11 +14,14 @@ if TYPE_CHECKING:
 
 
 XLSX_ROW_TO_READ = ["", "Fecha", "Tarjeta", "Concepto", "Importe", "Divisa", ""]
+PDF_HEADER = ["Fecha", "Concepto", "Importe"]
 VALID_TYPES = [InputType.PDF, InputType.XLSX]
 
 
 class BBVA(Entity):
-    def parse(self, input_file: Path, context: YnabUnlinkedContext) -> list[Transaction]:
+    def iter_parse(
+        self, input_file: Path, context: YnabUnlinkedContext, since: dt.date | None = None
+    ) -> Generator[Transaction]:
         import datetime as dt
 
         from ynab_unlinked.exceptions import ParsingError
@@ -30,17 +35,20 @@ class BBVA(Entity):
                 generator = xls(input_file, read_after_row_like=XLSX_ROW_TO_READ)
                 field_reader = self.__extract_fields_from_xlsx_row
             case InputType.PDF:
-                generator = pdf(input_file, allow_empty_columns=False, expected_number_of_columns=3)
+                generator = pdf(
+                    input_file,
+                    allow_empty_columns=False,
+                    expected_number_of_columns=3,
+                    header=PDF_HEADER,
+                )
                 field_reader = self.__extract_fields_from_pdf_row
-            case (InputType.TXT | InputType.CSV | InputType.HTML) as file_type:
+            case (InputType.TXT | InputType.CSV | InputType.TSV | InputType.HTML) as file_type:
                 raise NotImplementedError(
                     f"BBVA does not support input file of type {file_type.value!r}"
                 )
             case never:
                 assert_never(never)
 
-        transactions = []
-
         for row in generator:
             parsed_row = field_reader(cast(list[str], row))
             if parsed_row is None:
@@ -57,15 +65,15 @@ class BBVA(Entity):
             except ValueError:
                 continue
 
-            transactions.append(
-                Transaction(
-                    date=parsed_date,
-                    payee=payee,
-                    amount=float(amount.replace("€", "").replace(",", ".")),
-                )
-            )
+            if since is not None and parsed_date < since:
+                # Statements are sorted newest first, so the rest of the rows are older
+                break
 
-        return transactions
+            yield Transaction(
+                date=parsed_date,
+                payee=payee,
+                amount=float(amount.replace("€", "").replace(",", ".")),
+            )
 
     def __extract_fields_from_pdf_row(self, row: list[str]) -> tuple[str, ...] | None:
         # PDFs should have three columns
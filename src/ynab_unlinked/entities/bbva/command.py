@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Any
 
 import typer
 
@@ -26,3 +26,8 @@ def command(
         input_file,
         ctx,
     )
+
+
+def from_options(options: dict[str, Any]) -> tuple[BBVA, None]:
+    """Build the BBVA entity from the options of a `yul sync` manifest entry. It takes none."""
+    return BBVA(), None
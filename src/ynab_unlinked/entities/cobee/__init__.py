@@ -1,3 +1,3 @@
-from .command import command
+from .command import command, from_options
 
-__all__ = ["command"]
+__all__ = ["command", "from_options"]
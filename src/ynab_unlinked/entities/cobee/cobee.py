@@ -6,7 +6,10 @@ from dataclasses import dataclass
 from enum import StrEnum
 from typing import TYPE_CHECKING, assert_never
 
+from ynab_unlinked.entities import Entity
+
 if TYPE_CHECKING:
+    from collections.abc import Generator
     from pathlib import Path
 
     from ynab_unlinked.context_object import YnabUnlinkedContext
@@ -14,6 +17,51 @@ if TYPE_CHECKING:
 
 DATE_REGEX = re.compile(r"(\d{1,2}) (\w{3}) (\d{4})")
 
+# The text of the page is split in lines at these tags, as html_text does
+NEWLINE_TAGS = frozenset(
+    [
+        "article",
+        "aside",
+        "blockquote",
+        "br",
+        "dd",
+        "details",
+        "div",
+        "dl",
+        "dt",
+        "fieldset",
+        "figcaption",
+        "figure",
+        "footer",
+        "form",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "header",
+        "hr",
+        "legend",
+        "li",
+        "main",
+        "nav",
+        "ol",
+        "p",
+        "pre",
+        "table",
+        "title",
+        "tr",
+        "ul",
+    ]
+)
+# Tags whose content is not part of the text of the page
+HIDDEN_TAGS = frozenset(["script", "style", "object", "embed", "applet", "frame", "iframe"])
+WHITESPACE_REGEX = re.compile(r"\s+")
+PUNCTUATION_AFTER_REGEX = re.compile(r'^[,:;.!?")]')
+# Size of the chunks of the page fed to the HTML parser
+READ_CHUNK_SIZE = 1 << 16
+
 # Needed to parse the date. Cobee is a Spanish system for work benefits but the
 # dates are in English locale. Parsing dates with something other than numbers
 # does not seem to be supported in Babel.
@@ -68,6 +116,85 @@ def parse_date(date_str: str) -> dt.date | None:
     return dt.date(int(year), int(month), int(day))
 
 
+class PageLines:
+    """
+    Target of the lxml HTML parser that splits the text of the page in lines while it is parsed.
+
+    Lines are the same `html_text.extract_text` gets, but without building the tree of the whole
+    page and cleaning it first.
+    """
+
+    def __init__(self):
+        self.lines: list[str] = []
+        self._line: list[str] = []
+        self._text: list[str] = []
+        self._previous_text = ""
+        self._hidden = 0
+
+    def start(self, tag: str, attrib: object):
+        self._add_text()
+        if tag in HIDDEN_TAGS:
+            self._hidden += 1
+        elif tag in NEWLINE_TAGS and not self._hidden:
+            self._new_line()
+
+    def end(self, tag: str):
+        self._add_text()
+        if tag in HIDDEN_TAGS:
+            self._hidden = max(self._hidden - 1, 0)
+        elif tag in NEWLINE_TAGS and not self._hidden:
+            self._new_line()
+
+    def data(self, data: str):
+        if not self._hidden:
+            # The text of an element can come in several calls when it is fed in chunks
+            self._text.append(data)
+
+    def close(self):
+        self._add_text()
+        self._new_line()
+
+    def _add_text(self):
+        if not self._text:
+            return
+
+        raw_text = "".join(self._text)
+        self._text.clear()
+        if not (text := WHITESPACE_REGEX.sub(" ", raw_text.strip())):
+            return
+
+        # Texts in the same line are separated by a space unless they look like punctuation
+        previous = self._previous_text
+        if self._line and (
+            previous[-1].isspace()
+            or (not PUNCTUATION_AFTER_REGEX.search(text) and not previous.endswith("("))
+        ):
+            self._line.append(" ")
+        self._line.append(text)
+        self._previous_text = raw_text
+
+    def _new_line(self):
+        if self._line:
+            self.lines.append("".join(self._line))
+            self._line.clear()
+
+
+def page_lines(input_file: Path) -> Generator[str]:
+    """Lines of text of an HTML page, read as the page is parsed"""
+    from lxml import etree  # pyright: ignore[reportAttributeAccessIssue]
+
+    target = PageLines()
+    parser = etree.HTMLParser(target=target)
+    with input_file.open() as page:
+        while chunk := page.read(READ_CHUNK_SIZE):
+            parser.feed(chunk)
+            yield from target.lines
+            target.lines.clear()
+
+    parser.close()
+    yield from target.lines
+
+
 def identifers_by_language(language: Language) -> Identifiers:
     match language:
         case Language.ES:
@@ -95,26 +222,26 @@ def identifers_by_language(language: Language) -> Identifiers:
             assert_never(never)
 
 
-class Cobee:
-    def parse(
-        self, input_file: Path, context: YnabUnlinkedContext[CobeeContext]
-    ) -> list[Transaction]:
-        # Import now the html parser
-        import html_text
-
+class Cobee(Entity):
+    def iter_parse(
+        self,
+        input_file: Path,
+        context: YnabUnlinkedContext[CobeeContext],
+        since: dt.date | None = None,
+    ) -> Generator[Transaction]:
         from ynab_unlinked.models import Transaction
 
-        text = html_text.extract_text(input_file.read_text())  # type: ignore
-
         start = False
         previous_line = ""
+        # Each cancelled or rejected line drops the latest transaction still kept, so a run of them
+        # can drop several and transactions are only yielded once the whole page is read
         transactions: list[Transaction] = []
         date: dt.date | None = None
         payee: str | None = None
         amount: float | None = None
         identifiers = identifers_by_language(context.extras.language)
 
-        for line in text.splitlines():
+        for line in page_lines(input_file):
             line = line.strip()
 
             if not line:
@@ -128,6 +255,9 @@ class Cobee:
                 continue
 
             if (try_date := parse_date(line)) is not None:
+                if since is not None and try_date < since:
+                    # The wallet shows the newest transactions first, the rest are older
+                    break
                 date = try_date
 
             if "€" in line:
@@ -163,7 +293,7 @@ class Cobee:
 
             previous_line = line
 
-        return transactions
+        yield from transactions
 
     def name(self) -> str:
         return "cobee"
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Any
 
 import typer
 
@@ -41,3 +41,12 @@ def command(
         input_file=input_file,
         context=ctx,
     )
+
+
+def from_options(options: dict[str, Any]) -> tuple[Cobee, CobeeContext]:
+    """
+    Build the Cobee entity from the options of a `yul sync` manifest entry.
+
+    - language: language used when exporting the HTML website, `es` if not given.
+    """
+    return Cobee(), CobeeContext(language=Language(options.get("language", Language.ES)))
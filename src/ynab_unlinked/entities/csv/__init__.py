@@ -0,0 +1,3 @@
+from .command import command, from_options
+
+__all__ = ["command", "from_options"]
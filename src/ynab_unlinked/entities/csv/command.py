@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Any
+
+import typer
+
+if TYPE_CHECKING:
+    from ynab_unlinked.entities import Entity
+
+
+def command(
+    context: typer.Context,
+    input_file: Annotated[
+        Path,
+        typer.Argument(exists=True, file_okay=True, dir_okay=False, readable=True),
+    ],
+    format_name: Annotated[
+        str,
+        typer.Option(
+            "-f",
+            "--format",
+            help="Name of the format of the file, as set in the csv_formats of the config.",
+        ),
+    ],
+):
+    """
+    Import transactions from a CSV or TSV export of any bank.
+
+    The layout of the export is described in the config, under `csv_formats`, with the name given
+    in --format. For example, for a semicolon separated export with a header, amounts with a
+    decimal comma and spending shown as positive:
+
+    "csv_formats": {"mybank": {"date": "Fecha", "payee": "Concepto", "amount": "Importe",
+    "delimiter": ";", "decimal_separator": ",", "outflows_positive": true}}
+
+    Columns can be given by their name in the header or by their position, starting at 0.
+    Rows are skipped with rules like "skip": [{"column": "Estado", "pattern": "PENDIENTE"}].
+    """
+
+    from ynab_unlinked.context_object import YnabUnlinkedContext
+    from ynab_unlinked.process import process_transactions
+
+    from .csv import CsvParser
+
+    ctx: YnabUnlinkedContext = context.obj
+
+    process_transactions(
+        entity=CsvParser(format_name),
+        input_file=input_file,
+        context=ctx,
+    )
+
+
+def from_options(options: dict[str, Any]) -> tuple[Entity, None]:
+    """
+    Build the CSV entity from the options of a `yul sync` manifest entry.
+
+    - format: name of the format of the file in the csv_formats of the config.
+    """
+    from .csv import CsvParser
+
+    if "format" not in options:
+        raise ValueError("The csv entity needs the name of the format of the file in `format`")
+
+    return CsvParser(str(options["format"])), None
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import datetime as dt
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from ynab_unlinked.entities import Entity, InputType
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator, Sequence
+    from pathlib import Path
+
+    from ynab_unlinked.config.models.v2 import CsvFormat
+    from ynab_unlinked.context_object import YnabUnlinkedContext
+    from ynab_unlinked.models import Transaction
+
+
+VALID_TYPES = [InputType.CSV, InputType.TSV, InputType.TXT]
+# Distinct dates parsed kept in memory. Statements repeat the same few dates in many rows
+DATE_CACHE_SIZE = 4096
+
+
+def date_parser(date_format: str) -> Callable[[str], dt.date]:
+    @lru_cache(maxsize=DATE_CACHE_SIZE)
+    def parse(value: str) -> dt.date:
+        return dt.datetime.strptime(value, date_format).date()
+
+    return parse
+
+
+def amount_parser(decimal_separator: str, outflows_positive: bool) -> Callable[[str], float]:
+    # Anything but digits, signs and the decimal separator is dropped: currency symbols, spaces
+    # and group separators
+    not_numeric = re.compile(rf"[^\d+\-{re.escape(decimal_separator)}]")
+    sign = -1 if outflows_positive else 1
+
+    def parse(value: str) -> float:
+        number = not_numeric.sub("", value).replace(decimal_separator, ".")
+        return sign * float(number)
+
+    return parse
+
+
+class CsvParser(Entity):
+    """
+    Transactions of a CSV or TSV export of any bank, laid out as described by a format of the
+    config.
+
+    The rows are read as the file is streamed, so exports of any size can be imported without
+    keeping the file in memory.
+    """
+
+    def __init__(self, format_name: str):
+        self.format_name = format_name
+
+    def iter_parse(
+        self, input_file: Path, context: YnabUnlinkedContext, since: dt.date | None = None
+    ) -> Generator[Transaction]:
+        import csv
+        from itertools import islice
+        from operator import itemgetter
+
+        from ynab_unlinked.exceptions import ParsingError
+        from ynab_unlinked.models import Transaction
+        from ynab_unlinked.utils import extract_type
+
+        if (csv_format := context.config.csv_formats.get(self.format_name)) is None:
+            raise ParsingError(
+                input_file, f"There is no CSV format named {self.format_name!r} in the config"
+            )
+
+        input_type = extract_type(input_file, valid=VALID_TYPES)
+        delimiter = csv_format.delimiter or ("\t" if input_type is InputType.TSV else ",")
+        parse_date = date_parser(csv_format.date_format)
+        parse_amount = amount_parser(csv_format.decimal_separator, csv_format.outflows_positive)
+
+        with input_file.open(encoding=csv_format.encoding, newline="") as statement:
+            for _ in islice(statement, csv_format.skip_lines):
+                pass
+
+            reader = csv.reader(statement, delimiter=delimiter)
+            header = next(reader, []) if csv_format.has_header else None
+            columns = self.__column_indexes(csv_format, header, input_file)
+            fields = itemgetter(*columns[:3])
+            skip_rules = [
+                (index, re.compile(rule.pattern))
+                for index, rule in zip(columns[3:], csv_format.skip, strict=True)
+            ]
+            width = max(columns) + 1
+
+            for row in reader:
+                # Empty lines and the totals some banks add at the end
+                if len(row) < width:
+                    continue
+
+                if any(pattern.search(row[index]) for index, pattern in skip_rules):
+                    continue
+
+                date, payee, amount = fields(row)
+                if not (date := date.strip()):
+                    continue
+
+                try:
+                    parsed_date = parse_date(date)
+                    parsed_amount = parse_amount(amount)
+                except ValueError as e:
+                    raise ParsingError(
+                        input_file,
+                        f"Could not read the date or amount of line {reader.line_num}: {e}",
+                    ) from e
+
+                if since is not None and parsed_date < since:
+                    if csv_format.newest_first:
+                        break
+                    continue
+
+                yield Transaction(date=parsed_date, payee=payee.strip(), amount=parsed_amount)
+
+    def __column_indexes(
+        self, csv_format: CsvFormat, header: Sequence[str] | None, input_file: Path
+    ) -> list[int]:
+        """Indexes of the date, payee and amount columns, followed by those of the skip rules"""
+        from ynab_unlinked.exceptions import ParsingError
+
+        columns = [
+            csv_format.date,
+            csv_format.payee,
+            csv_format.amount,
+            *(rule.column for rule in csv_format.skip),
+        ]
+        names = [] if header is None else [cell.strip() for cell in header]
+        indexes = []
+        for column in columns:
+            if isinstance(column, int):
+                indexes.append(column)
+            elif column.strip() in names:
+                indexes.append(names.index(column.strip()))
+            else:
+                raise ParsingError(
+                    input_file, f"Column {column!r} was not found in the header of the file"
+                )
+
+        return indexes
+
+    def name(self) -> str:
+        return self.format_name
@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import datetime as dt
 from pathlib import Path
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated, Any
 
 import typer
 
+if TYPE_CHECKING:
+    from ynab_unlinked.entities import Entity
+
 
 def command(
     context: typer.Context,
@@ -46,3 +49,14 @@ def command(
         input_file=input_file,
         context=ctx,
     )
+
+
+def from_options(options: dict[str, Any]) -> tuple[Entity, None]:
+    """
+    Build the Sabadell entity from the options of a `yul sync` manifest entry.
+
+    - year: year of the transactions, the current year if not given.
+    """
+    from .sabadell import SabadellParser
+
+    return SabadellParser(year=int(options.get("year", dt.date.today().year))), None
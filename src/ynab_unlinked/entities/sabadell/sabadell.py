@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import datetime as dt
 import re
 from typing import TYPE_CHECKING
 
+from ynab_unlinked.entities import Entity
+
 if TYPE_CHECKING:
-    import datetime as dt
+    from collections.abc import Generator, Iterable
     from pathlib import Path
 
     from ynab_unlinked.context_object import YnabUnlinkedContext
@@ -16,32 +19,46 @@ ANCHOR_LINE = "Límite de crédito".encode("cp1252").decode("cp1252")
 XLS_DEBIT_LINE = "MOVIMIENTOS DE DEBITO"
 TRANSACTION_PATTERN = re.compile(r"^(\d{2}/\d{2})\|(.+?)\|.+?\|([-]?\d+.*EUR)(\([\d*]\))?$")
 
+# Date, payee and amount of a transaction, before parsing the payee and the amount
+type Row = tuple[dt.date, str, str]
+
 
-class SabadellParser:
+class SabadellParser(Entity):
     def __init__(self, year: int):
         self.year = year
 
-    def parse(self, input_file: Path, context: YnabUnlinkedContext) -> list[Transaction]:
+    def iter_parse(
+        self, input_file: Path, context: YnabUnlinkedContext, since: dt.date | None = None
+    ) -> Generator[Transaction]:
         from ynab_unlinked.entities import InputType
+        from ynab_unlinked.models import Transaction
         from ynab_unlinked.utils import extract_type
 
         input_type = extract_type(input_file, valid=[InputType.TXT, InputType.XLS])
 
         match input_type:
             case InputType.TXT:
-                return self.__parse_txt(input_file)
+                rows = self.__rows_from_txt(input_file)
             case InputType.XLS:
-                return self.__parse_xls(input_file)
+                rows = self.__rows_from_xls(input_file)
             case _:
                 # Should never happen because we already checked
                 raise RuntimeError(f"Unexpected input type: {input_type}")
 
-    def __parse_txt(self, input_file: Path) -> list[Transaction]:
-        from ynab_unlinked.models import Transaction
+        for date, payee, amount in self._adjust_year_transition(rows):
+            # Sabadell files have no guaranteed order, so older rows are skipped instead of stopping
+            if since is not None and date < since:
+                continue
+
+            yield Transaction(
+                date=date,
+                payee=self.__parse_payee(payee),
+                amount=-self.__parse_amount(amount),
+            )
 
+    def __rows_from_txt(self, input_file: Path) -> Generator[Row]:
         lines = input_file.read_text(encoding="cp1252").splitlines()
         start = False
-        transactions: list[Transaction] = []
         for line in lines:
             if ANCHOR_LINE in line:
                 start = True
@@ -55,25 +72,14 @@ class SabadellParser:
                     # Pending transaction
                     continue
 
-                transactions.append(
-                    Transaction(
-                        date=self.__parse_date(match[1]),
-                        payee=self.__parse_payee(match[2]),
-                        amount=-self.__parse_amount(match[3]),
-                    )
-                )
-
-        return self._adjust_year_transition(transactions)
+                yield self.__parse_date(match[1]), match[2], match[3]
 
-    def __parse_xls(self, input_file: Path) -> list[Transaction]:
-        from ynab_unlinked.models import Transaction
+    def __rows_from_xls(self, input_file: Path) -> Generator[Row]:
         from ynab_unlinked.parsers import xls
 
         # This is the row after which real transactions appear
         row_trigger = ["FECHA", "CONCEPTO", "LOCALIDAD"]
 
-        transactions = []
-
         for entry in xls(input_file, read_after_row_like=row_trigger, allow_partial_match=True):
             # If we find debit movements, stop reading
             # Debit movements appear at the end of the file
@@ -94,17 +100,9 @@ class SabadellParser:
             except Exception:
                 continue
 
-            transactions.append(
-                Transaction(
-                    date=parsed_date,
-                    payee=self.__parse_payee(payee),
-                    amount=-self.__parse_amount(amount),
-                )
-            )
-
-        return self._adjust_year_transition(transactions)
+            yield parsed_date, payee, amount
 
-    def _adjust_year_transition(self, transactions: list[Transaction]) -> list[Transaction]:
+    def _adjust_year_transition(self, rows: Iterable[Row]) -> Generator[Row]:
         """
         Adjust transactions dates when a year transition is detected.
 
@@ -112,19 +110,34 @@ class SabadellParser:
         transactions from December and January, we need to infer the year.
 
         If we find transactions in January and December, we assume that the December transactions
-        belong to the previous year.
+        belong to the previous year. December transactions found before any January one are held
+        back until a January one is found or the file ends.
         """
-        months = {t.date.month for t in transactions}
-        if 1 in months and 12 in months:
-            for t in transactions:
-                if t.date.month == 12:
-                    t.date = t.date.replace(year=t.date.year - 1)
+        january_found = False
+        december: list[Row] = []
+
+        def previous_year(row: Row) -> Row:
+            date, payee, amount = row
+            return date.replace(year=date.year - 1), payee, amount
+
+        for row in rows:
+            match row[0].month:
+                case 1 if not january_found:
+                    january_found = True
+                    yield from map(previous_year, december)
+                    december.clear()
+                case 12 if january_found:
+                    yield previous_year(row)
+                    continue
+                case 12:
+                    december.append(row)
+                    continue
 
-        return transactions
+            yield row
 
-    def __parse_date(self, raw: str) -> dt.date:
-        import datetime as dt
+        yield from december
 
+    def __parse_date(self, raw: str) -> dt.date:
         current_year = self.year
         return dt.datetime.strptime(f"{raw}/{current_year}", "%d/%m/%Y").date()
 
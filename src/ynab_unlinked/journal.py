@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import datetime as dt
+from collections.abc import Iterable
+from pathlib import Path
+
+from pydantic import BaseModel, Field
+from ynab import TransactionClearedStatus
+
+
+class JournalEntry(BaseModel):
+    id: str
+    account_id: str
+    date: dt.date
+    cleared: TransactionClearedStatus = TransactionClearedStatus.RECONCILED
+
+
+class ReconcileJournal(BaseModel):
+    """
+    Record of a reconciliation being sent to YNAB.
+
+    The journal is saved before sending any transaction and updated after every chunk is
+    committed, so that an interrupted reconciliation can be resumed without sending again the
+    transactions that YNAB already has as reconciled.
+    """
+
+    budget_id: str
+    entries: list[JournalEntry]
+    committed: set[str] = Field(default_factory=set)
+    # Cleared balance each account will have once every entry has been committed
+    reconciled_balances: dict[str, int] = Field(default_factory=dict)
+
+    @staticmethod
+    def path() -> Path:
+        from ynab_unlinked.config.paths import cache_dir
+
+        return cache_dir() / "reconcile_journal.json"
+
+    def save(self):
+        self.path().parent.mkdir(parents=True, exist_ok=True)
+        self.path().write_text(self.model_dump_json())
+
+    @staticmethod
+    def load() -> ReconcileJournal | None:
+        if not ReconcileJournal.path().is_file():
+            return None
+        return ReconcileJournal.model_validate_json(ReconcileJournal.path().read_text())
+
+    @staticmethod
+    def delete():
+        ReconcileJournal.path().unlink(missing_ok=True)
+
+    def remaining(self) -> list[JournalEntry]:
+        return [entry for entry in self.entries if entry.id not in self.committed]
+
+    def mark_committed(self, entries: Iterable[JournalEntry]):
+        self.committed.update(entry.id for entry in entries)
+        self.save()
+
+    @property
+    def latest_date(self) -> dt.date:
+        return max(entry.date for entry in self.entries)
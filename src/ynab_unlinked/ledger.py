@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from pathlib import Path
+
+from ynab_unlinked.models import Transaction
+
+# Import IDs are the first 30 hex digits of a sha256, stored as their raw bytes
+ID_SIZE = 15
+
+
+class ImportLedger:
+    """
+    Import IDs of the transactions of an account that YNAB already has.
+
+    Transactions are recorded once they have been created in YNAB or matched with a transaction
+    that was already there, so that the next imports of overlapping statements can skip them
+    without requesting anything to YNAB. The IDs include the counter of duplicated transactions,
+    so they have to be recorded and checked after the counters are set.
+
+    The IDs of each account are appended to a file in the cache dir, with no separators, and
+    loaded into a set for the membership checks.
+    """
+
+    def __init__(self, account_id: str):
+        self.account_id = account_id
+        self._ids = self._load()
+
+    @staticmethod
+    def path(account_id: str) -> Path:
+        from ynab_unlinked.config.paths import cache_dir
+
+        return cache_dir() / "ledger" / account_id
+
+    def _load(self) -> set[bytes]:
+        path = self.path(self.account_id)
+        if not path.is_file():
+            return set()
+
+        data = path.read_bytes()
+        # A write interrupted half way leaves an incomplete ID at the end, which is ignored
+        end = len(data) - len(data) % ID_SIZE
+        return {data[start : start + ID_SIZE] for start in range(0, end, ID_SIZE)}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, transaction: Transaction) -> bool:
+        return bytes.fromhex(transaction.id) in self._ids
+
+    def add(self, transactions: Iterable[Transaction]):
+        new_ids = {bytes.fromhex(t.id) for t in transactions} - self._ids
+        if not new_ids:
+            return
+
+        path = self.path(self.account_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("ab") as ledger_file:
+            if incomplete := ledger_file.tell() % ID_SIZE:
+                ledger_file.truncate(ledger_file.tell() - incomplete)
+            ledger_file.write(b"".join(sorted(new_ids)))
+
+        self._ids |= new_ids
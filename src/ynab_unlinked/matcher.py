@@ -1,25 +1,25 @@
-from ynab.models.transaction_detail import TransactionDetail
+import datetime as dt
+from collections import defaultdict
+from collections.abc import Generator, Iterable, Sequence
 
 from ynab_unlinked.config import ConfigV2
-from ynab_unlinked.models import MatchStatus, TransactionWithYnabData
+from ynab_unlinked.models import MatchStatus, TransactionWithYnabData, YnabTransaction
 from ynab_unlinked.payee import payee_matches
 
 TIME_WINDOW_MATCH_DAYS = 10
 
 
-def __match_date(transaction: TransactionWithYnabData, ynab_transaction: TransactionDetail) -> bool:
+def __match_date(transaction: TransactionWithYnabData, ynab_transaction: YnabTransaction) -> bool:
     return abs((ynab_transaction.var_date - transaction.date).days) <= TIME_WINDOW_MATCH_DAYS
 
 
-def __match_amount(
-    transaction: TransactionWithYnabData, ynab_transaction: TransactionDetail
-) -> bool:
+def __match_amount(transaction: TransactionWithYnabData, ynab_transaction: YnabTransaction) -> bool:
     return ynab_transaction.amount == round(transaction.amount * 1000)
 
 
 def __match_single_transaction(
     transaction: TransactionWithYnabData,
-    ynab_transactions: list[TransactionDetail],
+    ynab_transactions: Iterable[YnabTransaction],
     ynab_matched: set[str],
     reconcile: bool,
     config: ConfigV2,
@@ -53,7 +53,7 @@ def __match_single_transaction(
 
 def __finalize_match(
     transaction: TransactionWithYnabData,
-    ynab_transaction: TransactionDetail,
+    ynab_transaction: YnabTransaction,
     reconcile: bool,
     similar_payee: bool,
 ):
@@ -70,38 +70,113 @@ def __finalize_match(
     return
 
 
+def __match_transaction(
+    transaction: TransactionWithYnabData,
+    ynab_transactions: Iterable[YnabTransaction],
+    ynab_by_import_id: dict[str, YnabTransaction],
+    ynab_matched: set[str],
+    reconcile: bool,
+    config: ConfigV2,
+):
+    # Prio 1: Direct match by import_id
+    # We check if the transaction we are processing has a corresponding
+    # transaction in YNAB with the same import_id. Using import_id is
+    # the most reliable way to match transactions to avoid duplicates.
+    if transaction.id in ynab_by_import_id:
+        ynab_transaction = ynab_by_import_id[transaction.id]
+        if ynab_transaction.id not in ynab_matched:
+            ynab_matched.add(ynab_transaction.id)
+            # If we match by import_id we consider it a full match
+            # regardless of the payee so we don't ask the user to confirm
+            __finalize_match(transaction, ynab_transaction, reconcile, similar_payee=True)
+            return
+
+    __match_single_transaction(transaction, ynab_transactions, ynab_matched, reconcile, config)
+
+
 def match_transactions(
     transactions: list[TransactionWithYnabData],
-    ynab_transactions: list[TransactionDetail],
+    ynab_transactions: Sequence[YnabTransaction],
     reconcile: bool,
     config: ConfigV2,
+    ynab_matched: set[str] | None = None,
 ):
-    """Match imported transactions to existing YNAB transactions"""
+    """
+    Match imported transactions to existing YNAB transactions.
+
+    When matching transactions in several calls, pass the same `ynab_matched` set to all of them
+    so that a YNAB transaction is not matched more than once.
+    """
 
     # This keep track of ynab transactions already matched
     # The intention is that if a transaction on the same date, payee and amount
     # happens twice, we do not match different imported transaction
     # to a single existing transaction in YNAB
-    ynab_matched: set[str] = set()
+    if ynab_matched is None:
+        ynab_matched = set()
 
     # Pre-sort transactions to encourage FIFO matching
     transactions.sort(key=lambda t: t.date)
 
     # Create a map of import_id to transaction for fast lookup
-    ynab_by_import_id = {t.import_id: t for t in ynab_transactions if getattr(t, "import_id", None)}
+    ynab_by_import_id = {t.import_id: t for t in ynab_transactions if t.import_id is not None}
+
+    for transaction in transactions:
+        __match_transaction(
+            transaction, ynab_transactions, ynab_by_import_id, ynab_matched, reconcile, config
+        )
+
+
+class MatchingIndex:
+    """
+    YNAB transactions indexed by date and by import id, to match imported transactions in chunks.
+
+    Each imported transaction is only compared with the YNAB transactions within
+    `TIME_WINDOW_MATCH_DAYS` of its date instead of with every fetched one, whatever the order the
+    transactions come in. Import ids are looked up in every fetched transaction, so a YNAB
+    transaction whose date was edited is still found. Every fetched transaction is held, which
+    makes matching faster for long histories but does not reduce memory.
+    """
+
+    def __init__(self, ynab_transactions: Iterable[YnabTransaction]):
+        self.by_date: dict[dt.date, list[YnabTransaction]] = defaultdict(list)
+        self.by_import_id: dict[str, YnabTransaction] = {}
+        for ynab_transaction in ynab_transactions:
+            self.by_date[ynab_transaction.var_date].append(ynab_transaction)
+            if ynab_transaction.import_id is not None:
+                self.by_import_id[ynab_transaction.import_id] = ynab_transaction
+
+    def around(self, date: dt.date) -> Generator[YnabTransaction]:
+        """YNAB transactions within the matching window of `date`, sorted by date"""
+        for offset in range(-TIME_WINDOW_MATCH_DAYS, TIME_WINDOW_MATCH_DAYS + 1):
+            yield from self.by_date.get(date + dt.timedelta(days=offset), ())
+
+
+def match_transactions_windowed(
+    transactions: list[TransactionWithYnabData],
+    index: MatchingIndex,
+    reconcile: bool,
+    config: ConfigV2,
+    ynab_matched: set[str] | None = None,
+):
+    """
+    Match imported transactions to the YNAB transactions of a `MatchingIndex`.
+
+    Works like `match_transactions` with the YNAB transactions sorted by date, but each
+    transaction is only compared with the YNAB transactions around its date. Several calls can
+    share the index and `ynab_matched`, so that a YNAB transaction is not matched more than once.
+    """
+    if ynab_matched is None:
+        ynab_matched = set()
+
+    transactions.sort(key=lambda t: t.date)
 
     for transaction in transactions:
-        # Prio 1: Direct match by import_id
-        # We check if the transaction we are processing has a corresponding
-        # transaction in YNAB with the same import_id. Using import_id is
-        # the most reliable way to match transactions to avoid duplicates.
-        if transaction.id in ynab_by_import_id:
-            ynab_transaction = ynab_by_import_id[transaction.id]
-            if ynab_transaction.id not in ynab_matched:
-                ynab_matched.add(ynab_transaction.id)
-                # If we match by import_id we consider it a full match
-                # regardless of the payee so we don't ask the user to confirm
-                __finalize_match(transaction, ynab_transaction, reconcile, similar_payee=True)
-                continue
-
-        __match_single_transaction(transaction, ynab_transactions, ynab_matched, reconcile, config)
+        __match_transaction(
+            transaction,
+            index.around(transaction.date),
+            index.by_import_id,
+            ynab_matched,
+            reconcile,
+            config,
+        )
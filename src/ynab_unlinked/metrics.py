@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+import statistics
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ynab_unlinked.profiling import Profiler
+
+
+@dataclass
+class RunMetrics:
+    """Outcome of an import, filled in while the transactions are processed"""
+
+    entity: str | None = None
+    input_file: Path | None = None
+    parsed: int = 0
+    matched: int = 0
+    partial_matches: int = 0
+    created: int = 0
+    skipped: int = 0
+    # Whether the import got to the end, instead of being aborted or failing
+    completed: bool = False
+
+
+def latency_summary(latencies: list[float]) -> dict[str, float] | None:
+    if not latencies:
+        return None
+
+    ordered = sorted(latencies)
+
+    def percentile(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+
+    return {
+        "total_ms": sum(ordered) * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": percentile(0.5),
+        "p95_ms": percentile(0.95),
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def metrics_record(command: str, metrics: RunMetrics, profiler: Profiler) -> dict[str, Any]:
+    from ynab_unlinked.__about__ import __version__
+
+    input_file = metrics.input_file
+    return {
+        "timestamp": dt.datetime.now(dt.UTC).isoformat(timespec="seconds"),
+        "version": __version__,
+        "command": command,
+        "entity": metrics.entity,
+        "input_file": None if input_file is None else str(input_file),
+        "file_size": input_file.stat().st_size if input_file and input_file.is_file() else None,
+        "completed": metrics.completed,
+        "transactions": {
+            "parsed": metrics.parsed,
+            "matched": metrics.matched,
+            "partial_matches": metrics.partial_matches,
+            "created": metrics.created,
+            "skipped": metrics.skipped,
+        },
+        "api": {
+            "calls": len(profiler.latencies),
+            "bytes": sum(phase.api_bytes for phase in profiler.phases),
+            "latency": latency_summary(profiler.latencies),
+        },
+        "cache": {
+            name: {"hits": stats.hits, "misses": stats.misses, "hit_rate": stats.hit_rate}
+            for name, stats in profiler.caches.items()
+        },
+        "phases": {
+            phase.name: {"wall_s": phase.wall, "cpu_s": phase.cpu, "rows": phase.rows}
+            for phase in profiler.totals()
+        },
+    }
+
+
+def write_metrics(path: Path, record: dict[str, Any]):
+    """Append the record to the JSON lines file in `path`"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as metrics_file:
+        metrics_file.write(json.dumps(record) + "\n")
@@ -1,8 +1,10 @@
+from __future__ import annotations
+
 import datetime as dt
 from dataclasses import dataclass
-from enum import Enum
+from enum import Enum, StrEnum
 from hashlib import sha256
-from typing import assert_never
+from typing import Any, assert_never
 
 from ynab.models.transaction_cleared_status import TransactionClearedStatus
 from ynab.models.transaction_detail import TransactionDetail
@@ -14,6 +16,52 @@ class MatchStatus(Enum):
     PARTIAL_MATCH = "partial_match"
 
 
+class PartialMatchPolicy(StrEnum):
+    """What to do with transactions whose date and amount match but the payee does not"""
+
+    ASK = "ask"
+    ACCEPT = "accept"
+    REJECT = "reject"
+
+
+@dataclass(slots=True)
+class TransactionRecord:
+    """
+    The fields of a YNAB transaction needed to match and reconcile it.
+
+    Building them from the raw JSON is much cheaper than validating a full `TransactionDetail`,
+    which is only worth it when the rest of the fields are needed.
+    """
+
+    id: str
+    account_id: str
+    var_date: dt.date
+    amount: int
+    cleared: TransactionClearedStatus
+    payee_name: str | None = None
+    payee_id: str | None = None
+    import_id: str | None = None
+    deleted: bool = False
+
+    @staticmethod
+    def from_json(data: dict[str, Any]) -> TransactionRecord:
+        return TransactionRecord(
+            id=data["id"],
+            account_id=data["account_id"],
+            var_date=dt.date.fromisoformat(data["date"]),
+            amount=data["amount"],
+            cleared=TransactionClearedStatus(data["cleared"]),
+            payee_name=data.get("payee_name"),
+            payee_id=data.get("payee_id"),
+            import_id=data.get("import_id"),
+            deleted=data.get("deleted", False),
+        )
+
+
+# Transactions as returned by YNAB, either complete or only with the fields needed to match them
+type YnabTransaction = TransactionDetail | TransactionRecord
+
+
 @dataclass
 class Transaction:
     """Represents a transaction imported from a file by a given entity"""
@@ -62,7 +110,7 @@ class TransactionWithYnabData(Transaction):
             amount=transaction.amount,
         )
         self.match_status: MatchStatus = MatchStatus.UNMATCHED
-        self.partial_match: TransactionDetail | None = None
+        self.partial_match: YnabTransaction | None = None
         self.ynab_id: str | None = None
         self.ynab_payee_id: str | None = None
         self.ynab_payee: str | None = transaction.payee
@@ -145,7 +193,7 @@ class TransactionWithYnabData(Transaction):
         self.ynab_payee = self.payee
         self.ynab_payee_id = None
 
-    def update_cleared_from_ynab(self, ynab_transaction: TransactionDetail, reconcile: bool):
+    def update_cleared_from_ynab(self, ynab_transaction: YnabTransaction, reconcile: bool):
         if ynab_transaction.cleared is TransactionClearedStatus.RECONCILED or reconcile:
             self.cleared = TransactionClearedStatus.RECONCILED
         elif ynab_transaction.cleared is TransactionClearedStatus.UNCLEARED:
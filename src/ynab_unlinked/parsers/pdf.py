@@ -1,12 +1,31 @@
+from __future__ import annotations
+
 import contextlib
 import io
 from collections.abc import Generator, Sequence
 from pathlib import Path
-from typing import Any, Literal, overload
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple, overload
 
 from ynab_unlinked import display
 from ynab_unlinked.exceptions import ParsingError
 
+if TYPE_CHECKING:
+    from pypdfium2 import PdfDocument
+
+# Distance, in points, a text can start to the left of the header of its column
+COLUMN_TOLERANCE = 3
+
+
+class TextRun(NamedTuple):
+    left: float
+    bottom: float
+    top: float
+    text: str
+
+    @property
+    def middle(self) -> float:
+        return (self.bottom + self.top) / 2
+
 
 @overload
 def pdf(
@@ -14,6 +33,7 @@ def pdf(
     allow_empty_columns: Literal[False] = False,
     table_settings: dict[str, Any] | None = None,
     expected_number_of_columns: int | None = None,
+    header: Sequence[str] | None = None,
 ) -> Generator[Sequence[str]]: ...
 
 
@@ -23,6 +43,7 @@ def pdf(
     allow_empty_columns: Literal[True] = True,
     table_settings: dict[str, Any] | None = None,
     expected_number_of_columns: int | None = None,
+    header: Sequence[str] | None = None,
 ) -> Generator[Sequence[str | None]]: ...
 
 
@@ -31,6 +52,7 @@ def pdf(
     allow_empty_columns: bool = False,
     table_settings: dict[str, Any] | None = None,
     expected_number_of_columns: int | None = None,
+    header: Sequence[str] | None = None,
 ) -> Generator[Sequence[str | None]]:
     """
     Parse a pdf and extract the main table from it. The table is extracted using
@@ -40,6 +62,10 @@ def pdf(
     - input_file (Path): the input file to parse
     - table_settings (dict[str, Any]): these are the table settings passed
       to pdfpluber (see [docs](https://github.com/jsvine/pdfplumber/tree/stable?tab=readme-ov-file#table-extraction-settings))
+    - header (Sequence[str]): the texts of the header of the table. When given, the rows are
+      read from the text layer of each page, which is much faster than detecting the table.
+      Pages where the header is not found, or whose text is not laid out in rows under it, fall
+      back to the table extraction.
 
     The method yields elements from a list of rows that contains a list of columns as
     Sequence[str]
@@ -51,9 +77,21 @@ def pdf(
     # no impact that break the usage of the tool
     stderr_capture = io.StringIO()
 
-    with contextlib.redirect_stderr(stderr_capture), pdfplumber.open(input_file) as pdf:
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(contextlib.redirect_stderr(stderr_capture))
+        pdf = stack.enter_context(pdfplumber.open(input_file))
+        document = None if header is None else stack.enter_context(_text_layer(input_file))
+
         for page_number, page in enumerate(pdf.pages):
-            table = page.extract_table(table_settings=table_settings or {})
+            table = None
+            if document is not None and header is not None:
+                table = _text_layer_table(_text_runs(document, page_number), header)
+            if table is None:
+                table = page.extract_table(table_settings=table_settings or {})
+                # pdfplumber keeps the objects of the page while the document is open. The table
+                # is all that is needed from it, so they are released before the next page
+                page.close()
+
             if table is None:
                 raise ParsingError(
                     input_file,
@@ -85,3 +123,79 @@ def pdf(
         ]:
             remaining_output = "\n".join(remaining_lines)
             display.warning(f"Potential PDF issue reading {input_file}:\n{remaining_output}")
+
+
+@contextlib.contextmanager
+def _text_layer(input_file: Path) -> Generator[PdfDocument]:
+    import pypdfium2
+
+    document = pypdfium2.PdfDocument(input_file)
+    try:
+        yield document
+    finally:
+        document.close()
+
+
+def _text_runs(document: PdfDocument, page_number: int) -> list[TextRun]:
+    page = document[page_number]
+    text_page = page.get_textpage()
+    try:
+        runs = []
+        for index in range(text_page.count_rects()):
+            left, bottom, right, top = text_page.get_rect(index)
+            if text := text_page.get_text_bounded(left, bottom, right, top).strip():
+                runs.append(TextRun(left, bottom, top, text))
+        return runs
+    finally:
+        text_page.close()
+        page.close()
+
+
+def _text_lines(runs: list[TextRun]) -> list[list[TextRun]]:
+    # Runs are grouped in lines from the top of the page, each line sorted from left to right
+    lines: list[list[TextRun]] = []
+    for run in sorted(runs, key=lambda run: -run.top):
+        if lines and run.middle > lines[-1][0].bottom:
+            lines[-1].append(run)
+        else:
+            lines.append([run])
+    return [sorted(line, key=lambda run: run.left) for line in lines]
+
+
+def _text_layer_table(runs: list[TextRun], header: Sequence[str]) -> list[list[str]] | None:
+    """
+    Rows of the table below the header, or None if the text is not laid out as expected.
+
+    Each text goes to the column whose header starts to its left. A line with text in every
+    column starts a new row, and the lines after it with some empty columns are the next lines of
+    its cells. A line of that kind too far from the previous one is the end of the table.
+    """
+    lines = iter(_text_lines(runs))
+    for line in lines:
+        if [run.text for run in line] == list(header):
+            starts = [run.left - COLUMN_TOLERANCE for run in line]
+            previous = line
+            break
+    else:
+        return None
+
+    rows: list[list[list[str]]] = []
+    for line in lines:
+        cells: list[list[str]] = [[] for _ in header]
+        for run in line:
+            column = max(sum(start <= run.left for start in starts) - 1, 0)
+            cells[column].append(run.text)
+
+        if all(cells):
+            rows.append([[" ".join(cell)] for cell in cells])
+        elif not rows:
+            return None
+        elif previous[0].bottom - line[0].top > line[0].top - line[0].bottom:
+            break
+        else:
+            for cell_lines, cell in zip(rows[-1], cells, strict=True):
+                if cell:
+                    cell_lines.append(" ".join(cell))
+        previous = line
+
+    return [list(header), *(["\n".join(cell) for cell in row] for row in rows)]
@@ -1,17 +1,35 @@
+import threading
 from typing import overload
 
 import unidecode
 from rapidfuzz import fuzz
 from ynab.models.payee import Payee
-from ynab.models.transaction_detail import TransactionDetail
 
 from ynab_unlinked.config import ConfigV2
-from ynab_unlinked.models import TransactionWithYnabData
+from ynab_unlinked.models import TransactionWithYnabData, YnabTransaction
+from ynab_unlinked.profiling import NullProfiler, Profiler
 from ynab_unlinked.ynab_api import Client
 
 FUZZY_MATCH_THRESHOLD = 90
 
 
+class PayeeCache:
+    """Payees of a budget, requested once and shared between imports running in parallel"""
+
+    def __init__(self, profiler: Profiler | None = None):
+        self._payees: dict[str, list[Payee]] = {}
+        self._lock = threading.Lock()
+        self._profiler = profiler or NullProfiler()
+
+    def get(self, client: Client, budget_id: str) -> list[Payee]:
+        with self._lock:
+            hit = budget_id in self._payees
+            self._profiler.record_cache("payees", hit=hit)
+            if not hit:
+                self._payees[budget_id] = client.payees(budget_id=budget_id)
+            return self._payees[budget_id]
+
+
 def __preprocess_payee(value: str) -> str:
     result = value.lower().replace(" ", "")
     return unidecode.unidecode(result)
@@ -21,7 +39,7 @@ def __preprocess_payee(value: str) -> str:
 def payee_matches(
     transaction: TransactionWithYnabData,
     config: ConfigV2,
-    payee_source: TransactionDetail,
+    payee_source: YnabTransaction,
 ) -> bool: ...
 
 
@@ -34,14 +52,14 @@ def payee_matches(
 def payee_matches(
     transaction: TransactionWithYnabData,
     config: ConfigV2,
-    payee_source: TransactionDetail | Payee,
+    payee_source: YnabTransaction | Payee,
 ) -> bool:
-    if isinstance(payee_source, TransactionDetail):
+    if isinstance(payee_source, Payee):
+        payee_name = payee_source.name
+    else:
         if payee_source.payee_name is None:
             return False
         payee_name = payee_source.payee_name
-    else:
-        payee_name = payee_source.name
 
     if payee_name == transaction.payee:
         return True
@@ -79,12 +97,16 @@ def __match_from_payee_list(
 
 
 def set_payee_from_ynab(
-    transactions: list[TransactionWithYnabData], client: Client, config: ConfigV2
+    transactions: list[TransactionWithYnabData],
+    client: Client,
+    config: ConfigV2,
+    payees: list[Payee] | None = None,
 ):
     """
     Compare each transaction payee with an existing YNAB payee and set the payee from YNAB if a match is found
+
+    The payees are requested to YNAB only if needed and not given in `payees`.
     """
-    payees = None
     for t in transactions:
         # First check if we have previous naming rules
         if payee := config.payee_from_fules(t.payee):
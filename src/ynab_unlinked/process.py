@@ -1,5 +1,7 @@
 import datetime as dt
-from collections.abc import Generator
+from collections.abc import Generator, Iterable
+from dataclasses import dataclass
+from itertools import chain
 from pathlib import Path
 
 import typer
@@ -12,22 +14,52 @@ from ynab_unlinked.context_object import YnabUnlinkedContext
 from ynab_unlinked.display import bullet_list, confirm, console, info, process, question
 from ynab_unlinked.entities import Entity
 from ynab_unlinked.exceptions import ParsingError
-from ynab_unlinked.matcher import match_transactions
-from ynab_unlinked.models import MatchStatus, Transaction, TransactionWithYnabData
-from ynab_unlinked.payee import set_payee_from_ynab
+from ynab_unlinked.ledger import ImportLedger
+from ynab_unlinked.matcher import (
+    MatchingIndex,
+    match_transactions,
+    match_transactions_windowed,
+)
+from ynab_unlinked.models import (
+    MatchStatus,
+    PartialMatchPolicy,
+    Transaction,
+    TransactionWithYnabData,
+)
+from ynab_unlinked.payee import PayeeCache, set_payee_from_ynab
+from ynab_unlinked.profiling import Profiler
 from ynab_unlinked.utils import (
     display_partial_matches,
     display_transaction_table,
     display_transactions_to_upload,
 )
+from ynab_unlinked.ynab_api import MetadataCache
 from ynab_unlinked.ynab_api.client import Client
 
 # Request transactions to the YNAB API from the last checkpoint date minus 10 days for buffer
 TRANSACTIONS_DAYES_BEFORE_LAST_EXTRACTION = 10
+# Minimum number of transactions matched and uploaded at once by `import_in_chunks`
+PIPELINE_CHUNK_SIZE = 500
+
+
+@dataclass
+class PipelineResult:
+    """Counts of an import made in chunks"""
 
+    parsed: int = 0
+    matched: int = 0
+    partial_matches: int = 0
+    created: int = 0
+    # Transactions skipped because they were already imported in a previous run
+    skipped: int = 0
+    chunks: int = 0
 
-def add_past_to_transactions(transactions: list[Transaction], checkpoint: Checkpoint | None):
+
+def add_past_to_transactions(
+    transactions: Iterable[Transaction], checkpoint: Checkpoint | None
+) -> Generator[Transaction]:
     if checkpoint is None:
+        yield from transactions
         return
 
     for t in transactions:
@@ -35,9 +67,12 @@ def add_past_to_transactions(transactions: list[Transaction], checkpoint: Checkp
             days=TRANSACTION_GRACE_PERIOD_DAYS
         ):
             t.past = True
+        yield t
 
 
-def add_counter_to_existing_transactions(transactions: list[Transaction]):
+def add_counter_to_existing_transactions(
+    transactions: Iterable[Transaction],
+) -> Generator[Transaction]:
     """
     This method check every transaction that has the same date, payee and amount
     and increments its counter to ensure that they have a unique import ID when
@@ -50,34 +85,315 @@ def add_counter_to_existing_transactions(transactions: list[Transaction]):
         else:
             counters[t.id] += 1
             t.counter = counters[t.id]
+        yield t
+
+
+def preprocessed(
+    transactions: Iterable[Transaction], checkpoint: Checkpoint | None
+) -> Generator[Transaction]:
+    """Preprocess the transactions one by one, as they come"""
+    yield from add_counter_to_existing_transactions(
+        add_past_to_transactions(transactions, checkpoint)
+    )
 
 
 def preprocess_transactions(transactions: list[Transaction], checkpoint: Checkpoint | None):
-    add_past_to_transactions(transactions, checkpoint)
-    add_counter_to_existing_transactions(transactions)
+    for _ in preprocessed(transactions, checkpoint):
+        pass
+
+
+def parse_transactions(
+    entity: Entity,
+    input_file: Path,
+    context: YnabUnlinkedContext,
+    checkpoint: Checkpoint | None,
+) -> list[Transaction]:
+    """Parse the input file, preprocessing every transaction as soon as it is parsed"""
+    transactions = entity.iter_parse(input_file, context, since=parse_since(context, checkpoint))
+    return list(preprocessed(transactions, checkpoint))
 
 
 def filter_transactions(
-    transactions: list[Transaction], checkpoint: Checkpoint | None
+    transactions: Iterable[Transaction], ledger: ImportLedger
 ) -> Generator[Transaction]:
-    # Checkpoint filtering has many issues when dealing with old trasactions that took time to
-    # be processed. While we rethink it lets just not filter them
-    # if checkpoint is None:
-    yield from transactions
-    return
+    """
+    Drop the transactions recorded in the ledger, which YNAB already has.
+
+    The counters must be set before filtering, since they are part of the import IDs.
+    """
+    yield from (t for t in transactions if t not in ledger)
+
+
+def reprocess_all(context: YnabUnlinkedContext) -> bool:
+    """Whether transactions already processed are processed again, to reconcile them or with `full`"""
+    return context.full or context.reconcile
 
-    # yield from (t for t in transactions if t.date >= checkpoint.latest_date_processed)
 
+def account_checkpoint(config: ConfigV2, entity_name: str, account_id: str) -> Checkpoint | None:
+    """Checkpoint of the imports of the entity to the account, since each account has its own"""
+    if (entity_config := config.entity(entity_name)) is None:
+        return None
+    return entity_config.checkpoint_for(account_id)
+
+
+def parse_since(context: YnabUnlinkedContext, checkpoint: Checkpoint | None) -> dt.date | None:
+    """Date from which to parse transactions, since the older ones were already processed"""
+    if checkpoint is None or context.show or reprocess_all(context):
+        return None
+    return checkpoint.latest_date_processed
+
+
+def pending_transactions(
+    transactions: list[Transaction],
+    checkpoint: Checkpoint | None,
+    ledger: ImportLedger,
+    context: YnabUnlinkedContext,
+) -> list[Transaction]:
+    """
+    Transactions that YNAB may not have yet.
+
+    Nothing is pending when there is nothing newer than the checkpoint, otherwise the
+    transactions in the ledger are dropped. When reconciling or with `full`, every transaction
+    is pending so that they are all matched again.
+    """
+    if reprocess_all(context):
+        return transactions
+
+    if checkpoint is not None and not checkpoint.has_new_transactions(transactions):
+        return []
+
+    return list(filter_transactions(transactions, ledger))
+
+
+def iter_pending_transactions(
+    transactions: Iterable[Transaction],
+    checkpoint: Checkpoint | None,
+    ledger: ImportLedger,
+    context: YnabUnlinkedContext,
+) -> Generator[Transaction]:
+    """
+    Same as `pending_transactions`, for transactions that are still being parsed.
+
+    Until a transaction newer than the checkpoint shows up, the transactions are held to tell
+    whether there is anything new at all. Those are only the transactions within the grace period
+    of the checkpoint, since the older ones are not parsed.
+    """
+    if reprocess_all(context):
+        yield from transactions
+        return
+
+    if checkpoint is not None:
+        newest_processed = checkpoint.latest_date_processed + dt.timedelta(
+            days=TRANSACTION_GRACE_PERIOD_DAYS
+        )
+        transactions = iter(transactions)
+        held: list[Transaction] = []
+        for t in transactions:
+            held.append(t)
+            if t.date > newest_processed:
+                break
+        else:
+            if not checkpoint.has_new_transactions(held):
+                return
+
+        transactions = chain(held, transactions)
+
+    yield from filter_transactions(transactions, ledger)
+
+
+class RecentTransactions:
+    """Transactions within the grace period of the newest one added, all a checkpoint is made of"""
+
+    def __init__(self):
+        self.transactions: list[Transaction] = []
+        self._newest: dt.date | None = None
+
+    def add(self, transaction: Transaction):
+        grace_period = dt.timedelta(days=TRANSACTION_GRACE_PERIOD_DAYS)
+        if self._newest is None or transaction.date > self._newest:
+            self._newest = transaction.date
+            self.transactions = [
+                t for t in self.transactions if t.date >= self._newest - grace_period
+            ]
+
+        if transaction.date >= self._newest - grace_period:
+            self.transactions.append(transaction)
+
+
+def date_chunks(transactions: Iterable[Transaction], size: int) -> Generator[list[Transaction]]:
+    """
+    Group transactions sorted by date in chunks of at least `size` transactions.
 
-def get_or_prompt_account_id(config: ConfigV2, entity_name: str, force_prompt: bool) -> str:
+    Transactions from the same date are never split across chunks, so that duplicated
+    transactions always end up in the same chunk.
+    """
+    chunk: list[Transaction] = []
+    for t in transactions:
+        if len(chunk) >= size and t.date != chunk[-1].date:
+            yield chunk
+            chunk = []
+        chunk.append(t)
+
+    if chunk:
+        yield chunk
+
+
+def resolve_partial_matches(
+    partial_matches: list[TransactionWithYnabData], accept: bool, config: ConfigV2
+):
+    final_matching = MatchStatus.MATCHED if accept else MatchStatus.UNMATCHED
+    for t in partial_matches:
+        t.match_status = final_matching
+        if final_matching == MatchStatus.UNMATCHED:
+            t.reset_matching()
+
+    if final_matching == MatchStatus.MATCHED:
+        # If the user agreed to match these, add renaming rules to config
+        config.add_payee_rules(partial_matches)
+
+
+def import_in_chunks(
+    entity: Entity,
+    input_file: Path,
+    context: YnabUnlinkedContext,
+    account_id: str,
+    client: Client | None = None,
+    payee_cache: PayeeCache | None = None,
+) -> PipelineResult:
+    """
+    Import the transactions without any interaction, matching and uploading them in chunks.
+
+    Transactions are processed in chunks of `PIPELINE_CHUNK_SIZE`. Once the entity has a
+    checkpoint, the oldest transaction to fetch from YNAB is known upfront, and each chunk is
+    matched and uploaded as soon as it is parsed, before parsing the next one. Otherwise, the
+    pending transactions are parsed first to find the oldest one, and processed in date order.
+    Partial matches are accepted or rejected as set in the context, rejecting them when set to
+    ask.
+
+    Memory is not bounded: every YNAB transaction since the oldest one to match is fetched at
+    once, since YNAB sends them in a single response, and the pending transactions are held when
+    there is no checkpoint.
+
+    Imports running in parallel can share the `client` and the `payee_cache`.
+    """
+    config = context.config
+    profiler = context.profiler
+    result = PipelineResult()
+    checkpoint = account_checkpoint(config, entity.name(), account_id)
+    accept_partial_matches = context.partial_matches is PartialMatchPolicy.ACCEPT
+    ledger = ImportLedger(account_id)
+    recent = RecentTransactions()
+
+    since = parse_since(context, checkpoint)
+
+    def parsed() -> Generator[Transaction]:
+        for t in preprocessed(entity.iter_parse(input_file, context, since=since), checkpoint):
+            result.parsed += 1
+            recent.add(t)
+            yield t
+
+    pending: Iterable[Transaction] = iter_pending_transactions(
+        parsed(), checkpoint, ledger, context
+    )
+    # Oldest date of the transactions to match, the YNAB transactions are fetched from it
+    fetch_since = since
+    if fetch_since is None:
+        with profiler.phase("parse") as phase:
+            # Stable sort, transactions in the same date keep the order from the input file
+            pending = sorted(pending, key=lambda t: t.date)
+            phase.rows = result.parsed
+        fetch_since = pending[0].date if pending else None
+
+    client = client or Client(config.api_key, profiler=profiler)
+    payee_cache = payee_cache or PayeeCache(profiler)
+    budget_id = config.budget.id
+    index: MatchingIndex | None = None
+    ynab_matched: set[str] = set()
+    payees = None
+    n_pending = 0
+
+    chunks = date_chunks(pending, PIPELINE_CHUNK_SIZE)
+    while True:
+        with profiler.phase("parse") as phase:
+            n_parsed = result.parsed
+            chunk = next(chunks, None)
+            phase.rows = result.parsed - n_parsed
+        if chunk is None:
+            break
+
+        result.chunks += 1
+        n_pending += len(chunk)
+        transactions = [TransactionWithYnabData(t) for t in chunk]
+
+        # Parsers skip the transactions older than the checkpoint, but fetch again if one is not
+        oldest = min(t.date for t in chunk)
+        if index is None or fetch_since is None or oldest < fetch_since:
+            fetch_since = oldest if fetch_since is None else min(fetch_since, oldest)
+            with profiler.phase("fetch") as phase:
+                ynab_transactions = client.transaction_records(
+                    budget_id=budget_id,
+                    account_id=account_id,
+                    since_date=fetch_since - dt.timedelta(days=context.buffer),
+                )
+                phase.rows = len(ynab_transactions)
+            # Each transaction is only compared with the YNAB transactions around its date
+            index = MatchingIndex(sorted(ynab_transactions, key=lambda t: t.var_date))
+
+        with profiler.phase("match", rows=len(transactions)):
+            match_transactions_windowed(
+                transactions, index, context.reconcile, config, ynab_matched=ynab_matched
+            )
+
+        with profiler.phase("payees", rows=len(transactions)):
+            if payees is None and any(
+                config.payee_from_fules(t.payee) is None for t in transactions
+            ):
+                payees = payee_cache.get(client, budget_id)
+            set_payee_from_ynab(transactions, client, config, payees=payees)
+
+        result.matched += sum(t.match_status is MatchStatus.MATCHED for t in transactions)
+        if partial_matches := [
+            t
+            for t in transactions
+            if t.match_status is MatchStatus.PARTIAL_MATCH and t.needs_creation
+        ]:
+            result.partial_matches += len(partial_matches)
+            resolve_partial_matches(partial_matches, accept_partial_matches, config)
+
+        new_transactions = [t for t in transactions if t.needs_creation]
+        with profiler.phase("upload", rows=len(new_transactions)):
+            client.create_transactions(
+                budget_id=budget_id,
+                account_id=account_id,
+                transactions=new_transactions,
+            )
+        result.created += len(new_transactions)
+        # Every transaction of the chunk is now in YNAB, either matched or just created
+        ledger.add(chunk)
+
+    result.skipped = result.parsed - n_pending
+    if result.parsed:
+        config.update_and_save(recent.transactions, entity.name(), account_id)
+
+    return result
+
+
+def get_or_prompt_account_id(
+    config: ConfigV2, entity_name: str, force_prompt: bool, profiler: Profiler | None = None
+) -> str:
     if entity_name in config.entities and not force_prompt:
         return config.entities[entity_name].account_id
 
     display.info(f"Lets select the account for {entity_name.capitalize()}:")
-    client = Client(config.api_key)
+    client = Client(config.api_key, profiler=profiler)
     budget_id = config.budget.id
 
-    accounts = [acc for acc in client.accounts(budget_id=budget_id) if not acc.closed]
+    # Accounts rarely change, the cached ones are shown right away and refreshed for next time
+    accounts = [
+        acc
+        for acc in MetadataCache(client, profiler).accounts(budget_id=budget_id)
+        if not acc.closed and not acc.deleted
+    ]
 
     console().print(bullet_list(f"{idx + 1:>2}: {acc.name}" for idx, acc in enumerate(accounts)))
 
@@ -115,93 +431,139 @@ def process_transactions(
     config = context.config
     show = context.show
     reconcile = context.reconcile
+    profiler = context.profiler
+    metrics = context.metrics
+    metrics.entity = entity.name()
+    metrics.input_file = input_file
+
+    if context.assume_yes and (context.choose_account or entity.name() not in config.entities):
+        display.error(
+            f"No account is set for {entity.name().capitalize()} and --yes does not allow to "
+            "prompt for one. Run the import once without --yes to select it."
+        )
+        raise typer.Exit(1)
 
-    acount_id = get_or_prompt_account_id(config, entity.name(), force_prompt=context.choose_account)
+    acount_id = get_or_prompt_account_id(
+        config, entity.name(), force_prompt=context.choose_account, profiler=profiler
+    )
+
+    if context.assume_yes and context.quiet and not show:
+        try:
+            result = import_in_chunks(entity, input_file, context, acount_id)
+        except ParsingError as e:
+            display.error(f"Error when parsing {e.input_file}")
+            display.console().print(f"  Message: {e.message}")
+            raise typer.Exit(1) from e
+
+        metrics.parsed = result.parsed
+        metrics.matched = result.matched
+        metrics.partial_matches = result.partial_matches
+        metrics.created = result.created
+        metrics.skipped = result.skipped
+        metrics.completed = True
+        return
+
+    checkpoint = account_checkpoint(config, entity.name(), acount_id)
 
     try:
-        parsed_input = entity.parse(input_file, context)
+        with profiler.phase("parse") as phase:
+            parsed_input = parse_transactions(entity, input_file, context, checkpoint)
+            phase.rows = metrics.parsed = len(parsed_input)
     except ParsingError as e:
         display.error(f"Error when parsing {e.input_file}")
         display.console().print(f"  Message: {e.message}")
         raise typer.Exit(1) from e
 
-    checkpoint = config.entities[entity.name()].checkpoint
-
-    preprocess_transactions(parsed_input, checkpoint)
-
     if show:
         display_transaction_table(parsed_input, context.formatter)
+        metrics.completed = True
         return
 
-    transactions = [
-        TransactionWithYnabData(t)
-        for t in filter_transactions(
-            parsed_input,
-            checkpoint,
-        )
-    ]
+    with profiler.phase("preprocess", rows=len(parsed_input)):
+        ledger = ImportLedger(acount_id)
+        pending = pending_transactions(parsed_input, checkpoint, ledger, context)
+    metrics.skipped = len(parsed_input) - len(pending)
+
+    if metrics.skipped:
+        info(f"Skipping {metrics.skipped} transactions already imported")
+
+    if not pending:
+        info("🎉 All done! Nothing to do.")
+        if parsed_input:
+            config.update_and_save(parsed_input, entity.name(), acount_id)
+        metrics.completed = True
+        return
+
+    transactions = [TransactionWithYnabData(t) for t in pending]
 
-    client = Client(config.api_key)
+    client = Client(config.api_key, profiler=profiler)
     budget_id = config.budget.id
 
     earliest_transaction = min(t.date for t in transactions)
 
-    with process("Reading transactions..."):
-        ynab_transactions = client.transactions(
+    with process("Reading transactions..."), profiler.phase("fetch") as phase:
+        ynab_transactions = client.transaction_records(
             budget_id=budget_id,
             account_id=acount_id,
             since_date=earliest_transaction - dt.timedelta(days=context.buffer),
         )
+        phase.rows = len(ynab_transactions)
     display.success("✔ Transactions read")
 
     with process("Augmenting transactions..."):
-        match_transactions(transactions, ynab_transactions, reconcile, config)
-        set_payee_from_ynab(transactions, client, config)
+        with profiler.phase("match", rows=len(transactions)):
+            match_transactions(transactions, ynab_transactions, reconcile, config)
+        with profiler.phase("payees", rows=len(transactions)):
+            set_payee_from_ynab(transactions, client, config)
     display.success("✔ Transactions augmneted with YNAB information")
 
-    display_transactions_to_upload(transactions, context.formatter)
+    metrics.matched = sum(t.match_status is MatchStatus.MATCHED for t in transactions)
+
+    if not context.quiet:
+        display_transactions_to_upload(transactions, context.formatter)
 
     if not any(t.needs_creation for t in transactions):
         info("🎉 All done! Nothing to do.")
-        if transactions:
-            config.update_and_save(transactions[0], entity.name())
+        ledger.add(pending)
+        config.update_and_save(parsed_input, entity.name(), acount_id)
+        metrics.completed = True
         return
 
     if partial_matches := [
         t for t in transactions if t.match_status is MatchStatus.PARTIAL_MATCH and t.needs_creation
     ]:
-        display_partial_matches(partial_matches, context.formatter)
-        display.info(
-            "\nIf these partial matches are ok, you can accept them and we will keep track of the "
-            "payee name for future reference."
-        )
-        final_matching = (
-            MatchStatus.MATCHED
-            if confirm("Do you want to accept these matches?")
-            else MatchStatus.UNMATCHED
-        )
-        for t in partial_matches:
-            t.match_status = final_matching
-            if final_matching == MatchStatus.UNMATCHED:
-                t.reset_matching()
+        metrics.partial_matches = len(partial_matches)
+        if context.partial_matches is PartialMatchPolicy.ASK and not context.assume_yes:
+            display_partial_matches(partial_matches, context.formatter)
+            display.info(
+                "\nIf these partial matches are ok, you can accept them and we will keep track "
+                "of the payee name for future reference."
+            )
+            accept = confirm("Do you want to accept these matches?")
+        else:
+            accept = context.partial_matches is PartialMatchPolicy.ACCEPT
 
-        if final_matching == MatchStatus.MATCHED:
-            # If the user agreed to match these, add renaming rules to config
-            config.add_payee_rules(partial_matches)
+        resolve_partial_matches(partial_matches, accept, config)
 
     with process("Preparing transactions to upload..."):
         new_transactions = [t for t in transactions if t.needs_creation]
 
     display.info(f"Transactions to import:       {len(new_transactions)}")
 
-    if confirm("Do you want to continue and create the transactions?"):
-        with process("Creating/Updating transactions..."):
+    if context.assume_yes or confirm("Do you want to continue and create the transactions?"):
+        with (
+            process("Creating/Updating transactions..."),
+            profiler.phase("upload", rows=len(new_transactions)),
+        ):
             client.create_transactions(
                 budget_id=budget_id,
                 account_id=acount_id,
                 transactions=new_transactions,
             )
+        metrics.created = len(new_transactions)
+        ledger.add(pending)
 
-        config.update_and_save(transactions[0], entity.name())
+        config.update_and_save(parsed_input, entity.name(), acount_id)
 
+    metrics.completed = True
     display.info("🎉 All done!")
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Generator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from cProfile import Profile
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float | None:
+        total = self.hits + self.misses
+        return self.hits / total if total else None
+
+
+@dataclass
+class Phase:
+    """Measurements of one of the phases of a command"""
+
+    name: str
+    # Seconds since the profiler was created
+    start: float = 0.0
+    wall: float = 0.0
+    cpu: float = 0.0
+    rows: int = 0
+    api_calls: int = 0
+    api_time: float = 0.0
+    api_bytes: int = 0
+
+    @property
+    def rows_per_second(self) -> float | None:
+        return self.rows / self.wall if self.rows and self.wall else None
+
+
+class Profiler:
+    """
+    Record wall time, CPU time of the thread running them, rows processed and YNAB API usage of
+    the phases of a command.
+
+    Phases are opened with `phase`. Requests to the YNAB API are attributed to the innermost phase
+    open in the thread that makes them, so that concurrent imports do not mix their phases. If an
+    output path is given, a Chrome trace is written to it when it ends in `.json` and a cProfile
+    dump, readable with `pstats`, otherwise. The summary table is only shown when `summary` is set.
+    """
+
+    enabled = True
+
+    def __init__(self, output: Path | None = None, summary: bool = True):
+        self.output = output
+        self.summary = summary
+        self.phases: list[Phase] = []
+        # Latency, in seconds, of every request made to the YNAB API
+        self.latencies: list[float] = []
+        self.caches: dict[str, CacheStats] = {}
+        # Phases open in each thread, innermost last
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._cprofile: Profile | None = None
+
+        if output is not None and output.suffix != ".json":
+            import cProfile
+
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def phase(self, name: str, rows: int = 0) -> AbstractContextManager[Phase]:
+        """
+        Measure the code in the context as phase `name`.
+
+        The number of rows processed can be given upfront or set on the yielded phase
+        once they are known.
+        """
+        return self._measure(Phase(name=name, rows=rows))
+
+    def _open(self) -> list[Phase]:
+        if (open_phases := getattr(self._local, "phases", None)) is None:
+            open_phases = self._local.phases = []
+        return open_phases
+
+    @contextmanager
+    def _measure(self, phase: Phase) -> Generator[Phase]:
+        open_phases = self._open()
+        open_phases.append(phase)
+
+        start_cpu = time.thread_time()
+        start = time.perf_counter()
+        try:
+            yield phase
+        finally:
+            phase.wall = time.perf_counter() - start
+            phase.cpu = time.thread_time() - start_cpu
+            phase.start = start - self._origin
+            open_phases.pop()
+            with self._lock:
+                self.phases.append(phase)
+
+    def record_request(self, elapsed: float, n_bytes: int):
+        """Attribute a request to the YNAB API to the innermost phase open in this thread"""
+        open_phases = self._open()
+        with self._lock:
+            self.latencies.append(elapsed)
+            if not open_phases:
+                return
+            phase = open_phases[-1]
+            phase.api_calls += 1
+            phase.api_time += elapsed
+            phase.api_bytes += n_bytes
+
+    def record_cache(self, name: str, hit: bool):
+        """Count a lookup in the cache `name`"""
+        with self._lock:
+            stats = self.caches.setdefault(name, CacheStats())
+            if hit:
+                stats.hits += 1
+            else:
+                stats.misses += 1
+
+    def report(self):
+        """Show the summary of all phases and write the output file, if any"""
+        if self._cprofile is not None:
+            self._cprofile.disable()
+
+        if self.summary:
+            self.print_summary()
+
+        if self.output is None:
+            return
+
+        if self._cprofile is not None:
+            self._cprofile.dump_stats(self.output)
+        else:
+            self.output.write_text(json.dumps(self.chrome_trace()))
+
+        from ynab_unlinked import display
+
+        display.info(f"Profile written to {self.output}")
+
+    def totals(self) -> list[Phase]:
+        """Phases with the same name added up, in the order they were first started"""
+        totals: dict[str, Phase] = {}
+        for phase in sorted(self.phases, key=lambda p: p.start):
+            if (total := totals.get(phase.name)) is None:
+                totals[phase.name] = Phase(name=phase.name, start=phase.start)
+                total = totals[phase.name]
+            total.wall += phase.wall
+            total.cpu += phase.cpu
+            total.rows += phase.rows
+            total.api_calls += phase.api_calls
+            total.api_time += phase.api_time
+            total.api_bytes += phase.api_bytes
+
+        return list(totals.values())
+
+    def print_summary(self):
+        from rich.table import Table
+
+        from ynab_unlinked import display
+
+        table = Table(title="Profile")
+        table.add_column("Phase")
+        for column in ["Wall (s)", "CPU (s)", "Rows", "Rows/s", "API calls", "API (s)", "API KiB"]:
+            table.add_column(column, justify="right")
+
+        for phase in self.totals():
+            rows_per_second = phase.rows_per_second
+            table.add_row(
+                phase.name,
+                f"{phase.wall:.3f}",
+                f"{phase.cpu:.3f}",
+                str(phase.rows),
+                "-" if rows_per_second is None else f"{rows_per_second:,.0f}",
+                str(phase.api_calls),
+                f"{phase.api_time:.3f}",
+                f"{phase.api_bytes / 1024:,.1f}",
+            )
+
+        display.console().print(table)
+
+        for name, stats in self.caches.items():
+            hit_rate = "-" if stats.hit_rate is None else f"{stats.hit_rate:.0%}"
+            display.console().print(
+                f"Cache {name}: {stats.hits} hits, {stats.misses} misses ({hit_rate} hit rate)"
+            )
+
+    def chrome_trace(self) -> dict:
+        """Phases as complete events of the Trace Event Format, loadable in chrome://tracing"""
+        return {
+            "traceEvents": [
+                {
+                    "name": phase.name,
+                    "ph": "X",
+                    "ts": phase.start * 1e6,
+                    "dur": phase.wall * 1e6,
+                    "pid": 1,
+                    "tid": 1,
+                    "args": {
+                        "cpu_seconds": phase.cpu,
+                        "rows": phase.rows,
+                        "api_calls": phase.api_calls,
+                        "api_seconds": phase.api_time,
+                        "api_bytes": phase.api_bytes,
+                    },
+                }
+                for phase in self.phases
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+
+class NullProfiler(Profiler):
+    """Profiler used when profiling is disabled. It does not measure anything."""
+
+    enabled = False
+
+    def __init__(self):
+        self.output = None
+        self.summary = False
+        self.phases = []
+        self.latencies = []
+        self.caches = {}
+
+    def phase(self, name: str, rows: int = 0) -> AbstractContextManager[Phase]:
+        return nullcontext(Phase(name=name, rows=rows))
+
+    def record_request(self, elapsed: float, n_bytes: int):
+        pass
+
+    def record_cache(self, name: str, hit: bool):
+        pass
+
+    def report(self):
+        pass
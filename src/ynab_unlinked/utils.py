@@ -8,12 +8,12 @@ from rich.style import Style
 from rich.table import Column, Table
 
 from ynab_unlinked.config import get_config
-from ynab_unlinked.config.models.v2 import Budget, CurrencyFormat
+from ynab_unlinked.config.models.v2 import Budget
 from ynab_unlinked.display import console, process, question
 from ynab_unlinked.entities import InputType
 from ynab_unlinked.formatter import Formatter
 from ynab_unlinked.models import MatchStatus, Transaction, TransactionWithYnabData
-from ynab_unlinked.ynab_api.client import Client
+from ynab_unlinked.ynab_api import Client, MetadataCache
 
 MAX_PAST_TRANSACTIONS_SHOWN = 3
 
@@ -47,7 +47,7 @@ def prompt_for_budget(api_key: str | None = None) -> Budget:
     client = Client(api_key)
 
     with process("Getting budgets..."):
-        budgets = client.budgets()
+        budgets = MetadataCache(client).budgets()
 
     console().print("Available budgets:")
     console().print(f" - {idx + 1}. {budget.name}" for idx, budget in enumerate(budgets))
@@ -62,32 +62,10 @@ def prompt_for_budget(api_key: str | None = None) -> Budget:
 
     console().print(f"[bold]Selected budget: {selected_budget.name}")
 
-    # Get the full budget to get all the required fields
-    budget_details = client.budget(selected_budget.id)
-
-    if budget_details is None:
-        raise ValueError(f"Could not find budget with ID {selected_budget.id}")
-
-    if budget_details.currency_format is None:
-        raise ValueError(f"Budget {budget_details.name!r} has no currency format")
-
-    if budget_details.date_format is None:
-        raise ValueError(f"Budget {budget_details.name!r} has no date format")
-
-    return Budget(
-        id=budget_details.id,
-        name=budget_details.name,
-        date_format=budget_details.date_format.format,
-        currency_format=CurrencyFormat(
-            iso_code=budget_details.currency_format.iso_code,
-            decimal_digits=budget_details.currency_format.decimal_digits,
-            decimal_separator=budget_details.currency_format.decimal_separator,
-            symbol_first=budget_details.currency_format.symbol_first,
-            group_separator=budget_details.currency_format.group_separator,
-            currency_symbol=budget_details.currency_format.currency_symbol,
-            display_symbol=budget_details.currency_format.display_symbol,
-        ),
-    )
+    with process("Getting budget settings..."):
+        settings = client.budget_settings(selected_budget.id)
+
+    return Budget.from_settings(selected_budget.id, selected_budget.name, settings)
 
 
 def display_transaction_table(transactions: list[Transaction], formatter: Formatter):
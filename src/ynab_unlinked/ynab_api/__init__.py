@@ -1,3 +1,5 @@
+from .async_client import AsyncClient
 from .client import Client
+from .metadata import MetadataCache
 
-__all__ = ["Client"]
+__all__ = ["AsyncClient", "Client", "MetadataCache"]
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import time
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel
+from ynab.configuration import Configuration
+from ynab.exceptions import ApiException
+from ynab.models.account import Account
+from ynab.models.accounts_response import AccountsResponse
+from ynab.models.budget_detail import BudgetDetail
+from ynab.models.budget_detail_response import BudgetDetailResponse
+from ynab.models.budget_settings import BudgetSettings
+from ynab.models.budget_settings_response import BudgetSettingsResponse
+from ynab.models.budget_summary import BudgetSummary
+from ynab.models.budget_summary_response import BudgetSummaryResponse
+from ynab.models.payee import Payee
+from ynab.models.payees_response import PayeesResponse
+from ynab.models.transaction_detail import TransactionDetail
+from ynab.models.transactions_response import TransactionsResponse
+
+from ynab_unlinked.models import TransactionRecord, TransactionWithYnabData
+from ynab_unlinked.profiling import NullProfiler, Profiler
+
+from .client import (
+    TransactionUpdate,
+    new_transactions_payload,
+    normalize_since_date,
+    transaction_records_from_json,
+    update_transactions_payload,
+)
+
+if TYPE_CHECKING:
+    import httpx
+
+# Maximum number of requests to YNAB in flight at the same time
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+class AsyncClient:
+    """
+    Asynchronous version of `Client`, built on httpx.
+
+    At most `max_concurrency` requests are sent at the same time, any other request waits
+    for one of them to finish. Use it as an async context manager, or call `aclose`, to release
+    its connections:
+
+    ```python
+    async with AsyncClient(api_key) as client:
+        accounts = await client.accounts(budget_id)
+    ```
+
+    A custom httpx `transport` can be given to send requests somewhere else than YNAB,
+    for example in tests.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        host: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        profiler: Profiler | None = None,
+    ):
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError(
+                "AsyncClient needs httpx. Install it with `pip install ynab-unlinked[async]`."
+            ) from e
+
+        self.api_key = api_key
+        self.profiler = profiler or NullProfiler()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._http = httpx.AsyncClient(
+            base_url=host or Configuration().host,
+            headers={"Authorization": f"Bearer {api_key}"},
+            limits=httpx.Limits(max_connections=max_concurrency),
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> AsyncClient:
+        return self
+
+    async def __aexit__(self, *exc_info: object):
+        await self.aclose()
+
+    async def aclose(self):
+        await self._http.aclose()
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        body: BaseModel | None = None,
+    ) -> str:
+        query = {
+            key: value.isoformat() if isinstance(value, dt.date) else value
+            for key, value in (params or {}).items()
+            if value is not None
+        }
+        json = (
+            None if body is None else body.model_dump(mode="json", by_alias=True, exclude_none=True)
+        )
+
+        async with self._semaphore:
+            start = time.perf_counter()
+            response = await self._http.request(method, path, params=query, json=json)
+            self.profiler.record_request(time.perf_counter() - start, len(response.content))
+
+        if response.is_error:
+            raise ApiException(
+                status=response.status_code, reason=response.reason_phrase, body=response.text
+            )
+
+        return response.text
+
+    async def budgets(self, include_accounts: bool = False) -> list[BudgetSummary]:
+        text = await self._request(
+            "GET", "/budgets", params={"include_accounts": str(include_accounts).lower()}
+        )
+        return BudgetSummaryResponse.model_validate_json(text).data.budgets
+
+    async def budget(self, budget_id: str) -> BudgetDetail:
+        text = await self._request("GET", f"/budgets/{budget_id}")
+        return BudgetDetailResponse.model_validate_json(text).data.budget
+
+    async def budget_settings(self, budget_id: str) -> BudgetSettings:
+        text = await self._request("GET", f"/budgets/{budget_id}/settings")
+        return BudgetSettingsResponse.model_validate_json(text).data.settings
+
+    async def accounts(self, budget_id: str) -> list[Account]:
+        text = await self._request("GET", f"/budgets/{budget_id}/accounts")
+        return AccountsResponse.model_validate_json(text).data.accounts
+
+    async def accounts_delta(
+        self, budget_id: str, last_knowledge_of_server: int | None = None
+    ) -> tuple[list[Account], int]:
+        """
+        Accounts changed since `last_knowledge_of_server`, along with the current server knowledge.
+
+        All accounts are returned when no knowledge is given.
+        """
+        text = await self._request(
+            "GET",
+            f"/budgets/{budget_id}/accounts",
+            params={"last_knowledge_of_server": last_knowledge_of_server},
+        )
+        data = AccountsResponse.model_validate_json(text).data
+        return data.accounts, data.server_knowledge
+
+    async def _transactions_body(
+        self,
+        budget_id: str,
+        account_id: str | None,
+        since_date: dt.datetime | dt.date | None,
+    ) -> str:
+        path = (
+            f"/budgets/{budget_id}/accounts/{account_id}/transactions"
+            if account_id
+            else f"/budgets/{budget_id}/transactions"
+        )
+        since = normalize_since_date(since_date)
+        if isinstance(since, dt.datetime):
+            since = since.date()
+        return await self._request("GET", path, params={"since_date": since})
+
+    async def transactions(
+        self,
+        budget_id: str,
+        account_id: str | None = None,
+        since_date: dt.datetime | dt.date | None = None,
+    ) -> list[TransactionDetail]:
+        text = await self._transactions_body(budget_id, account_id, since_date)
+        return TransactionsResponse.model_validate_json(text).data.transactions
+
+    async def transaction_records(
+        self,
+        budget_id: str,
+        account_id: str | None = None,
+        since_date: dt.datetime | dt.date | None = None,
+    ) -> list[TransactionRecord]:
+        """Same as `transactions`, but only with the fields needed to match and reconcile them."""
+        text = await self._transactions_body(budget_id, account_id, since_date)
+        return transaction_records_from_json(text)
+
+    async def payees(self, budget_id: str) -> list[Payee]:
+        text = await self._request("GET", f"/budgets/{budget_id}/payees")
+        return PayeesResponse.model_validate_json(text).data.payees
+
+    async def create_transactions(
+        self,
+        budget_id: str,
+        account_id: str,
+        transactions: list[TransactionWithYnabData],
+    ):
+        if not transactions:
+            return
+
+        await self._request(
+            "POST",
+            f"/budgets/{budget_id}/transactions",
+            body=new_transactions_payload(account_id, transactions),
+        )
+
+    async def update_transactions(self, budget_id: str, transactions: Sequence[TransactionUpdate]):
+        await self._request(
+            "PATCH",
+            f"/budgets/{budget_id}/transactions",
+            body=update_transactions_payload(transactions),
+        )
@@ -1,5 +1,7 @@
 import datetime as dt
-from typing import Literal, TypedDict, overload
+import time
+from collections.abc import Sequence
+from typing import Literal, Protocol, TypedDict, overload
 
 from ynab.api.accounts_api import AccountsApi
 from ynab.api.budgets_api import BudgetsApi
@@ -7,17 +9,27 @@ from ynab.api.payees_api import PayeesApi
 from ynab.api.transactions_api import TransactionsApi
 from ynab.api_client import ApiClient
 from ynab.configuration import Configuration
+from ynab.exceptions import ApiException
 from ynab.models.account import Account
 from ynab.models.budget_detail import BudgetDetail
+from ynab.models.budget_settings import BudgetSettings
 from ynab.models.budget_summary import BudgetSummary
 from ynab.models.new_transaction import NewTransaction
 from ynab.models.patch_transactions_wrapper import PatchTransactionsWrapper
 from ynab.models.payee import Payee
 from ynab.models.post_transactions_wrapper import PostTransactionsWrapper
 from ynab.models.save_transaction_with_id_or_import_id import SaveTransactionWithIdOrImportId
+from ynab.models.transaction_cleared_status import TransactionClearedStatus
 from ynab.models.transaction_detail import TransactionDetail
+from ynab.rest import RESTResponse, RESTResponseType
 
-from ynab_unlinked.models import TransactionWithYnabData
+from ynab_unlinked.models import TransactionRecord, TransactionWithYnabData
+from ynab_unlinked.profiling import Profiler
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 
 class ApisType(TypedDict):
@@ -27,14 +39,108 @@ class ApisType(TypedDict):
     payees: type[PayeesApi]
 
 
+class TransactionUpdate(Protocol):
+    """Fields needed to update the cleared status of an existing transaction"""
+
+    @property
+    def id(self) -> str: ...
+    @property
+    def account_id(self) -> str: ...
+    @property
+    def cleared(self) -> TransactionClearedStatus: ...
+
+
 SupportedApisType = BudgetsApi | AccountsApi | TransactionsApi | PayeesApi
 SupportedApisNames = Literal["budget", "accounts", "transactions", "payees"]
 
 
+def normalize_since_date(since_date: dt.datetime | dt.date | None) -> dt.date | None:
+    if since_date is not None and isinstance(since_date, dt.datetime):
+        since_date = since_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    return since_date
+
+
+def transaction_records_from_json(body: str | bytes) -> list[TransactionRecord]:
+    """Transaction records of the JSON body of a transactions response of YNAB"""
+    return [
+        TransactionRecord.from_json(transaction)
+        for transaction in json_loads(body)["data"]["transactions"]
+    ]
+
+
+def decode_transaction_records(response: RESTResponseType) -> list[TransactionRecord]:
+    """Decode a transactions response of YNAB straight from its JSON body"""
+    # The body may have been read already, as the profiler does, and `data` keeps it cached
+    body = response.data
+    if not 200 <= response.status <= 299:
+        raise ApiException.from_response(
+            http_resp=response, body=body.decode("utf-8", errors="replace"), data=None
+        )
+
+    return transaction_records_from_json(body)
+
+
+def new_transactions_payload(
+    account_id: str, transactions: list[TransactionWithYnabData]
+) -> PostTransactionsWrapper:
+    return PostTransactionsWrapper(
+        transactions=[
+            NewTransaction(
+                account_id=account_id,
+                date=t.date,
+                payee_name=t.payee,
+                cleared=t.cleared,
+                amount=int(t.amount * 1000),
+                approved=False,
+                import_id=t.id,
+            )
+            for t in transactions
+        ]
+    )
+
+
+def update_transactions_payload(
+    transactions: Sequence[TransactionUpdate],
+) -> PatchTransactionsWrapper:
+    return PatchTransactionsWrapper(
+        transactions=[
+            SaveTransactionWithIdOrImportId(
+                id=t.id,
+                account_id=t.account_id,
+                cleared=t.cleared,
+            )
+            for t in transactions
+        ]
+    )
+
+
+class ProfiledApiClient(ApiClient):
+    """ApiClient that reports the time and size of every response to a profiler"""
+
+    def __init__(self, configuration: Configuration, profiler: Profiler):
+        super().__init__(configuration)
+        self.profiler = profiler
+
+    def call_api(self, *args, **kwargs) -> RESTResponse:
+        start = time.perf_counter()
+        response = super().call_api(*args, **kwargs)
+        # The body is read here as the deserialization does later on, both the RESTResponse and
+        # the urllib3 response it wraps keep it cached
+        n_bytes = len(response.read() or b"")
+        self.profiler.record_request(time.perf_counter() - start, n_bytes)
+        return response
+
+
 class Client:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, profiler: Profiler | None = None, host: str | None = None):
         self.api_key = api_key
-        self.__client = ApiClient(Configuration(access_token=api_key))
+        # The host defaults to the YNAB API, it can be changed to point to a test server
+        configuration = Configuration(host=host, access_token=api_key)
+        self.__client = (
+            ApiClient(configuration)
+            if profiler is None or not profiler.enabled
+            else ProfiledApiClient(configuration, profiler)
+        )
         self._apis: ApisType = {
             "budget": BudgetsApi,
             "accounts": AccountsApi,
@@ -66,15 +172,37 @@ class Client:
         return response.data.budgets
 
     def budget(self, budget_id: str) -> BudgetDetail:
+        """
+        Full export of the budget, with every account, category, payee and transaction in it.
+
+        It can be very large, use `budget_settings` when only the formats are needed.
+        """
         api = self.api("budget")
         response = api.get_budget_by_id(budget_id=budget_id)
         return response.data.budget
 
+    def budget_settings(self, budget_id: str) -> BudgetSettings:
+        api = self.api("budget")
+        response = api.get_budget_settings_by_id(budget_id=budget_id)
+        return response.data.settings
+
     def accounts(self, budget_id: str) -> list[Account]:
         api = self.api("accounts")
         response = api.get_accounts(budget_id)
         return response.data.accounts
 
+    def accounts_delta(
+        self, budget_id: str, last_knowledge_of_server: int | None = None
+    ) -> tuple[list[Account], int]:
+        """
+        Accounts changed since `last_knowledge_of_server`, along with the current server knowledge.
+
+        All accounts are returned when no knowledge is given.
+        """
+        api = self.api("accounts")
+        response = api.get_accounts(budget_id, last_knowledge_of_server=last_knowledge_of_server)
+        return response.data.accounts, response.data.server_knowledge
+
     def transactions(
         self,
         budget_id: str,
@@ -82,9 +210,7 @@ class Client:
         since_date: dt.datetime | dt.date | None = None,
     ) -> list[TransactionDetail]:
         api = self.api("transactions")
-
-        if since_date is not None and isinstance(since_date, dt.datetime):
-            since_date = since_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        since_date = normalize_since_date(since_date)
 
         if account_id:
             response = api.get_transactions_by_account(
@@ -100,6 +226,35 @@ class Client:
 
         return response.data.transactions
 
+    def transaction_records(
+        self,
+        budget_id: str,
+        account_id: str | None = None,
+        since_date: dt.datetime | dt.date | None = None,
+    ) -> list[TransactionRecord]:
+        """
+        Same as `transactions`, but only with the fields needed to match and reconcile them.
+
+        The response is decoded without going through the models of the ynab SDK, which makes
+        this much faster and lighter for accounts with many transactions.
+        """
+        api = self.api("transactions")
+        since_date = normalize_since_date(since_date)
+
+        if account_id:
+            response = api.get_transactions_by_account_without_preload_content(
+                budget_id=budget_id,
+                account_id=account_id,
+                since_date=since_date,
+            )
+        else:
+            response = api.get_transactions_without_preload_content(
+                budget_id=budget_id,
+                since_date=since_date,
+            )
+
+        return decode_transaction_records(response)
+
     def payees(self, budget_id: str) -> list[Payee]:
         api = self.api("payees")
         response = api.get_payees(budget_id)
@@ -115,37 +270,14 @@ class Client:
             return
 
         api = self.api("transactions")
-
-        transactions_to_create = [
-            NewTransaction(
-                account_id=account_id,
-                date=t.date,
-                payee_name=t.payee,
-                cleared=t.cleared,
-                amount=int(t.amount * 1000),
-                approved=False,
-                import_id=t.id,
-            )
-            for t in transactions
-        ]
-
         api.create_transaction(
             budget_id,
-            data=PostTransactionsWrapper(transactions=transactions_to_create),
+            data=new_transactions_payload(account_id, transactions),
         )
 
-    def update_transactions(self, budget_id: str, transactions: list[TransactionDetail]):
+    def update_transactions(self, budget_id: str, transactions: Sequence[TransactionUpdate]):
         api = self.api("transactions")
-
-        to_update = [
-            SaveTransactionWithIdOrImportId(
-                id=t.id,
-                account_id=t.account_id,
-                cleared=t.cleared,
-            )
-            for t in transactions
-        ]
         api.update_transactions(
             budget_id=budget_id,
-            data=PatchTransactionsWrapper(transactions=to_update),
+            data=update_transactions_payload(transactions),
         )
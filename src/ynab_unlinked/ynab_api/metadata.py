@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from contextlib import suppress
+from hashlib import sha256
+from pathlib import Path
+
+from pydantic import BaseModel, Field, ValidationError
+from ynab.models.account import Account
+from ynab.models.budget_summary import BudgetSummary
+
+from ynab_unlinked.profiling import NullProfiler, Profiler
+
+from .client import Client
+
+
+class CachedAccounts(BaseModel):
+    accounts: list[Account]
+    server_knowledge: int
+
+
+class Metadata(BaseModel):
+    budgets: list[BudgetSummary] | None = None
+    accounts: dict[str, CachedAccounts] = Field(default_factory=dict)
+
+
+class MetadataCache:
+    """
+    Budgets and accounts, with their balances, cached in the cache dir.
+
+    Reads are served from the cache when it has the data, which is then refreshed in a background
+    thread for the next time. Accounts can be requested `fresh` when their balances must be up
+    to date. Only the accounts changed since the cached server knowledge are requested to YNAB
+    when refreshing them, so that checking whether the cache is still valid is cheap.
+
+    The cache is kept per API key, so that budgets of different users are never mixed.
+    """
+
+    def __init__(self, client: Client, profiler: Profiler | None = None):
+        self.client = client
+        self.profiler = profiler or NullProfiler()
+        self._lock = threading.Lock()
+        self._refreshing: dict[str, threading.Thread] = {}
+        self._data = self._load()
+
+    @staticmethod
+    def path(api_key: str) -> Path:
+        from ynab_unlinked.config.paths import cache_dir
+
+        return cache_dir() / "metadata" / f"{sha256(api_key.encode()).hexdigest()[:16]}.json"
+
+    def _load(self) -> Metadata:
+        path = self.path(self.client.api_key)
+        if not path.is_file():
+            return Metadata()
+
+        try:
+            return Metadata.model_validate_json(path.read_text())
+        except ValidationError:
+            # A cache written by a different version, it is refreshed on the next read
+            return Metadata()
+
+    def _save(self):
+        path = self.path(self.client.api_key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write and rename so that a cache being written is never read half way through
+        temporary = path.with_suffix(".tmp")
+        temporary.write_text(self._data.model_dump_json(by_alias=True))
+        temporary.replace(path)
+
+    def _in_background(self, key: str, refresh: Callable[[], object]):
+        with self._lock:
+            if (thread := self._refreshing.get(key)) is not None and thread.is_alive():
+                return
+
+            thread = threading.Thread(
+                target=self._refresh_quietly, args=(refresh,), name=f"refresh-{key}", daemon=True
+            )
+            self._refreshing[key] = thread
+        thread.start()
+
+    @staticmethod
+    def _refresh_quietly(refresh: Callable[[], object]):
+        # Nobody is waiting for a background refresh. If it fails, the cache stays as it was
+        with suppress(Exception):
+            refresh()
+
+    def wait(self):
+        """Wait for the background refreshes in progress to finish"""
+        with self._lock:
+            threads = list(self._refreshing.values())
+        for thread in threads:
+            thread.join()
+
+    def budgets(self) -> list[BudgetSummary]:
+        with self._lock:
+            budgets = self._data.budgets
+        self.profiler.record_cache("metadata", hit=budgets is not None)
+
+        if budgets is None:
+            return self._refresh_budgets()
+
+        self._in_background("budgets", self._refresh_budgets)
+        return budgets
+
+    def _refresh_budgets(self) -> list[BudgetSummary]:
+        budgets = self.client.budgets()
+        with self._lock:
+            self._data.budgets = budgets
+            self._save()
+        return budgets
+
+    def accounts(self, budget_id: str, fresh: bool = False) -> list[Account]:
+        """
+        Accounts of the budget.
+
+        With `fresh`, the cache is revalidated with YNAB before returning them, otherwise the
+        cached accounts are returned right away and revalidated in the background.
+        """
+        with self._lock:
+            cached = self._data.accounts.get(budget_id)
+        self.profiler.record_cache("metadata", hit=cached is not None)
+
+        if cached is None or fresh:
+            return self._refresh_accounts(budget_id)
+
+        self._in_background(f"accounts-{budget_id}", lambda: self._refresh_accounts(budget_id))
+        return cached.accounts
+
+    def _refresh_accounts(self, budget_id: str) -> list[Account]:
+        with self._lock:
+            cached = self._data.accounts.get(budget_id)
+
+        changed, server_knowledge = self.client.accounts_delta(
+            budget_id, last_knowledge_of_server=None if cached is None else cached.server_knowledge
+        )
+
+        with self._lock:
+            if cached is not None and server_knowledge == cached.server_knowledge:
+                return cached.accounts
+
+            accounts_by_id = {} if cached is None else {acc.id: acc for acc in cached.accounts}
+            accounts_by_id.update((acc.id, acc) for acc in changed)
+            accounts = list(accounts_by_id.values())
+            self._data.accounts[budget_id] = CachedAccounts(
+                accounts=accounts, server_knowledge=server_knowledge
+            )
+            self._save()
+
+        return accounts
@@ -1,9 +1,14 @@
 import datetime as dt
+import json
+from pathlib import Path
 
 import pytest
+from pytest_mock import MockerFixture
 
+from tests.factories import AccountFactory
 from tests.helpers.types import CliRunner, LoadEntityCallback
 from tests.helpers.ynab_api import YnabClientStub
+from ynab_unlinked.config import ConfigV2
 
 pytestmark = pytest.mark.version("V2")
 
@@ -17,3 +22,154 @@ def test_load(
     load_entity(today)
     result = yul("load --show test")
     assert result.exit_code == 0, f"Error found: {result.output_bytes}"
+
+
+def test_load_profile(
+    yul: CliRunner,
+    load_entity: LoadEntityCallback,
+    today: dt.datetime,
+    ynab_api: YnabClientStub,
+    tmp_path: Path,
+):
+    load_entity(today)
+    trace = tmp_path / "trace.json"
+    result = yul(f"load --show --profile-output {trace} test")
+    assert result.exit_code == 0, f"Error found: {result.output_bytes}"
+
+    assert "Profile" in result.output
+    events = json.loads(trace.read_text())["traceEvents"]
+    # Transactions are preprocessed while parsing them, nothing else is done to show them
+    assert [event["name"] for event in events] == ["parse"]
+    assert events[0]["args"]["rows"] == 3
+
+
+def test_load_metrics_file(
+    yul: CliRunner,
+    load_entity: LoadEntityCallback,
+    today: dt.datetime,
+    ynab_api: YnabClientStub,
+    tmp_path: Path,
+    mocker: MockerFixture,
+):
+    load_entity(today)
+    mocker.patch.object(ConfigV2, "save")
+    ynab_api.api("transactions").get_transactions_by_account.return_value.data.transactions = []
+    ynab_api.api("payees").get_payees.return_value.data.payees = []
+    metrics_file = tmp_path / "metrics.jsonl"
+
+    for _ in range(2):
+        result = yul(f"load --metrics-file {metrics_file} test", input="y\n")
+        assert result.exit_code == 0, f"Error found: {result.output_bytes}"
+
+    assert "Profile" not in result.output
+    records = [json.loads(line) for line in metrics_file.read_text().splitlines()]
+    assert len(records) == 2
+    assert records[0]["entity"] == "test"
+    assert records[0]["completed"]
+    assert records[0]["transactions"] == {
+        "parsed": 3,
+        "matched": 0,
+        "partial_matches": 0,
+        "created": 3,
+        "skipped": 0,
+    }
+    # The second run already has every transaction imported
+    assert records[1]["transactions"]["skipped"] == 3
+    assert list(records[0]["phases"]) == [
+        "parse",
+        "preprocess",
+        "fetch",
+        "match",
+        "payees",
+        "upload",
+    ]
+
+
+def test_load_metrics_file_records_metadata_cache(
+    yul: CliRunner,
+    load_entity: LoadEntityCallback,
+    today: dt.datetime,
+    ynab_api: YnabClientStub,
+    tmp_path: Path,
+    mocker: MockerFixture,
+):
+    load_entity(today)
+    mocker.patch.object(ConfigV2, "save")
+    accounts = ynab_api.api("accounts").get_accounts.return_value.data
+    accounts.accounts = [AccountFactory.build()]
+    accounts.server_knowledge = 1
+    ynab_api.api("transactions").get_transactions_by_account.return_value.data.transactions = []
+    ynab_api.api("payees").get_payees.return_value.data.payees = []
+    metrics_file = tmp_path / "metrics.jsonl"
+
+    for _ in range(2):
+        result = yul(f"load -a --profile --metrics-file {metrics_file} test", input="1\ny\n")
+        assert result.exit_code == 0, f"Error found: {result.output_bytes}"
+
+    assert "Cache metadata: 1 hits, 0 misses (100% hit rate)" in result.output
+    records = [json.loads(line) for line in metrics_file.read_text().splitlines()]
+    # The accounts are fetched on the first run and read from the cache on the second one
+    assert records[0]["cache"]["metadata"] == {"hits": 0, "misses": 1, "hit_rate": 0.0}
+    assert records[1]["cache"]["metadata"] == {"hits": 1, "misses": 0, "hit_rate": 1.0}
+
+
+def test_load_yes_quiet(
+    yul: CliRunner,
+    load_entity: LoadEntityCallback,
+    today: dt.datetime,
+    ynab_api: YnabClientStub,
+    mocker: MockerFixture,
+):
+    load_entity(today)
+    mocker.patch.object(ConfigV2, "save")
+    ynab_api.api("transactions").get_transactions_by_account.return_value.data.transactions = []
+    ynab_api.api("payees").get_payees.return_value.data.payees = []
+
+    result = yul("load --yes --quiet test")
+    assert result.exit_code == 0, f"Error found: {result.output_bytes}"
+
+    assert result.output == ""
+    (create_call,) = ynab_api.api("transactions").create_transaction.call_args_list
+    assert len(create_call.kwargs["data"].transactions) == 3
+
+
+def test_load_yes_requires_account(
+    yul: CliRunner, load_entity: LoadEntityCallback, today: dt.datetime, ynab_api: YnabClientStub
+):
+    load_entity(today)
+
+    result = yul("load --yes -a test")
+
+    assert result.exit_code == 1
+    assert "No account is set for Test" in result.output
+
+
+@pytest.mark.parametrize("options", ["--yes", "--yes --quiet"])
+def test_load_skips_imported_transactions(
+    yul: CliRunner,
+    load_entity: LoadEntityCallback,
+    today: dt.datetime,
+    ynab_api: YnabClientStub,
+    mocker: MockerFixture,
+    options: str,
+):
+    load_entity(today)
+    mocker.patch.object(ConfigV2, "save")
+    transactions_api = ynab_api.api("transactions")
+    transactions_api.get_transactions_by_account.return_value.data.transactions = []
+    ynab_api.api("payees").get_payees.return_value.data.payees = []
+
+    result = yul(f"load {options} test")
+    assert result.exit_code == 0, f"Error found: {result.output_bytes}"
+    assert transactions_api.create_transaction.call_count == 1
+    transactions_api.reset_mock()
+
+    result = yul(f"load {options} test")
+    assert result.exit_code == 0, f"Error found: {result.output_bytes}"
+
+    # Nothing is requested to YNAB for transactions imported in a previous run
+    assert not transactions_api.mock_calls
+
+    result = yul(f"load {options} --full test")
+    assert result.exit_code == 0, f"Error found: {result.output_bytes}"
+    assert transactions_api.get_transactions_by_account.call_count == 1
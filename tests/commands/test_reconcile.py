@@ -0,0 +1,175 @@
+import datetime as dt
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+from typer import Exit
+from ynab import TransactionClearedStatus
+from ynab.exceptions import ApiException
+
+from tests.factories import AccountFactory, TransactionDetailFactory
+from ynab_unlinked.commands.reconcile import (
+    RECONCILE_CHUNK_SIZE,
+    accounts_to_reconcile,
+    build_choices,
+    commit_reconciliation,
+    fetch_transactions_to_reconcile,
+    reconciled_balance,
+    resume_reconciliation,
+)
+from ynab_unlinked.config import ConfigV2
+from ynab_unlinked.config.constants import TRANSACTION_GRACE_PERIOD_DAYS
+from ynab_unlinked.context_object import YnabUnlinkedContext
+from ynab_unlinked.journal import JournalEntry, ReconcileJournal
+
+pytestmark = [pytest.mark.version("V2"), pytest.mark.usefixtures("config")]
+
+
+def test_accounts_to_reconcile_skips_closed_and_reconciled(context_obj: YnabUnlinkedContext):
+    config = context_obj.config
+    open_account = AccountFactory(cleared_balance=1000)
+    closed_account = AccountFactory(closed=True, cleared_balance=1000)
+    reconciled_account = AccountFactory(cleared_balance=5000)
+    uncleared_account = AccountFactory(cleared_balance=5000, uncleared_balance=-100)
+    config.reconciled_balances = {
+        reconciled_account.id: 5000,
+        uncleared_account.id: 5000,
+    }
+    accounts = [open_account, closed_account, reconciled_account, uncleared_account]
+
+    assert accounts_to_reconcile(accounts, config) == [open_account, uncleared_account]
+    assert accounts_to_reconcile(accounts, config, check_balances=False) == [
+        open_account,
+        reconciled_account,
+        uncleared_account,
+    ]
+
+
+def test_fetch_transactions_to_reconcile_per_account():
+    accounts = AccountFactory.create_batch(3)
+    transactions = {
+        account.id: [
+            TransactionDetailFactory(account_id=account.id),
+            TransactionDetailFactory(
+                account_id=account.id, cleared=TransactionClearedStatus.RECONCILED
+            ),
+        ]
+        for account in accounts
+    }
+    client = MagicMock()
+    client.transaction_records.side_effect = lambda budget_id, account_id, since_date: transactions[
+        account_id
+    ]
+
+    result = fetch_transactions_to_reconcile(
+        client, budget_id="budget", accounts=accounts, since_date=dt.date(2025, 1, 1)
+    )
+
+    assert result == [transactions[account.id][0] for account in accounts]
+    assert client.transaction_records.call_count == 3
+
+
+def test_reconciled_balance():
+    account = AccountFactory(cleared_balance=-20000)
+    transactions = [
+        TransactionDetailFactory(account_id=account.id, amount=-10000),
+        TransactionDetailFactory(
+            account_id=account.id, amount=-5000, cleared=TransactionClearedStatus.UNCLEARED
+        ),
+    ]
+    [choice] = build_choices(transactions, [account])
+
+    choice.select()
+    # The uncleared transaction is forced not to be selected
+    assert reconciled_balance(choice) == -20000
+
+    choice.choices[1].disable_forced_selected()
+    assert reconciled_balance(choice) == -25000
+
+    choice.deselect()
+    assert reconciled_balance(choice) is None
+
+
+@pytest.fixture
+def journal_dir(metadata_cache_dir: Path) -> Path:
+    return metadata_cache_dir
+
+
+def build_journal(n_entries: int) -> ReconcileJournal:
+    return ReconcileJournal(
+        budget_id="budget_id",
+        entries=[
+            JournalEntry(id=f"t-{i}", account_id="account", date=dt.date(2025, 5, 1 + i % 28))
+            for i in range(n_entries)
+        ],
+        reconciled_balances={"account": 1000},
+    )
+
+
+def test_commit_reconciliation_in_chunks(
+    context_obj: YnabUnlinkedContext, journal_dir: Path, mocker: MockerFixture
+):
+    config = context_obj.config
+    mocker.patch.object(ConfigV2, "save")
+    client = MagicMock()
+    journal = build_journal(RECONCILE_CHUNK_SIZE * 2 + 1)
+    journal.save()
+
+    commit_reconciliation(client, config, journal)
+
+    assert client.update_transactions.call_count == 3
+    assert config.last_reconciliation_date == dt.date(2025, 5, 28) - dt.timedelta(
+        days=TRANSACTION_GRACE_PERIOD_DAYS
+    )
+    assert config.reconciled_balances == {"account": 1000}
+    assert ReconcileJournal.load() is None
+
+
+def test_interrupted_reconciliation_resumes(
+    context_obj: YnabUnlinkedContext, journal_dir: Path, mocker: MockerFixture
+):
+    config = context_obj.config
+    save = mocker.patch.object(ConfigV2, "save")
+    client = MagicMock()
+    client.update_transactions.side_effect = [None, ApiException(status=500)]
+    journal = build_journal(RECONCILE_CHUNK_SIZE * 2)
+
+    with pytest.raises(Exit):
+        commit_reconciliation(client, config, journal)
+
+    saved = ReconcileJournal.load()
+    assert saved is not None
+    assert len(saved.remaining()) == RECONCILE_CHUNK_SIZE
+    save.assert_not_called()
+
+    client.update_transactions.side_effect = None
+    mocker.patch("ynab_unlinked.commands.reconcile.confirm", return_value=True)
+
+    assert resume_reconciliation(client, config)
+    sent = client.update_transactions.call_args.kwargs["transactions"]
+    assert [entry.id for entry in sent] == [entry.id for entry in saved.remaining()]
+    assert ReconcileJournal.load() is None
+
+
+def test_interrupted_reconciliation_of_other_budget_is_kept_unless_discarded(
+    context_obj: YnabUnlinkedContext, journal_dir: Path, mocker: MockerFixture
+):
+    config = context_obj.config
+    client = MagicMock()
+    journal = build_journal(RECONCILE_CHUNK_SIZE)
+    journal.budget_id = "other-budget"
+    journal.save()
+    confirm = mocker.patch("ynab_unlinked.commands.reconcile.confirm", return_value=False)
+
+    with pytest.raises(Exit):
+        resume_reconciliation(client, config)
+
+    assert ReconcileJournal.path().parent == journal_dir
+    assert ReconcileJournal.load() is not None
+
+    confirm.return_value = True
+
+    assert not resume_reconciliation(client, config)
+    assert ReconcileJournal.load() is None
+    client.update_transactions.assert_not_called()
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+from pytest_mock import MockerFixture
+from textual.widgets import Collapsible, DataTable, Switch
+from ynab import TransactionClearedStatus
+
+from tests.factories import AccountFactory, TransactionDetailFactory
+from ynab_unlinked.commands.apps.reconcile import (
+    CLEARED_STATUS_COLUMN,
+    PAGE_SIZE,
+    AccountTable,
+    Reconcile,
+)
+from ynab_unlinked.commands.reconcile import build_choices
+from ynab_unlinked.context_object import YnabUnlinkedContext
+
+pytestmark = [pytest.mark.version("V2"), pytest.mark.usefixtures("config")]
+
+
+def build_app(context_obj: YnabUnlinkedContext, n_transactions: int = 5) -> Reconcile:
+    account = AccountFactory()
+    transactions = [
+        TransactionDetailFactory(account_id=account.id) for _ in range(n_transactions)
+    ] + [
+        TransactionDetailFactory(account_id=account.id, cleared=TransactionClearedStatus.UNCLEARED)
+    ]
+    choices = build_choices(transactions, [account])
+    return Reconcile(context_obj.config, choices, formatter=context_obj.formatter)
+
+
+def cleared_status_column(table: DataTable) -> list[str]:
+    return [str(value) for value in table.get_column(CLEARED_STATUS_COLUMN)]
+
+
+def test_toggle_row_updates_only_cell(context_obj: YnabUnlinkedContext, mocker: MockerFixture):
+    app = build_app(context_obj)
+    recompose = mocker.spy(AccountTable, "recompose")
+
+    async def run():
+        async with app.run_test() as pilot:
+            app.query_one(AccountTable).deselect()
+            await pilot.pause()
+            table = app.query_one(DataTable)
+            table.focus()
+            await pilot.press("down", "enter")
+            await pilot.pause()
+            return cleared_status_column(table)
+
+    statuses = asyncio.run(run())
+
+    assert statuses == ["✅ Cleared", "🔒 Reconciled", *["✅ Cleared"] * 3, "Uncleared"]
+    recompose.assert_not_called()
+
+
+def test_account_switch_updates_cells(context_obj: YnabUnlinkedContext, mocker: MockerFixture):
+    app = build_app(context_obj)
+    recompose = mocker.spy(AccountTable, "recompose")
+
+    async def run():
+        async with app.run_test() as pilot:
+            app.query_one(AccountTable).query_one(Switch).value = False
+            await pilot.pause()
+            return cleared_status_column(app.query_one(DataTable))
+
+    statuses = asyncio.run(run())
+
+    assert statuses[:-1] == ["✅ Cleared"] * 5
+    assert statuses[-1] == "Uncleared"
+    recompose.assert_not_called()
+
+
+def test_include_uncleared_updates_cells(context_obj: YnabUnlinkedContext):
+    app = build_app(context_obj)
+
+    async def run():
+        async with app.run_test() as pilot:
+            app.query_one("#uncleared-switch", Switch).value = True
+            await pilot.pause()
+            return cleared_status_column(app.query_one(DataTable))
+
+    statuses = asyncio.run(run())
+
+    assert statuses == ["🔒 Reconciled"] * 6
+
+
+def test_collapsed_accounts_build_table_on_expand(context_obj: YnabUnlinkedContext):
+    accounts = AccountFactory.create_batch(3)
+    transactions = [TransactionDetailFactory(account_id=account.id) for account in accounts]
+    app = Reconcile(
+        context_obj.config,
+        build_choices(transactions, accounts),
+        formatter=context_obj.formatter,
+    )
+
+    async def run():
+        async with app.run_test() as pilot:
+            tables_before = len(app.query(DataTable))
+            app.query(AccountTable)[1].query_one(Collapsible).collapsed = False
+            await pilot.pause()
+            return tables_before, len(app.query(DataTable))
+
+    assert asyncio.run(run()) == (1, 2)
+
+
+def test_rows_are_loaded_in_pages(context_obj: YnabUnlinkedContext):
+    app = build_app(context_obj, n_transactions=PAGE_SIZE * 2)
+
+    async def run():
+        async with app.run_test() as pilot:
+            table = app.query_one(DataTable)
+            rows_before = table.row_count
+            table.move_cursor(row=table.row_count - 1)
+            await pilot.pause()
+            return rows_before, table.row_count
+
+    assert asyncio.run(run()) == (PAGE_SIZE, PAGE_SIZE * 2)
@@ -0,0 +1,256 @@
+import datetime as dt
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from tests.helpers.generators import BudgetSpec, generate_transactions
+from tests.helpers.statements import (
+    BANK_CSV_FORMAT,
+    write_bank_csv,
+    write_cobee_html,
+    write_sabadell_txt,
+)
+from tests.helpers.types import CliRunner
+from tests.helpers.ynab_api import YnabClientStub
+from ynab_unlinked.config import ConfigV2
+from ynab_unlinked.entities.cobee.cobee import Language
+from ynab_unlinked.process import import_in_chunks
+
+pytestmark = [pytest.mark.version("V2"), pytest.mark.usefixtures("config")]
+
+# Statements newer than the checkpoints of the config, so that every transaction is imported
+SPEC = BudgetSpec(size=20, date_spread_days=30, seed=1, end_date=dt.date(2025, 6, 30))
+
+
+@pytest.fixture
+def statements(tmp_path: Path) -> Path:
+    transactions = generate_transactions(SPEC)
+    write_sabadell_txt(tmp_path / "sabadell.txt", transactions, pending_rate=0)
+    write_cobee_html(tmp_path / "cobee.html", transactions, Language.EN, cancelled_rate=0)
+    write_bank_csv(tmp_path / "bank.csv", transactions)
+    return tmp_path
+
+
+@pytest.fixture
+def empty_budget(ynab_api: YnabClientStub, mocker: MockerFixture) -> YnabClientStub:
+    mocker.patch.object(ConfigV2, "save")
+    ynab_api.api("transactions").get_transactions_by_account.return_value.data.transactions = []
+    ynab_api.api("payees").get_payees.return_value.data.payees = []
+    return ynab_api
+
+
+def write_manifest(path: Path, entries: str) -> Path:
+    manifest = path / "yul.toml"
+    manifest.write_text(entries)
+    return manifest
+
+
+def test_sync(yul: CliRunner, statements: Path, empty_budget: YnabClientStub):
+    manifest = write_manifest(
+        statements,
+        """
+        [[imports]]
+        entity = "sabadell"
+        file = "sabadell.txt"
+        options = { year = 2025 }
+
+        [[imports]]
+        entity = "cobee"
+        file = "cobee.html"
+        account_id = "other-cobee-account"
+        options = { language = "en" }
+        """,
+    )
+
+    result = yul(f"sync {manifest}")
+    assert result.exit_code == 0, f"Error found: {result.output_bytes}"
+
+    assert "Sync report" in result.output
+    assert f"Created {2 * SPEC.size} transactions from 2 files" in result.output
+    create_calls = empty_budget.api("transactions").create_transaction.call_args_list
+    accounts = {call.kwargs["data"].transactions[0].account_id for call in create_calls}
+    assert accounts == {"sabadell-account", "other-cobee-account"}
+    assert empty_budget.api("payees").get_payees.call_count == 1
+
+
+def test_sync_csv(
+    yul: CliRunner, statements: Path, empty_budget: YnabClientStub, mocker: MockerFixture
+):
+    load_config = ConfigV2.load
+
+    def load_with_csv_format() -> ConfigV2:
+        config = load_config()
+        config.csv_formats["bank"] = BANK_CSV_FORMAT
+        return config
+
+    mocker.patch.object(ConfigV2, "load", side_effect=load_with_csv_format)
+    manifest = write_manifest(
+        statements,
+        """
+        [[imports]]
+        entity = "csv"
+        file = "bank.csv"
+        account_id = "bank-account"
+        options = { format = "bank" }
+        """,
+    )
+
+    result = yul(f"sync {manifest}")
+    assert result.exit_code == 0, f"Error found: {result.output_bytes}"
+
+    assert f"Created {SPEC.size} transactions from 1 files" in result.output
+
+
+def test_sync_keeps_a_checkpoint_per_account(
+    yul: CliRunner, statements: Path, empty_budget: YnabClientStub, mocker: MockerFixture
+):
+    configs: list[ConfigV2] = []
+    load_config = ConfigV2.load
+
+    def load_and_keep() -> ConfigV2:
+        configs.append(config := load_config())
+        return config
+
+    mocker.patch.object(ConfigV2, "load", side_effect=load_and_keep)
+    manifest = write_manifest(
+        statements,
+        """
+        [[imports]]
+        entity = "sabadell"
+        file = "sabadell.txt"
+        options = { year = 2025 }
+
+        [[imports]]
+        entity = "sabadell"
+        file = "sabadell.txt"
+        account_id = "other-sabadell-account"
+        options = { year = 2025 }
+        """,
+    )
+
+    # One at a time, so that the second import always runs after the first checkpoint is saved
+    result = yul(f"sync --workers 1 {manifest}")
+    assert result.exit_code == 0, f"Error found: {result.output_bytes}"
+
+    # Neither import is skipped because of the checkpoint saved by the other one
+    assert f"Created {2 * SPEC.size} transactions from 2 files" in result.output
+    sabadell = configs[-1].entities["sabadell"]
+    assert sabadell.checkpoint is not None
+    assert sabadell.checkpoint_for("other-sabadell-account") == sabadell.checkpoint
+
+
+def test_sync_runs_imports_in_parallel(
+    yul: CliRunner, statements: Path, empty_budget: YnabClientStub
+):
+    def slow_transactions(*args, **kwargs):
+        time.sleep(0.3)
+        response = empty_budget.api("transactions").get_transactions_by_account.return_value
+        return response
+
+    empty_budget.api("transactions").get_transactions_by_account.side_effect = slow_transactions
+    entry = '[[imports]]\nentity = "sabadell"\nfile = "sabadell.txt"\n'
+    manifest = write_manifest(statements, entry * 4)
+
+    start = time.perf_counter()
+    result = yul(f"sync --workers 4 {manifest}")
+    assert result.exit_code == 0, f"Error found: {result.output_bytes}"
+
+    assert time.perf_counter() - start < 1.0
+
+
+def test_sync_runs_imports_to_the_same_account_one_at_a_time(
+    yul: CliRunner, statements: Path, empty_budget: YnabClientStub, mocker: MockerFixture
+):
+    running: set[str] = set()
+    overlapped: list[tuple[str, ...]] = []
+    lock = threading.Lock()
+
+    def tracked_import(entity, input_file, context, account_id, **kwargs):
+        with lock:
+            if running:
+                overlapped.append(tuple(sorted({*running, account_id})))
+            running.add(account_id)
+        time.sleep(0.2)
+        try:
+            return import_in_chunks(entity, input_file, context, account_id, **kwargs)
+        finally:
+            with lock:
+                running.discard(account_id)
+
+    mocker.patch("ynab_unlinked.commands.sync.import_in_chunks", side_effect=tracked_import)
+    entry = '[[imports]]\nentity = "sabadell"\nfile = "sabadell.txt"\naccount_id = "{}"\n'
+    manifest = write_manifest(statements, entry.format("account-a") * 2 + entry.format("account-b"))
+
+    result = yul(f"sync --workers 4 {manifest}")
+    assert result.exit_code == 0, f"Error found: {result.output_bytes}"
+
+    # Only imports to different accounts run at the same time
+    assert overlapped
+    assert all(len(accounts) == 2 for accounts in overlapped)
+
+
+def test_sync_metrics_file(
+    yul: CliRunner, statements: Path, empty_budget: YnabClientStub, tmp_path: Path
+):
+    manifest = write_manifest(
+        statements,
+        """
+        [[imports]]
+        entity = "sabadell"
+        file = "sabadell.txt"
+        options = { year = 2025 }
+
+        [[imports]]
+        entity = "cobee"
+        file = "cobee.html"
+        options = { language = "en" }
+        """,
+    )
+    metrics_file = tmp_path / "metrics.jsonl"
+
+    result = yul(f"sync --profile --metrics-file {metrics_file} {manifest}")
+    assert result.exit_code == 0, f"Error found: {result.output_bytes}"
+
+    assert "Profile" in result.output
+    [record] = [json.loads(line) for line in metrics_file.read_text().splitlines()]
+    assert record["command"] == "sync"
+    assert record["input_file"] == str(manifest)
+    assert record["completed"]
+    assert record["transactions"]["created"] == 2 * SPEC.size
+    assert "upload" in record["phases"]
+
+
+def test_sync_reports_failed_imports(
+    yul: CliRunner, statements: Path, empty_budget: YnabClientStub
+):
+    manifest = write_manifest(
+        statements,
+        """
+        [[imports]]
+        entity = "sabadell"
+        file = "sabadell.txt"
+
+        [[imports]]
+        entity = "bbva"
+        file = "missing.pdf"
+        """,
+    )
+
+    result = yul(f"sync {manifest}")
+
+    assert result.exit_code == 1
+    assert "No account is set for 'bbva'" in " ".join(result.output.split())
+    assert empty_budget.api("transactions").create_transaction.call_count == 1
+
+
+def test_sync_unknown_entity(yul: CliRunner, tmp_path: Path):
+    manifest = write_manifest(tmp_path, '[[imports]]\nentity = "nobank"\nfile = "x.txt"\n')
+
+    result = yul(f"sync {manifest}")
+
+    assert result.exit_code == 1
+    assert "Unknown entities in the manifest: nobank" in result.output
@@ -7,6 +7,7 @@ import pytest
 
 from ynab_unlinked.config import Config
 from ynab_unlinked.config.constants import TRANSACTION_GRACE_PERIOD_DAYS
+from ynab_unlinked.config.models import Checkpoint
 from ynab_unlinked.models import Transaction
 
 # This module tests the central logic of the config object. It does not focus on each particular
@@ -42,11 +43,16 @@ def test_update_and_save(config_obj: Config, monkeypatch: pytest.MonkeyPatch):
 
     monkeypatch.setattr(Path, "write_text", record_save(output))
 
-    config_obj.update_and_save(transaction, "sabadell")
+    config_obj.update_and_save([transaction], "sabadell", "sabadell-account")
 
     assert output[0] != ""
 
     sabadell = json.loads(output[0])["entities"]["sabadell"]
-    assert dt.datetime.strptime(
-        sabadell["checkpoint"]["latest_date_processed"], "%Y-%m-%d"
-    ).date() == (trasaction_date - dt.timedelta(days=TRANSACTION_GRACE_PERIOD_DAYS))
+    latest_date_processed = trasaction_date - dt.timedelta(days=TRANSACTION_GRACE_PERIOD_DAYS)
+    assert (
+        dt.datetime.strptime(sabadell["checkpoint"]["latest_date_processed"], "%Y-%m-%d").date()
+        == latest_date_processed
+    )
+    assert sabadell["checkpoint"]["latest_transactions_digest"] == Checkpoint.digest(
+        [transaction], latest_date_processed
+    )
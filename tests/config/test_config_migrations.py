@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import datetime as dt
+import shutil
 from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
@@ -7,13 +9,17 @@ from typing import TYPE_CHECKING
 from unittest.mock import MagicMock, patch
 
 import pytest
-from ynab.models.budget_detail import BudgetDetail
+from ynab.models.budget_settings import BudgetSettings
+from ynab.models.budget_summary import BudgetSummary
 from ynab.models.currency_format import CurrencyFormat
 from ynab.models.date_format import DateFormat
 
 from ynab_unlinked.config import MAX_CONFIG_VERSION
 from ynab_unlinked.config.core import VERSION_MAPPING
 from ynab_unlinked.config.migrations.base import MigrationEngine, Version
+from ynab_unlinked.config.models.v1 import ConfigV1
+from ynab_unlinked.config.models.v2 import ConfigV2
+from ynab_unlinked.config.types import Config
 from ynab_unlinked.ynab_api import Client
 
 if TYPE_CHECKING:
@@ -40,10 +46,13 @@ def unlink(mocker: MockerFixture):
 
 @pytest.fixture(autouse=True)
 def ynab_client_mock(mocker: MockerFixture):
-    budget_patch = mocker.patch.object(Client, "budget")
-    budget_patch.return_value = BudgetDetail(
-        id="budget_id",
-        name="My Budget",
+    budgets_patch = mocker.patch.object(Client, "budgets")
+    budgets_patch.return_value = [
+        BudgetSummary(id="other_budget_id", name="Other Budget"),
+        BudgetSummary(id="budget_id", name="My Budget"),
+    ]
+    settings_patch = mocker.patch.object(Client, "budget_settings")
+    settings_patch.return_value = BudgetSettings(
         date_format=DateFormat(format="DD/MM/YYYY"),
         currency_format=CurrencyFormat(
             iso_code="EUR",
@@ -60,8 +69,9 @@ def ynab_client_mock(mocker: MockerFixture):
 
 
 @contextmanager
-def mock_config_paths(origin: Version, destinoation: Version):
-    # Allows mocking the versions to be returned by both config versions
+def mock_config_paths(origin: Version, destinoation: Version, tmp_path: Path):
+    # Allows mocking the versions to be returned by both config versions. The configs are copied
+    # so that saving the migrated config does not overwrite the assets
     def path_and_method(v: Version):
         if v.version == "V1":
             return "ynab_unlinked.config.paths.v1_config_path"
@@ -72,13 +82,29 @@ def mock_config_paths(origin: Version, destinoation: Version):
         patch(path_and_method(origin)) as origin_path_patch,
         patch(path_and_method(destinoation)) as destination_path_patch,
     ):
-        origin_path_patch.return_value = Path(f"tests/assets/config_{origin.version}/config.json")
-        destination_path_patch.return_value = Path(
-            f"tests/assets/config_{destinoation.version}/config.json"
-        )
+        origin_path_patch.return_value = config_copy(origin, tmp_path)
+        destination_path_patch.return_value = config_copy(destinoation, tmp_path)
         yield
 
 
+def config_copy(version: Version, tmp_path: Path) -> Path:
+    copy = tmp_path / f"config_{version.version}" / "config.json"
+    copy.parent.mkdir(exist_ok=True)
+    shutil.copyfile(f"tests/assets/config_{version.version}/config.json", copy)
+    return copy
+
+
+def without_digests(config: Config) -> Config:
+    # V1 configs were saved before checkpoints had a digest, so it is lost on the way from V2
+    assert isinstance(config, ConfigV1 | ConfigV2)
+    config = config.model_copy(deep=True)
+    for entity in config.entities.values():
+        for checkpoint in [entity.checkpoint, *entity.account_checkpoints.values()]:
+            if checkpoint is not None:
+                checkpoint.latest_transactions_digest = None
+    return config
+
+
 def all_migrations_params(rollbback=False):
     result = []
     for vid in range(1, MAX_CONFIG_VERSION + 1):
@@ -94,9 +120,13 @@ def all_migrations_params(rollbback=False):
 
 @pytest.mark.parametrize("origin, destination", all_migrations_params())
 def test_migrations_on_migrate(
-    origin: Version, destination: Version, unlink: UnlinkMock, migration_engine: MigrationEngine
+    origin: Version,
+    destination: Version,
+    unlink: UnlinkMock,
+    migration_engine: MigrationEngine,
+    tmp_path: Path,
 ):
-    with mock_config_paths(origin, destination):
+    with mock_config_paths(origin, destination, tmp_path):
         origin_class = VERSION_MAPPING.get(origin.version)
         destination_class = VERSION_MAPPING.get(destination.version)
 
@@ -108,6 +138,9 @@ def test_migrations_on_migrate(
 
         migrated_config = migration_engine.migrate(origin_config, destination_class)
 
+        # sourcery skip: no-conditionals-in-tests
+        if origin.version == "V1":
+            destination_config = without_digests(destination_config)
         assert migrated_config == destination_config
 
         should_unlink = origin.version == "V1"
@@ -116,14 +149,35 @@ def test_migrations_on_migrate(
             unlink.rmtree.assert_called_once()
 
 
+def test_migrate_v1_checkpoints_without_digest(
+    unlink: UnlinkMock, migration_engine: MigrationEngine, tmp_path: Path
+):
+    origin = Version("Config", "V1")
+    destination = Version("Config", "V2")
+    with mock_config_paths(origin, destination, tmp_path):
+        origin_config = ConfigV1.load()
+
+        migrated_config = migration_engine.migrate(origin_config, ConfigV2)
+
+    checkpoints = {name: entity.checkpoint for name, entity in migrated_config.entities.items()}
+    assert checkpoints["sabadell"] is not None
+    assert checkpoints["sabadell"].latest_date_processed == dt.date(2025, 5, 9)
+    assert all(
+        checkpoint.latest_transactions_digest is None
+        for checkpoint in checkpoints.values()
+        if checkpoint is not None
+    )
+
+
 @pytest.mark.parametrize("origin, destination", all_migrations_params(True))
 def test_migrations_on_rollback(
     origin: Version,
     destination: Version,
     unlink: UnlinkMock,
     migration_engine: MigrationEngine,
+    tmp_path: Path,
 ):
-    with mock_config_paths(origin, destination):
+    with mock_config_paths(origin, destination, tmp_path):
         origin_class = VERSION_MAPPING.get(origin.version)
         destination_class = VERSION_MAPPING.get(destination.version)
 
@@ -135,6 +189,9 @@ def test_migrations_on_rollback(
 
         migrated_config = migration_engine.rollback(origin_config, destination_class)
 
+        # sourcery skip: no-conditionals-in-tests
+        if destination.version == "V1":
+            migrated_config = without_digests(migrated_config)
         assert migrated_config == destination_config
 
         should_unlink = origin.version == "V1"
@@ -55,6 +55,14 @@ def context_obj(config: str):
     )
 
 
+@pytest.fixture(autouse=True)
+def metadata_cache_dir(tmp_path: Path, mocker: MockerFixture) -> Path:
+    """Keep the cache of every test, as the YNAB metadata or the import ledgers, away from the user's"""
+    cache = tmp_path / "cache"
+    mocker.patch("ynab_unlinked.config.paths.cache_dir", return_value=cache)
+    return cache
+
+
 @pytest.fixture
 def today() -> Generator[dt.datetime]:
     today = dt.datetime(2025, 5, 15)
@@ -1,8 +1,11 @@
 import datetime as dt
+from pathlib import Path
 
 import pytest
 
 from tests.helpers import assets
+from tests.helpers.generators import BudgetSpec, generate_transactions
+from tests.helpers.statements import write_bbva_pdf
 from ynab_unlinked.context_object import YnabUnlinkedContext
 from ynab_unlinked.entities.bbva.bbva import BBVA
 
@@ -22,3 +25,44 @@ def test_parse_xlsx(context_obj: YnabUnlinkedContext):
     assert transactions[4].date == dt.date(2025, 7, 5)
     assert transactions[4].payee == "Recibo mes anterior"
     assert transactions[4].amount == 270.74
+
+
+def test_parse_pdf(tmp_path: Path, context_obj: YnabUnlinkedContext):
+    expected = generate_transactions(BudgetSpec(size=60))
+    input_file = write_bbva_pdf(tmp_path / "bbva.pdf", expected)
+
+    transactions = BBVA().parse(input_file, context_obj)
+
+    assert transactions == expected
+
+
+def test_parse_pdf_since(tmp_path: Path, context_obj: YnabUnlinkedContext):
+    statement = generate_transactions(BudgetSpec(size=60, date_spread_days=60))
+    input_file = write_bbva_pdf(tmp_path / "bbva.pdf", statement)
+    since = statement[20].date
+
+    transactions = BBVA().parse(input_file, context_obj, since=since)
+
+    assert transactions == [t for t in statement if t.date >= since]
+
+
+def test_iter_parse_pdf_yields_while_reading(tmp_path: Path, context_obj: YnabUnlinkedContext):
+    expected = generate_transactions(BudgetSpec(size=60))
+    input_file = write_bbva_pdf(tmp_path / "bbva.pdf", expected)
+
+    transactions = BBVA().iter_parse(input_file, context_obj)
+
+    assert next(transactions) == expected[0]
+    assert [expected[0], *transactions] == expected
+
+
+def test_parse_pdf_without_text_layout_falls_back_to_tables(
+    tmp_path: Path, context_obj: YnabUnlinkedContext
+):
+    expected = generate_transactions(BudgetSpec(size=60))
+    # The header is not the one expected, so the rows are read from the table of each page
+    input_file = write_bbva_pdf(tmp_path / "bbva.pdf", expected, header=["Fecha", "Concepto", ""])
+
+    transactions = BBVA().parse(input_file, context_obj)
+
+    assert transactions == expected
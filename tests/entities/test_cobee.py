@@ -0,0 +1,110 @@
+import datetime as dt
+from pathlib import Path
+
+import pytest
+
+from tests.helpers.generators import BudgetSpec, generate_transactions
+from tests.helpers.statements import write_cobee_html
+from ynab_unlinked.context_object import YnabUnlinkedContext
+from ynab_unlinked.entities.cobee import cobee
+from ynab_unlinked.entities.cobee.cobee import Cobee, CobeeContext, Language
+
+pytestmark = [pytest.mark.version("V2"), pytest.mark.usefixtures("config")]
+
+# Page with the markup that the text extraction has to handle, besides the one of statements
+EDGE_CASES_PAGE = """<html><head><title>Cobee</title><style>p {color: red}</style>
+<script>var x = "<div>";</script></head>
+<body><div>Saldo: <b>12,34</b> € (<i>aprox</i>).</div>
+<ul><li>Uno</li><li>Dos<br>Tres</li></ul><table><tr><td>A</td><td>B</td></tr></table>
+<p>Last   <span>line</span>, <em>really</em>!</p>
+<div><div>Nested <a href="#">link</a></div>tail</div></body></html>"""
+
+
+# The second transaction is cancelled and rejected, so both status lines drop a transaction
+CONSECUTIVE_CANCELS_PAGE = """<html><body><main><h1>Wallet</h1><h2>Transactions</h2>
+<div class="transaction"><p class="date">3 Mar 2025</p><p class="payee">Cafe</p>
+<p class="amount">-4,50 €</p></div>
+<div class="transaction"><p class="date">2 Mar 2025</p><p class="payee">Market</p>
+<p class="amount">-20,00 €</p><p class="status">Cancelled</p>
+<p class="status">Rejected</p></div>
+<div class="transaction"><p class="date">1 Mar 2025</p><p class="payee">Canteen</p>
+<p class="amount">-8,00 €</p></div></main></body></html>"""
+
+
+def text_lines(lines: list[str]) -> list[str]:
+    return [stripped for line in lines if (stripped := line.strip())]
+
+
+@pytest.mark.parametrize("language", list(Language))
+def test_parse_html(tmp_path: Path, context_obj: YnabUnlinkedContext, language: Language):
+    expected = generate_transactions(BudgetSpec(size=50))
+    input_file = write_cobee_html(tmp_path / "cobee.html", expected, language, cancelled_rate=0)
+    context_obj.extras = CobeeContext(language=language)
+
+    transactions = Cobee().parse(input_file, context_obj)
+
+    assert transactions == expected
+
+
+def test_parse_html_skips_cancelled(tmp_path: Path, context_obj: YnabUnlinkedContext):
+    expected = generate_transactions(BudgetSpec(size=50))
+    input_file = write_cobee_html(tmp_path / "cobee.html", expected, cancelled_rate=0.2)
+    context_obj.extras = CobeeContext(language=Language.ES)
+
+    transactions = Cobee().parse(input_file, context_obj)
+
+    assert 0 < len(transactions) < len(expected)
+    assert all(t in expected for t in transactions)
+
+
+def test_parse_html_consecutive_cancel_lines(tmp_path: Path, context_obj: YnabUnlinkedContext):
+    input_file = tmp_path / "cobee.html"
+    input_file.write_text(CONSECUTIVE_CANCELS_PAGE)
+    context_obj.extras = CobeeContext(language=Language.EN)
+
+    transactions = Cobee().parse(input_file, context_obj)
+
+    # Each status line drops the latest transaction kept, as the html_text based parser did
+    assert [(t.date, t.payee, t.amount) for t in transactions] == [
+        (dt.date(2025, 3, 1), "Canteen", -8.0)
+    ]
+
+
+def test_parse_html_since(tmp_path: Path, context_obj: YnabUnlinkedContext):
+    statement = generate_transactions(BudgetSpec(size=50, date_spread_days=60))
+    input_file = write_cobee_html(tmp_path / "cobee.html", statement, cancelled_rate=0)
+    context_obj.extras = CobeeContext(language=Language.ES)
+    since = statement[20].date
+
+    transactions = Cobee().parse(input_file, context_obj, since=since)
+
+    assert transactions == [t for t in statement if t.date >= since]
+
+
+def test_parse_html_in_small_chunks(
+    tmp_path: Path, context_obj: YnabUnlinkedContext, monkeypatch: pytest.MonkeyPatch
+):
+    expected = generate_transactions(BudgetSpec(size=10))
+    input_file = write_cobee_html(tmp_path / "cobee.html", expected, cancelled_rate=0)
+    context_obj.extras = CobeeContext(language=Language.ES)
+    # Texts and tags are split between chunks
+    monkeypatch.setattr(cobee, "READ_CHUNK_SIZE", 3)
+
+    transactions = Cobee().parse(input_file, context_obj)
+
+    assert transactions == expected
+
+
+@pytest.mark.parametrize("language", [*Language, None])
+def test_page_lines_match_html_text(tmp_path: Path, language: Language | None):
+    html_text = pytest.importorskip("html_text")
+    if language is None:
+        input_file = tmp_path / "page.html"
+        input_file.write_text(EDGE_CASES_PAGE)
+    else:
+        statement = generate_transactions(BudgetSpec(size=50))
+        input_file = write_cobee_html(tmp_path / "cobee.html", statement, language)
+
+    expected = html_text.extract_text(input_file.read_text()).splitlines()
+
+    assert text_lines(list(cobee.page_lines(input_file))) == text_lines(expected)
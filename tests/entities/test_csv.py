@@ -0,0 +1,73 @@
+import datetime as dt
+from pathlib import Path
+
+import pytest
+
+from tests.helpers.generators import BudgetSpec, generate_transactions
+from tests.helpers.statements import BANK_CSV_FORMAT, write_bank_csv
+from ynab_unlinked.config.models.v2 import CsvFormat
+from ynab_unlinked.context_object import YnabUnlinkedContext
+from ynab_unlinked.entities.csv.csv import CsvParser
+from ynab_unlinked.exceptions import ParsingError
+from ynab_unlinked.models import Transaction
+
+pytestmark = [pytest.mark.version("V2"), pytest.mark.usefixtures("config")]
+
+
+def test_parse_csv(tmp_path: Path, context_obj: YnabUnlinkedContext):
+    expected = generate_transactions(BudgetSpec(size=200))
+    input_file = write_bank_csv(tmp_path / "bank.csv", expected, pending_rate=0.1)
+    context_obj.config.csv_formats["bank"] = BANK_CSV_FORMAT
+
+    transactions = CsvParser("bank").parse(input_file, context_obj)
+
+    assert transactions == expected
+
+
+def test_parse_csv_since(tmp_path: Path, context_obj: YnabUnlinkedContext):
+    statement = generate_transactions(BudgetSpec(size=50, date_spread_days=60))
+    input_file = write_bank_csv(tmp_path / "bank.csv", statement)
+    context_obj.config.csv_formats["bank"] = BANK_CSV_FORMAT
+    since = statement[20].date
+
+    transactions = CsvParser("bank").parse(input_file, context_obj, since=since)
+
+    assert transactions == [t for t in statement if t.date >= since]
+
+
+def test_parse_tsv_by_column_position(tmp_path: Path, context_obj: YnabUnlinkedContext):
+    input_file = tmp_path / "bank.tsv"
+    input_file.write_text("2025-05-02\tCard\tShop\t-10.50\n\n2025-05-01\tCard\tPayroll\t1,500.00\n")
+    context_obj.config.csv_formats["bank"] = CsvFormat(
+        date=0, payee=2, amount=3, date_format="%Y-%m-%d", has_header=False
+    )
+
+    transactions = CsvParser("bank").parse(input_file, context_obj)
+
+    assert transactions == [
+        Transaction(dt.date(2025, 5, 2), "Shop", -10.5),
+        Transaction(dt.date(2025, 5, 1), "Payroll", 1500.0),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("csv_format", "message"),
+    [
+        (None, "no CSV format named 'bank'"),
+        (CsvFormat(date="Date", payee="Payee", amount="Total"), "Column 'Total' was not found"),
+        (CsvFormat(date="Date", payee="Payee", amount="Amount"), "line 3"),
+    ],
+)
+def test_parse_csv_errors(
+    tmp_path: Path,
+    context_obj: YnabUnlinkedContext,
+    csv_format: CsvFormat | None,
+    message: str,
+):
+    input_file = tmp_path / "bank.csv"
+    input_file.write_text("Date,Payee,Amount\n01/05/2025,Shop,-1.00\n2025-05-02,Shop,-2.00\n")
+    if csv_format is not None:
+        context_obj.config.csv_formats["bank"] = csv_format
+
+    with pytest.raises(ParsingError, match=message):
+        CsvParser("bank").parse(input_file, context_obj)
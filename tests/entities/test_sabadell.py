@@ -2,6 +2,10 @@ import datetime as dt
 from pathlib import Path
 from typing import cast
 
+import pytest
+
+from tests.helpers.generators import BudgetSpec, generate_transactions
+from tests.helpers.statements import write_sabadell_xls
 from ynab_unlinked.context_object import YnabUnlinkedContext
 from ynab_unlinked.entities.sabadell.sabadell import ANCHOR_LINE, SabadellParser
 
@@ -60,3 +64,58 @@ Some Header Info
     assert transactions[1].date.year == 2024
     assert transactions[1].date.month == 12
     assert transactions[1].date.day == 31
+
+
+def test_parse_txt_year_transition_december_first(tmp_path: Path) -> None:
+    content = f"""
+Some Header Info
+{ANCHOR_LINE}
+31/12|DEC TRANSACTION|CITY|20,00EUR
+02/01|JAN TRANSACTION|CITY|10,00EUR
+    """.strip()
+
+    input_file = tmp_path / "sabadell_transition.txt"
+    input_file.write_text(content, encoding="cp1252")
+
+    transactions = SabadellParser(year=2025).parse(input_file, cast(YnabUnlinkedContext, None))
+
+    # December transactions are held back until a January one shows the year changed
+    assert [t.date for t in transactions] == [dt.date(2024, 12, 31), dt.date(2025, 1, 2)]
+
+
+@pytest.mark.parametrize(
+    ("since", "expected_dates"),
+    [
+        (dt.date(2024, 12, 30), [dt.date(2025, 1, 2), dt.date(2024, 12, 31)]),
+        (dt.date(2025, 1, 1), [dt.date(2025, 1, 2)]),
+        # The January transaction is skipped but the December one is still in the previous year
+        (dt.date(2025, 1, 3), []),
+    ],
+)
+def test_parse_txt_since(tmp_path: Path, since: dt.date, expected_dates: list[dt.date]) -> None:
+    content = f"""
+Some Header Info
+{ANCHOR_LINE}
+02/01|JAN TRANSACTION|CITY|10,00EUR
+31/12|DEC TRANSACTION|CITY|20,00EUR
+    """.strip()
+
+    input_file = tmp_path / "sabadell_transition.txt"
+    input_file.write_text(content, encoding="cp1252")
+
+    transactions = SabadellParser(year=2025).parse(
+        input_file, cast(YnabUnlinkedContext, None), since=since
+    )
+
+    assert [t.date for t in transactions] == expected_dates
+
+
+def test_parse_xls(tmp_path: Path) -> None:
+    expected = generate_transactions(BudgetSpec(size=50, date_spread_days=100))
+    input_file = write_sabadell_xls(tmp_path / "sabadell.xls", expected, pending_rate=0)
+
+    transactions = SabadellParser(year=2025).parse(input_file, cast(YnabUnlinkedContext, None))
+
+    assert [(t.date, t.payee, t.amount) for t in transactions] == [
+        (t.date, t.payee.upper().title(), t.amount) for t in expected
+    ]
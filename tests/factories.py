@@ -1,5 +1,9 @@
 # type: ignore
+import datetime as dt
+
+from factory import Sequence
 from factory.base import Factory
+from ynab import Account, AccountType, TransactionClearedStatus, TransactionDetail
 
 from ynab_unlinked.config.models.v2 import CurrencyFormat
 
@@ -15,3 +19,35 @@ class CurrencyFormatFactory(Factory):
     group_separator = ","
     currency_symbol = "€"
     display_symbol = True
+
+
+class AccountFactory(Factory):
+    class Meta:
+        model = Account
+
+    id = Sequence(lambda n: f"account-{n}")
+    name = Sequence(lambda n: f"Account {n}")
+    type = AccountType.CHECKING
+    on_budget = True
+    closed = False
+    balance = 0
+    cleared_balance = 0
+    uncleared_balance = 0
+    transfer_payee_id = None
+    deleted = False
+
+
+class TransactionDetailFactory(Factory):
+    class Meta:
+        model = TransactionDetail
+
+    id = Sequence(lambda n: f"transaction-{n}")
+    var_date = dt.date(2025, 5, 1)
+    amount = -10000
+    cleared = TransactionClearedStatus.CLEARED
+    approved = True
+    account_id = "account-0"
+    account_name = "Account 0"
+    payee_name = Sequence(lambda n: f"Payee {n}")
+    deleted = False
+    subtransactions = []
@@ -0,0 +1,359 @@
+"""
+In-process HTTP server that implements the endpoints of the YNAB API used by ynab-unlinked.
+
+The server is seeded from a synthetic budget and keeps its state in memory, so imports and
+reconciliations change what later requests return. Delta requests through
+`last_knowledge_of_server` are supported, and every request can be slowed down with `latency`
+or rejected with a 429 once more than `rate_limit` requests arrive within `rate_window` seconds,
+as YNAB does.
+
+```python
+with FakeYnab(budget) as server:
+    client = Client("api-key", host=server.url)
+```
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from tests.factories import AccountFactory
+from tests.helpers.generators import SyntheticBudget
+
+type JSON = dict[str, Any]
+type Route = tuple[str, re.Pattern[str], Callable[..., tuple[HTTPStatus, JSON]]]
+
+DEFAULT_BUDGET_ID = "benchmark-budget"
+DEFAULT_CURRENCY_FORMAT: JSON = {
+    "iso_code": "EUR",
+    "example_format": "123.456,78",
+    "decimal_digits": 2,
+    "decimal_separator": ",",
+    "symbol_first": False,
+    "group_separator": ".",
+    "currency_symbol": "€",
+    "display_symbol": True,
+}
+
+
+class FakeYnab:
+    def __init__(
+        self,
+        budget: SyntheticBudget,
+        budget_id: str = DEFAULT_BUDGET_ID,
+        latency: float = 0.0,
+        rate_limit: int | None = None,
+        rate_window: float = 3600.0,
+    ):
+        self.budget = budget
+        self.budget_id = budget_id
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        # Method and path of every request received, including rejected ones
+        self.requests: list[tuple[str, str]] = []
+        self._lock = threading.Lock()
+        self._arrivals: deque[float] = deque()
+        self._routes: list[Route] = [
+            ("GET", re.compile(r"/budgets"), self._get_budgets),
+            ("GET", re.compile(r"/budgets/(?P<budget_id>[^/]+)/settings"), self._get_settings),
+            ("GET", re.compile(r"/budgets/(?P<budget_id>[^/]+)/accounts"), self._get_accounts),
+            ("GET", re.compile(r"/budgets/(?P<budget_id>[^/]+)/payees"), self._get_payees),
+            (
+                "GET",
+                re.compile(r"/budgets/(?P<budget_id>[^/]+)/transactions"),
+                self._get_transactions,
+            ),
+            (
+                "GET",
+                re.compile(
+                    r"/budgets/(?P<budget_id>[^/]+)/accounts/(?P<account_id>[^/]+)/transactions"
+                ),
+                self._get_transactions,
+            ),
+            (
+                "POST",
+                re.compile(r"/budgets/(?P<budget_id>[^/]+)/transactions"),
+                self._create_transactions,
+            ),
+            (
+                "PATCH",
+                re.compile(r"/budgets/(?P<budget_id>[^/]+)/transactions"),
+                self._update_transactions,
+            ),
+        ]
+        self.reset()
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> FakeYnab:
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> FakeYnab:
+        return self.start()
+
+    def __exit__(self, *exc_info: object):
+        self.stop()
+
+    def reset(self):
+        """Drop every change made through the API and go back to the seeded budget"""
+        with self._lock:
+            self.requests.clear()
+            self._arrivals.clear()
+            self.server_knowledge = 1
+            self.accounts: list[JSON] = [
+                AccountFactory.build(id=self.budget.spec.account_id).model_dump(mode="json")
+            ]
+            self.transactions: dict[str, JSON] = {
+                t.id: t.model_dump(mode="json", by_alias=True)
+                for t in self.budget.ynab_transactions
+            }
+            self.payees: dict[str, JSON] = {
+                p.name: p.model_dump(mode="json") for p in self.budget.payees
+            }
+            self._knowledge: dict[str, int] = dict.fromkeys(
+                [
+                    *self.transactions,
+                    *(p["id"] for p in self.payees.values()),
+                    *(a["id"] for a in self.accounts),
+                ],
+                1,
+            )
+
+    def update_account(self, account_id: str, **changes: Any):
+        """Change an account as if it was edited in YNAB"""
+        with self._lock:
+            self.server_knowledge += 1
+            account = next(a for a in self.accounts if a["id"] == account_id)
+            account.update(changes)
+            self._bump(account_id)
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server._handle(self)
+
+            def do_POST(self):
+                server._handle(self)
+
+            def do_PATCH(self):
+                server._handle(self)
+
+            def log_message(self, format: str, *args: Any):
+                pass
+
+        return Handler
+
+    def _handle(self, request: BaseHTTPRequestHandler):
+        url = urlsplit(request.path)
+        path = url.path.removeprefix("/v1")
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        length = int(request.headers.get("Content-Length") or 0)
+        body = json.loads(request.rfile.read(length)) if length else {}
+
+        with self._lock:
+            self.requests.append((request.command, path))
+            rate_limited = self._rate_limited()
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if rate_limited:
+            status, payload = HTTPStatus.TOO_MANY_REQUESTS, error(429, "too_many_requests")
+        else:
+            status, payload = self._route(request.command, path, query, body)
+
+        content = json.dumps(payload).encode()
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json; charset=utf-8")
+        request.send_header("Content-Length", str(len(content)))
+        request.end_headers()
+        request.wfile.write(content)
+
+    def _rate_limited(self) -> bool:
+        if self.rate_limit is None:
+            return False
+
+        now = time.monotonic()
+        while self._arrivals and now - self._arrivals[0] >= self.rate_window:
+            self._arrivals.popleft()
+        if len(self._arrivals) >= self.rate_limit:
+            return True
+
+        self._arrivals.append(now)
+        return False
+
+    def _route(self, method: str, path: str, query: JSON, body: JSON) -> tuple[HTTPStatus, JSON]:
+        for route_method, pattern, endpoint in self._routes:
+            if route_method != method or (match := pattern.fullmatch(path)) is None:
+                continue
+
+            params = match.groupdict()
+            if params.pop("budget_id", self.budget_id) != self.budget_id:
+                return HTTPStatus.NOT_FOUND, error(404, "resource_not_found")
+
+            with self._lock:
+                return endpoint(query=query, body=body, **params)
+
+        return HTTPStatus.NOT_FOUND, error(404, "resource_not_found")
+
+    def _changed_since(self, query: JSON) -> Callable[[str], bool]:
+        last_knowledge = int(query.get("last_knowledge_of_server", 0))
+        return lambda item_id: self._knowledge[item_id] > last_knowledge
+
+    def _bump(self, item_id: str):
+        self._knowledge[item_id] = self.server_knowledge
+
+    def _get_budgets(self, query: JSON, body: JSON) -> tuple[HTTPStatus, JSON]:
+        budget = {
+            "id": self.budget_id,
+            "name": "Synthetic Budget",
+            "date_format": {"format": "DD/MM/YYYY"},
+            "currency_format": DEFAULT_CURRENCY_FORMAT,
+        }
+        if query.get("include_accounts") == "true":
+            budget["accounts"] = self.accounts
+        return HTTPStatus.OK, {"data": {"budgets": [budget], "default_budget": None}}
+
+    def _get_settings(self, query: JSON, body: JSON) -> tuple[HTTPStatus, JSON]:
+        return HTTPStatus.OK, {
+            "data": {
+                "settings": {
+                    "date_format": {"format": "DD/MM/YYYY"},
+                    "currency_format": DEFAULT_CURRENCY_FORMAT,
+                }
+            }
+        }
+
+    def _get_accounts(self, query: JSON, body: JSON) -> tuple[HTTPStatus, JSON]:
+        changed = self._changed_since(query)
+        accounts = [account for account in self.accounts if changed(account["id"])]
+        return HTTPStatus.OK, {
+            "data": {"accounts": accounts, "server_knowledge": self.server_knowledge}
+        }
+
+    def _get_payees(self, query: JSON, body: JSON) -> tuple[HTTPStatus, JSON]:
+        changed = self._changed_since(query)
+        payees = [payee for payee in self.payees.values() if changed(payee["id"])]
+        return HTTPStatus.OK, {
+            "data": {"payees": payees, "server_knowledge": self.server_knowledge}
+        }
+
+    def _get_transactions(
+        self, query: JSON, body: JSON, account_id: str | None = None
+    ) -> tuple[HTTPStatus, JSON]:
+        changed = self._changed_since(query)
+        since_date = query.get("since_date", "")
+        transactions = [
+            t
+            for t in self.transactions.values()
+            if (account_id is None or t["account_id"] == account_id)
+            # ISO dates sort as strings
+            and t["date"] >= since_date
+            and changed(t["id"])
+        ]
+        return HTTPStatus.OK, {
+            "data": {"transactions": transactions, "server_knowledge": self.server_knowledge}
+        }
+
+    def _payee_id(self, name: str | None) -> str | None:
+        if name is None:
+            return None
+
+        if (payee := self.payees.get(name)) is None:
+            payee = {"id": f"payee-{uuid.uuid4()}", "name": name, "deleted": False}
+            self.payees[name] = payee
+            self._bump(payee["id"])
+        return payee["id"]
+
+    def _create_transactions(self, query: JSON, body: JSON) -> tuple[HTTPStatus, JSON]:
+        self.server_knowledge += 1
+        imported = {
+            (t["account_id"], t["import_id"])
+            for t in self.transactions.values()
+            if t.get("import_id")
+        }
+        saved: list[JSON] = []
+        duplicates: list[str] = []
+
+        for new in body["transactions"]:
+            if (key := (new["account_id"], new.get("import_id"))) in imported:
+                duplicates.append(new["import_id"])
+                continue
+
+            imported.add(key)
+            transaction = {
+                "id": str(uuid.uuid4()),
+                "date": new["date"],
+                "amount": new["amount"],
+                "memo": new.get("memo"),
+                "cleared": new.get("cleared", "uncleared"),
+                "approved": new.get("approved", False),
+                "account_id": new["account_id"],
+                "account_name": "Synthetic Account",
+                "payee_id": new.get("payee_id") or self._payee_id(new.get("payee_name")),
+                "payee_name": new.get("payee_name"),
+                "import_id": new.get("import_id"),
+                "deleted": False,
+                "subtransactions": [],
+            }
+            self.transactions[transaction["id"]] = transaction
+            self._bump(transaction["id"])
+            saved.append(transaction)
+
+        return HTTPStatus.CREATED, {
+            "data": {
+                "transaction_ids": [t["id"] for t in saved],
+                "transactions": saved,
+                "duplicate_import_ids": duplicates,
+                "server_knowledge": self.server_knowledge,
+            }
+        }
+
+    def _update_transactions(self, query: JSON, body: JSON) -> tuple[HTTPStatus, JSON]:
+        self.server_knowledge += 1
+        saved: list[JSON] = []
+
+        for update in body["transactions"]:
+            if (transaction := self.transactions.get(update.get("id", ""))) is None:
+                return HTTPStatus.NOT_FOUND, error(404, "resource_not_found")
+
+            transaction.update({k: v for k, v in update.items() if k != "id"})
+            self._bump(transaction["id"])
+            saved.append(transaction)
+
+        return HTTPStatus.OK, {
+            "data": {
+                "transaction_ids": [t["id"] for t in saved],
+                "transactions": saved,
+                "server_knowledge": self.server_knowledge,
+            }
+        }
+
+
+def error(status: int, name: str) -> JSON:
+    return {"error": {"id": str(status), "name": name, "detail": name.replace("_", " ")}}
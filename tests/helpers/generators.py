@@ -0,0 +1,183 @@
+"""
+Generators of synthetic budgets to exercise the matching engine with realistic volumes.
+
+Every generator is deterministic for a given seed so that results can be compared between runs.
+"""
+
+import datetime as dt
+import random
+from dataclasses import dataclass, field
+
+from ynab import Payee, TransactionClearedStatus, TransactionDetail
+
+from ynab_unlinked.models import Transaction
+
+BASE_PAYEES = [
+    "Mercadona",
+    "Carrefour Express",
+    "Amazon Marketplace",
+    "Netflix.com",
+    "Spotify",
+    "Repsol Estacion",
+    "Renfe Viajeros",
+    "Farmacia Central",
+    "El Corte Ingles",
+    "Glovo",
+    "Uber Trip",
+    "Zara Online",
+    "Ikea Madrid",
+    "Lidl Supermercado",
+    "Decathlon",
+    "Vodafone",
+    "Iberdrola Clientes",
+    "Cafeteria La Plaza",
+    "Restaurante El Puerto",
+    "Apple.com/bill",
+]
+PAYEE_SUFFIXES = [" S.L.", " SA", " *ONLINE", " 0423", " Madrid", " ES"]
+
+
+@dataclass
+class BudgetSpec:
+    """
+    Shape of a synthetic budget.
+
+    - size: number of transactions in the imported statement.
+    - duplicate_rate: fraction of transactions that repeat date, payee and amount of a previous one.
+    - payee_variation: fraction of YNAB transactions whose payee name differs from the imported one.
+    - date_spread_days: number of days the transactions are spread over, ending on `end_date`.
+    - match_rate: fraction of imported transactions that already exist in YNAB.
+    """
+
+    size: int
+    duplicate_rate: float = 0.02
+    payee_variation: float = 0.2
+    date_spread_days: int = 365
+    match_rate: float = 0.8
+    end_date: dt.date = dt.date(2025, 5, 15)
+    account_id: str = "account-0"
+    seed: int = 0
+
+
+@dataclass
+class SyntheticBudget:
+    spec: BudgetSpec
+    transactions: list[Transaction] = field(default_factory=list)
+    ynab_transactions: list[TransactionDetail] = field(default_factory=list)
+    payees: list[Payee] = field(default_factory=list)
+
+
+def payee_name(rng: random.Random, n_payees: int) -> str:
+    base = rng.choice(BASE_PAYEES)
+    # Extend the vocabulary beyond the base payees so larger budgets have more distinct payees
+    if (variant := rng.randrange(n_payees)) >= len(BASE_PAYEES):
+        return f"{base} {variant}"
+    return base
+
+
+def vary_payee(rng: random.Random, payee: str) -> str:
+    match rng.randrange(3):
+        case 0:
+            return payee.upper()
+        case 1:
+            return f"{payee}{rng.choice(PAYEE_SUFFIXES)}"
+        case _:
+            return payee.split(" ")[0]
+
+
+def generate_transactions(spec: BudgetSpec) -> list[Transaction]:
+    """Generate the transactions of an imported statement, newest first as banks export them."""
+    rng = random.Random(spec.seed)
+    n_payees = max(len(BASE_PAYEES), spec.size // 20)
+    transactions: list[Transaction] = []
+
+    for _ in range(spec.size):
+        if transactions and rng.random() < spec.duplicate_rate:
+            original = rng.choice(transactions)
+            transactions.append(Transaction(original.date, original.payee, original.amount))
+            continue
+
+        transactions.append(
+            Transaction(
+                date=spec.end_date - dt.timedelta(days=rng.randrange(spec.date_spread_days)),
+                payee=payee_name(rng, n_payees),
+                amount=-round(rng.uniform(0.5, 300), 2) if rng.random() < 0.9 else 1500.0,
+            )
+        )
+
+    transactions.sort(key=lambda t: t.date, reverse=True)
+    return transactions
+
+
+def generate_ynab_transactions(
+    spec: BudgetSpec, transactions: list[Transaction]
+) -> list[TransactionDetail]:
+    """
+    Generate the YNAB transactions of the account the statement is imported to.
+
+    A `match_rate` fraction of `transactions` is present, some with the same import id and some
+    entered by hand with a date a few days off and, depending on `payee_variation`, a different
+    payee name. The rest of the account is filled with transactions that do not match anything.
+    """
+    rng = random.Random(spec.seed + 1)
+    ynab_transactions: list[TransactionDetail] = []
+
+    def add(date: dt.date, payee: str, amount: int, import_id: str | None = None):
+        n = len(ynab_transactions)
+        ynab_transactions.append(
+            TransactionDetail(
+                id=f"ynab-{n}",
+                var_date=date,
+                amount=amount,
+                cleared=rng.choice(list(TransactionClearedStatus)),
+                approved=True,
+                account_id=spec.account_id,
+                account_name="Synthetic Account",
+                payee_id=f"payee-{payee}",
+                payee_name=payee,
+                import_id=import_id,
+                deleted=False,
+                subtransactions=[],
+            )
+        )
+
+    for transaction in transactions:
+        if rng.random() >= spec.match_rate:
+            # Keep the account size similar to the statement with unrelated transactions
+            add(
+                transaction.date - dt.timedelta(days=rng.randrange(30)),
+                vary_payee(rng, transaction.payee),
+                -rng.randrange(500, 300_000),
+            )
+            continue
+
+        amount = round(transaction.amount * 1000)
+        if rng.random() < 0.5:
+            add(transaction.date, transaction.payee, amount, import_id=transaction.id)
+            continue
+
+        payee = (
+            vary_payee(rng, transaction.payee)
+            if rng.random() < spec.payee_variation
+            else transaction.payee
+        )
+        add(transaction.date + dt.timedelta(days=rng.randrange(-3, 4)), payee, amount)
+
+    ynab_transactions.sort(key=lambda t: t.var_date)
+    return ynab_transactions
+
+
+def generate_payees(ynab_transactions: list[TransactionDetail]) -> list[Payee]:
+    names = sorted({t.payee_name for t in ynab_transactions if t.payee_name is not None})
+    return [Payee(id=f"payee-{name}", name=name, deleted=False) for name in names]
+
+
+def generate_budget(spec: BudgetSpec) -> SyntheticBudget:
+    transactions = generate_transactions(spec)
+    ynab_transactions = generate_ynab_transactions(spec, transactions)
+    return SyntheticBudget(
+        spec=spec,
+        transactions=transactions,
+        ynab_transactions=ynab_transactions,
+        payees=generate_payees(ynab_transactions),
+    )
@@ -18,8 +18,12 @@ from .types import LoadEntityCallback
 class StubEntity(Entity):
     transactions: list[Transaction]
 
-    def parse(self, input_file: Path, context: YnabUnlinkedContext) -> list[Transaction]:
-        return self.transactions
+    def parse(
+        self, input_file: Path, context: YnabUnlinkedContext, since: dt.date | None = None
+    ) -> list[Transaction]:
+        if since is None:
+            return self.transactions
+        return [t for t in self.transactions if t.date >= since]
 
     def name(self) -> str:
         return "test"
@@ -0,0 +1,279 @@
+"""
+Writers of synthetic bank statements in every format supported by the entities.
+
+They take the transactions produced by `tests.helpers.generators` and lay them out the way each
+bank exports them, so that parsers can be exercised with statements of any size.
+"""
+
+import csv
+import datetime as dt
+import random
+from collections.abc import Sequence
+from itertools import batched
+from pathlib import Path
+
+from ynab_unlinked.config.models.v2 import CsvFormat, CsvSkipRule
+from ynab_unlinked.entities.bbva.bbva import PDF_HEADER
+from ynab_unlinked.entities.cobee.cobee import Language, identifers_by_language
+from ynab_unlinked.entities.sabadell.sabadell import ANCHOR_LINE, XLS_DEBIT_LINE
+from ynab_unlinked.models import Transaction
+
+SABADELL_XLS_HEADER = ["FECHA", "CONCEPTO", "LOCALIDAD", "TARJETA", "IMPORTE", "DIVISA"]
+BBVA_XLSX_HEADER = ["", "Fecha", "Tarjeta", "Concepto", "Importe", "Divisa", ""]
+BBVA_CARD = "4940121100362325"
+# Layout of the CSV export written by `write_bank_csv`
+BANK_CSV_FORMAT = CsvFormat(
+    date="Fecha",
+    payee="Concepto",
+    amount="Importe",
+    delimiter=";",
+    decimal_separator=",",
+    outflows_positive=True,
+    skip_lines=1,
+    newest_first=True,
+    skip=[CsvSkipRule(column="Estado", pattern="^PENDIENTE$")],
+)
+COBEE_MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+# Layout of the BBVA PDF statement, in points
+PDF_PAGE_WIDTH = 595
+PDF_PAGE_HEIGHT = 842
+PDF_COLUMNS = [40, 140, 460, 555]
+PDF_ROW_HEIGHT = 28
+PDF_ROWS_PER_PAGE = 25
+PDF_TABLE_TOP = 800
+
+
+def spanish_amount(amount: float) -> str:
+    return f"{amount:.2f}".replace(".", ",")
+
+
+def write_bank_csv(
+    path: Path, transactions: Sequence[Transaction], pending_rate: float = 0.01, seed: int = 0
+) -> Path:
+    """
+    Write the CSV export of a bank laid out as `BANK_CSV_FORMAT` describes.
+
+    Spending is shown as positive, with group separators, and some pending movements that are
+    not part of the transactions are mixed with them.
+    """
+    rng = random.Random(seed)
+    with path.open("w", encoding="utf-8-sig", newline="") as export:
+        export.write("Movimientos de la cuenta ES00 0000 0000 0000 0000 0000\n")
+        writer = csv.writer(export, delimiter=";")
+        writer.writerow(["Fecha", "Concepto", "Importe", "Saldo", "Estado"])
+        for t in transactions:
+            if rng.random() < pending_rate:
+                writer.writerow([f"{t.date:%d/%m/%Y}", "PAGO PENDIENTE", "1,00", "", "PENDIENTE"])
+            amount = f"{-t.amount:,.2f}".translate(str.maketrans(",.", ".,"))
+            writer.writerow([f"{t.date:%d/%m/%Y}", t.payee, f"{amount} €", "", "CONFIRMADO"])
+
+    return path
+
+
+def write_sabadell_txt(
+    path: Path, transactions: Sequence[Transaction], pending_rate: float = 0.01, seed: int = 0
+) -> Path:
+    """Write a Sabadell TXT statement encoded in cp1252. Sabadell shows spending as positive."""
+    rng = random.Random(seed)
+    lines = [
+        "Extracto de tarjeta de crédito",
+        "Titular|JUAN ESPAÑOL",
+        f"{ANCHOR_LINE}|3.000,00EUR",
+        "FECHA|CONCEPTO|LOCALIDAD|IMPORTE",
+    ]
+    for t in transactions:
+        pending = "(1)" if rng.random() < pending_rate else ""
+        lines.append(
+            f"{t.date:%d/%m}|{t.payee.upper()}|MADRID|{spanish_amount(-t.amount)}EUR{pending}"
+        )
+
+    path.write_text("\n".join(lines), encoding="cp1252")
+    return path
+
+
+def write_sabadell_xls(
+    path: Path, transactions: Sequence[Transaction], pending_rate: float = 0.01, seed: int = 0
+) -> Path:
+    """Write a Sabadell XLS statement, with the debit movements at the end of the sheet."""
+    import pyexcel
+
+    rng = random.Random(seed)
+    rows: list[list[str]] = [
+        ["Extracto de tarjeta de crédito", "", "", "", "", ""],
+        ["", "", "", "", "", ""],
+        SABADELL_XLS_HEADER,
+    ]
+    for t in transactions:
+        currency = "EUR(1)" if rng.random() < pending_rate else "EUR"
+        rows.append(
+            [
+                f"{t.date:%d/%m}",
+                t.payee.upper(),
+                "MADRID",
+                BBVA_CARD,
+                spanish_amount(-t.amount),
+                currency,
+            ]
+        )
+    rows.append([XLS_DEBIT_LINE, "", "", "", "", ""])
+    rows.append(["01/01", "RECIBO", "MADRID", BBVA_CARD, "100,00", "EUR"])
+
+    pyexcel.save_as(array=rows, dest_file_name=str(path))
+    return path
+
+
+def write_bbva_xlsx(path: Path, transactions: Sequence[Transaction]) -> Path:
+    """Write a BBVA XLSX statement, laid out as the export of the BBVA web."""
+    import pyexcel
+
+    title = "Listado de movimientos"
+    generated = f"Fecha de generación del informe: {dt.date.today():%d/%m/%Y}"
+    rows: list[list[str | float]] = [
+        [""] * 7,
+        ["", "", "", title, title, title, title],
+        ["", "", "", generated, generated, generated, generated],
+        [""] * 7,
+        BBVA_XLSX_HEADER,
+    ]
+    rows.extend(
+        ["", f"{t.date:%d/%m/%Y}", BBVA_CARD, t.payee, t.amount, "€", ""] for t in transactions
+    )
+
+    pyexcel.save_as(array=rows, dest_file_name=str(path))
+    return path
+
+
+def pdf_text(x: float, y: float, text: str, size: int = 8) -> bytes:
+    escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return b"BT /F1 %d Tf %.1f %.1f Td (" % (size, x, y) + escaped.encode("cp1252") + b") Tj ET\n"
+
+
+def pdf_page_content(rows: Sequence[tuple[str, str, str]]) -> bytes:
+    bottom = PDF_TABLE_TOP - PDF_ROW_HEIGHT * len(rows)
+    content = bytearray(b"0.5 w\n")
+
+    # Ruling lines so the table is found by the lines strategy of pdfplumber
+    for idx in range(len(rows) + 1):
+        y = PDF_TABLE_TOP - PDF_ROW_HEIGHT * idx
+        content += b"%d %d m %d %d l S\n" % (PDF_COLUMNS[0], y, PDF_COLUMNS[-1], y)
+    for x in PDF_COLUMNS:
+        content += b"%d %d m %d %d l S\n" % (x, PDF_TABLE_TOP, x, bottom)
+
+    for idx, row in enumerate(rows):
+        top = PDF_TABLE_TOP - PDF_ROW_HEIGHT * idx
+        for column, cell in enumerate(row):
+            for line_number, line in enumerate(cell.splitlines()):
+                content += pdf_text(PDF_COLUMNS[column] + 4, top - 11 - 10 * line_number, line)
+
+    return bytes(content)
+
+
+def build_pdf(pages: Sequence[bytes]) -> bytes:
+    """Build a PDF document with one page per content stream, using Helvetica for all text."""
+    n_pages = len(pages)
+    # Objects 1 to 3 are the catalog, the page tree and the font. Then a page and its contents
+    kids = " ".join(f"{4 + 2 * idx} 0 R" for idx in range(n_pages))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {n_pages} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    for idx, content in enumerate(pages):
+        objects.append(
+            (
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PDF_PAGE_WIDTH} {PDF_PAGE_HEIGHT}] "
+                f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * idx} 0 R >>"
+            ).encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+
+    document = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(document))
+        document += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+
+    xref = len(document)
+    document += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    document += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    document += b"trailer\n<< /Size %d /Root 1 0 R >>\n" % (len(objects) + 1)
+    document += b"startxref\n%d\n%%%%EOF\n" % xref
+    return bytes(document)
+
+
+def write_bbva_pdf(
+    path: Path,
+    transactions: Sequence[Transaction],
+    seed: int = 0,
+    header: Sequence[str] = PDF_HEADER,
+) -> Path:
+    """
+    Write a BBVA PDF statement with a three column table on every page.
+
+    As in the real statements, the date cell also holds the date the transaction was settled
+    and some payees have a second line with the spending category.
+    """
+    rng = random.Random(seed)
+    pages = []
+    for page_transactions in batched(transactions, PDF_ROWS_PER_PAGE - 1, strict=False):
+        rows = [tuple(header)]
+        for t in page_transactions:
+            settled = t.date + dt.timedelta(days=rng.randrange(3))
+            payee = f"{t.payee}\nCompras" if rng.random() < 0.3 else t.payee
+            rows.append(
+                (f"{t.date:%d/%m/%Y}\n{settled:%d/%m/%Y}", payee, f"{spanish_amount(t.amount)} €")
+            )
+        pages.append(pdf_page_content(rows))
+
+    path.write_bytes(build_pdf(pages))
+    return path
+
+
+def write_cobee_html(
+    path: Path,
+    transactions: Sequence[Transaction],
+    language: Language = Language.ES,
+    cancelled_rate: float = 0.01,
+    seed: int = 0,
+) -> Path:
+    """
+    Write the HTML of the Cobee wallet page in the given language.
+
+    Some transactions are followed by their cancellation and some accumulations to the card
+    are mixed in, since both are skipped when parsing.
+    """
+    rng = random.Random(seed)
+    identifiers = identifers_by_language(language)
+
+    def entry(date: dt.date, payee: str, amount: float, status: str = "") -> str:
+        status_html = f'<span class="status">{status}</span>' if status else ""
+        return (
+            '<div class="transaction">'
+            f'<p class="date">{date.day} {COBEE_MONTHS[date.month - 1]} {date.year}</p>'
+            f'<p class="payee">{payee}</p>'
+            f'<p class="amount">{spanish_amount(amount)} €</p>'
+            f"{status_html}</div>"
+        )
+
+    entries = []
+    for t in transactions:
+        if rng.random() < cancelled_rate:
+            entries.append(entry(t.date, t.payee, t.amount, status=identifiers.cancelled))
+            continue
+        entries.append(entry(t.date, t.payee, t.amount))
+        if rng.random() < 0.05:
+            entries.append(entry(t.date, identifiers.accumulation, 100.0))
+
+    body = "\n".join(entries)
+    path.write_text(
+        "<!DOCTYPE html>\n"
+        f'<html lang="{language.value}"><head><meta charset="utf-8"><title>Cobee</title>'
+        "<style>.transaction { display: flex; }</style>"
+        "<script>window.dataLayer = window.dataLayer || [];</script></head>"
+        '<body><nav><a href="/home">Cobee</a><a href="/wallet">Wallet</a></nav>'
+        f"<main><h1>Wallet</h1><h2>{identifiers.transactions_line}</h2>"
+        f"{body}</main></body></html>",
+        encoding="utf-8",
+    )
+    return path
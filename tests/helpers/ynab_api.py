@@ -1,7 +1,28 @@
+import json
 from unittest.mock import MagicMock
 
+from urllib3 import HTTPResponse
+
 from ynab_unlinked.ynab_api.client import Client, SupportedApisNames
 
+# Methods of the transactions api whose raw response is also served without preloading content
+RAW_TRANSACTIONS_METHODS = ["get_transactions", "get_transactions_by_account"]
+
+
+def raw_transactions_response(method: MagicMock, *args, **kwargs) -> MagicMock:
+    """Serialize the transactions set as return value of `method` as YNAB would send them"""
+    transactions = method(*args, **kwargs).data.transactions
+    body = json.dumps(
+        {
+            "data": {
+                "transactions": [t.model_dump(mode="json", by_alias=True) for t in transactions],
+                "server_knowledge": 0,
+            }
+        }
+    ).encode()
+    # Without preloading content, the urllib3 response is returned instead of the RESTResponse
+    return MagicMock(spec=HTTPResponse, status=200, data=body)
+
 
 class YnabClientStub(Client):
     def __init__(self, *args, **kwargs):
@@ -15,6 +36,13 @@ class YnabClientStub(Client):
             registered_mock = MagicMock(spec=self._apis.get(api_name))
             self.registry[api_name] = registered_mock
 
+            if api_name == "transactions":
+                for name in RAW_TRANSACTIONS_METHODS:
+                    raw_method = getattr(registered_mock, f"{name}_without_preload_content")
+                    raw_method.side_effect = lambda *args, _name=name, **kwargs: (
+                        raw_transactions_response(getattr(registered_mock, _name), *args, **kwargs)
+                    )
+
         return registered_mock
 
     def budget(self) -> MagicMock:
@@ -0,0 +1,176 @@
+import asyncio
+import datetime as dt
+import json
+
+import pytest
+from ynab.exceptions import ApiException
+
+from tests.factories import AccountFactory
+from tests.helpers.generators import BudgetSpec, generate_budget
+from ynab_unlinked.models import Transaction, TransactionWithYnabData
+from ynab_unlinked.profiling import Profiler
+
+httpx = pytest.importorskip("httpx")
+
+from ynab_unlinked.ynab_api import AsyncClient  # noqa: E402
+
+BUDGET = generate_budget(BudgetSpec(size=20))
+
+
+def transactions_body() -> dict:
+    return {
+        "data": {
+            "transactions": [
+                t.model_dump(mode="json", by_alias=True) for t in BUDGET.ynab_transactions
+            ],
+            "server_knowledge": 1,
+        }
+    }
+
+
+def payees_body() -> dict:
+    return {
+        "data": {
+            "payees": [p.model_dump(mode="json", by_alias=True) for p in BUDGET.payees],
+            "server_knowledge": 1,
+        }
+    }
+
+
+def make_client(handler, **kwargs) -> AsyncClient:
+    return AsyncClient("api-key", transport=httpx.MockTransport(handler), **kwargs)
+
+
+def test_transactions_are_parsed():
+    requests: list[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=transactions_body())
+
+    async def main():
+        async with make_client(handler) as client:
+            return await client.transactions(
+                "budget", account_id="account", since_date=dt.datetime(2025, 1, 2, 10, 30)
+            )
+
+    transactions = asyncio.run(main())
+
+    assert transactions == BUDGET.ynab_transactions
+    (request,) = requests
+    assert request.url.path.endswith("/budgets/budget/accounts/account/transactions")
+    assert request.url.params["since_date"] == "2025-01-02"
+    assert request.headers["Authorization"] == "Bearer api-key"
+
+
+def test_transaction_records_are_parsed():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=transactions_body())
+
+    async def main():
+        async with make_client(handler) as client:
+            return await client.transaction_records("budget", account_id="account")
+
+    records = asyncio.run(main())
+
+    assert [(r.id, r.amount, r.var_date) for r in records] == [
+        (t.id, t.amount, t.var_date) for t in BUDGET.ynab_transactions
+    ]
+
+
+def test_accounts_delta_sends_server_knowledge():
+    requests: list[httpx.Request] = []
+    account = AccountFactory.build()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        body = {"data": {"accounts": [account.model_dump(mode="json")], "server_knowledge": 7}}
+        return httpx.Response(200, json=body)
+
+    async def main():
+        async with make_client(handler) as client:
+            return await client.accounts_delta("budget", last_knowledge_of_server=5)
+
+    accounts, server_knowledge = asyncio.run(main())
+
+    assert ([a.id for a in accounts], server_knowledge) == ([account.id], 7)
+    assert requests[0].url.params["last_knowledge_of_server"] == "5"
+
+
+def test_payees_are_parsed():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path.endswith("/budgets/budget/payees")
+        return httpx.Response(200, json=payees_body())
+
+    async def main():
+        async with make_client(handler) as client:
+            return await client.payees("budget")
+
+    assert asyncio.run(main()) == BUDGET.payees
+
+
+def test_create_transactions_posts_import_ids():
+    bodies: list[dict] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        assert request.method == "POST"
+        bodies.append(json.loads(request.content))
+        return httpx.Response(201, json={})
+
+    transaction = TransactionWithYnabData(
+        Transaction(date=dt.date(2025, 5, 1), payee="Mercadona", amount=-12.5)
+    )
+
+    async def main():
+        async with make_client(handler) as client:
+            await client.create_transactions("budget", "account", [transaction])
+            # Nothing is sent when there is nothing to create
+            await client.create_transactions("budget", "account", [])
+
+    asyncio.run(main())
+
+    (body,) = bodies
+    (sent,) = body["transactions"]
+    assert sent["account_id"] == "account"
+    assert sent["date"] == "2025-05-01"
+    assert sent["amount"] == -12500
+    assert sent["import_id"] == transaction.id
+
+
+def test_concurrent_requests_are_limited():
+    in_flight = 0
+    max_in_flight = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json=payees_body())
+
+    profiler = Profiler(summary=False)
+
+    async def main():
+        async with make_client(handler, max_concurrency=3, profiler=profiler) as client:
+            return await asyncio.gather(*(client.payees(f"budget-{n}") for n in range(10)))
+
+    results = asyncio.run(main())
+
+    assert len(results) == 10
+    assert max_in_flight == 3
+    assert len(profiler.latencies) == 10
+
+
+def test_errors_raise_api_exception():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(429, json={"error": {"id": "429", "name": "too_many_requests"}})
+
+    async def main():
+        async with make_client(handler) as client:
+            await client.accounts("budget")
+
+    with pytest.raises(ApiException) as excinfo:
+        asyncio.run(main())
+
+    assert excinfo.value.status == 429
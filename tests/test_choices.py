@@ -0,0 +1,74 @@
+from ynab_unlinked.choices import Choice
+
+
+def build_account(n_children: int = 3) -> Choice:
+    return Choice(id="account", choices=[f"child-{i}" for i in range(n_children)])
+
+
+def test_to_dict_is_built_once():
+    account = build_account()
+
+    assert account.to_dict() is account.to_dict()
+    assert set(account.to_dict()) == {"account", "account-0", "account-1", "account-2"}
+
+
+def test_selected_parent_selects_children():
+    account = build_account()
+
+    account.select()
+
+    assert all(child.is_selected for child in account.choices)
+    assert account.selected_count == 3
+    assert list(account.selected_choices()) == account.choices
+
+
+def test_selected_count_follows_children_selection():
+    account = build_account()
+
+    account.choices[0].toggle_selection()
+    account.choices[2].select()
+
+    assert account.selected_count == 2
+    assert account.has_selected_choices
+    assert list(account.selected_choices()) == [account.choices[0], account.choices[2]]
+
+    account.choices[0].toggle_selection()
+
+    assert account.selected_count == 1
+
+
+def test_forced_selection_overrides_parent():
+    account = build_account()
+    account.select()
+
+    account.choices[1].enable_forced_selected(False)
+
+    assert not account.choices[1].is_selected
+    assert account.selected_count == 2
+
+    # Forced choices cannot be toggled
+    account.choices[1].toggle_selection()
+    assert not account.choices[1].is_selected
+
+    account.deselect()
+    account.choices[0].enable_forced_selected(True)
+
+    assert account.selected_count == 1
+
+    account.choices[1].disable_forced_selected()
+    account.choices[0].disable_forced_selected()
+
+    assert account.selected_count == 0
+    assert not account.has_selected_choices
+    assert list(account.selected_choices()) == []
+
+
+def test_choices_passed_as_objects_are_counted():
+    child = Choice(id="child", selected=True)
+    forced = Choice(id="forced")
+    forced.enable_forced_selected(True)
+
+    account = Choice(id="account", choices=[child, forced, "other"])
+
+    assert child.parent is account
+    assert account.selected_count == 2
@@ -0,0 +1,78 @@
+from collections.abc import Generator
+
+import pytest
+from ynab.exceptions import ApiException
+
+from tests.helpers.fake_ynab import DEFAULT_BUDGET_ID, FakeYnab
+from tests.helpers.generators import BudgetSpec, SyntheticBudget, generate_budget
+from ynab_unlinked.models import TransactionRecord
+from ynab_unlinked.profiling import Profiler
+from ynab_unlinked.ynab_api import Client
+
+
+@pytest.fixture(scope="module")
+def budget() -> SyntheticBudget:
+    return generate_budget(BudgetSpec(size=50))
+
+
+@pytest.fixture
+def server(budget: SyntheticBudget) -> Generator[FakeYnab]:
+    with FakeYnab(budget) as server:
+        yield server
+
+
+def test_transaction_records_have_fields_of_transactions(server: FakeYnab):
+    client = Client("api-key", host=server.url)
+
+    details = client.transactions(DEFAULT_BUDGET_ID)
+    records = client.transaction_records(DEFAULT_BUDGET_ID)
+
+    assert all(isinstance(record, TransactionRecord) for record in records)
+    assert records == [
+        TransactionRecord(
+            id=t.id,
+            account_id=t.account_id,
+            var_date=t.var_date,
+            amount=t.amount,
+            cleared=t.cleared,
+            payee_name=t.payee_name,
+            payee_id=t.payee_id,
+            import_id=t.import_id,
+            deleted=t.deleted,
+        )
+        for t in details
+    ]
+
+
+def test_transaction_records_with_profiler(server: FakeYnab, budget: SyntheticBudget):
+    profiler = Profiler()
+    client = Client("api-key", profiler=profiler, host=server.url)
+
+    with profiler.phase("fetch") as phase:
+        records = client.transaction_records(DEFAULT_BUDGET_ID)
+
+    assert len(records) == len(budget.ynab_transactions)
+    assert phase.api_calls == 1
+    assert phase.api_bytes > 0
+
+
+def test_budget_settings(server: FakeYnab):
+    client = Client("api-key", host=server.url)
+
+    settings = client.budget_settings(DEFAULT_BUDGET_ID)
+
+    assert settings.date_format is not None
+    assert settings.date_format.format == "DD/MM/YYYY"
+    assert settings.currency_format is not None
+    assert settings.currency_format.iso_code == "EUR"
+    assert server.requests == [("GET", f"/budgets/{DEFAULT_BUDGET_ID}/settings")]
+
+
+def test_transaction_records_raise_api_errors(budget: SyntheticBudget):
+    with FakeYnab(budget, rate_limit=0) as server:
+        client = Client("api-key", host=server.url)
+
+        with pytest.raises(ApiException) as excinfo:
+            client.transaction_records(DEFAULT_BUDGET_ID, account_id=budget.spec.account_id)
+
+    assert excinfo.value.status == 429
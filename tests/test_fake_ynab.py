@@ -0,0 +1,72 @@
+import datetime as dt
+from collections.abc import Generator
+
+import pytest
+from ynab.exceptions import ApiException
+
+from tests.helpers.fake_ynab import DEFAULT_BUDGET_ID, FakeYnab
+from tests.helpers.generators import BudgetSpec, SyntheticBudget, generate_budget
+from ynab_unlinked.models import Transaction, TransactionWithYnabData
+from ynab_unlinked.ynab_api import Client
+
+ACCOUNT_ID = "account-0"
+
+
+@pytest.fixture(scope="module")
+def budget() -> SyntheticBudget:
+    return generate_budget(BudgetSpec(size=50, account_id=ACCOUNT_ID))
+
+
+@pytest.fixture
+def server(budget: SyntheticBudget) -> Generator[FakeYnab]:
+    with FakeYnab(budget) as server:
+        yield server
+
+
+def test_transactions_since_date(server: FakeYnab, budget: SyntheticBudget):
+    client = Client("api-key", host=server.url)
+    since = dt.date(2025, 1, 1)
+
+    transactions = client.transactions(DEFAULT_BUDGET_ID, account_id=ACCOUNT_ID, since_date=since)
+
+    expected = [t for t in budget.ynab_transactions if t.var_date >= since]
+    assert sorted(t.id for t in transactions) == sorted(t.id for t in expected)
+    assert server.requests == [
+        ("GET", f"/budgets/{DEFAULT_BUDGET_ID}/accounts/{ACCOUNT_ID}/transactions")
+    ]
+
+
+def test_created_transactions_are_returned_as_delta(server: FakeYnab):
+    client = Client("api-key", host=server.url)
+    api = client.api("transactions")
+    knowledge = api.get_transactions(DEFAULT_BUDGET_ID).data.server_knowledge
+
+    transaction = TransactionWithYnabData(
+        Transaction(date=dt.date(2025, 5, 1), payee="New Payee", amount=-3.5)
+    )
+    client.create_transactions(DEFAULT_BUDGET_ID, ACCOUNT_ID, [transaction])
+    # Creating the same import id again does not duplicate it
+    client.create_transactions(DEFAULT_BUDGET_ID, ACCOUNT_ID, [transaction])
+
+    delta = api.get_transactions(DEFAULT_BUDGET_ID, last_knowledge_of_server=knowledge).data
+    assert [(t.import_id, t.amount, t.payee_name) for t in delta.transactions] == [
+        (transaction.id, -3500, "New Payee")
+    ]
+    assert delta.server_knowledge > knowledge
+    assert "New Payee" in {p.name for p in client.payees(DEFAULT_BUDGET_ID)}
+
+    server.reset()
+    assert transaction.id not in {t.import_id for t in client.transactions(DEFAULT_BUDGET_ID)}
+
+
+def test_requests_above_rate_limit_are_rejected(budget: SyntheticBudget):
+    with FakeYnab(budget, rate_limit=2) as server:
+        client = Client("api-key", host=server.url)
+        client.accounts(DEFAULT_BUDGET_ID)
+        client.accounts(DEFAULT_BUDGET_ID)
+
+        with pytest.raises(ApiException) as excinfo:
+            client.accounts(DEFAULT_BUDGET_ID)
+
+    assert excinfo.value.status == 429
+    assert len(server.requests) == 3
@@ -0,0 +1,48 @@
+import datetime as dt
+
+from ynab_unlinked.ledger import ID_SIZE, ImportLedger
+from ynab_unlinked.models import Transaction
+from ynab_unlinked.process import filter_transactions, preprocess_transactions
+
+DAY = dt.date(2025, 5, 1)
+
+
+def test_ledger_is_kept_between_runs():
+    transactions = [
+        Transaction(DAY, "Shop", -10.0),
+        Transaction(DAY, "Shop", -10.0),
+        Transaction(DAY, "Other shop", -5.0),
+    ]
+    preprocess_transactions(transactions, None)
+
+    ImportLedger("account").add(transactions[:2])
+    ledger = ImportLedger("account")
+
+    assert len(ledger) == 2
+    assert ImportLedger.path("account").stat().st_size == 2 * ID_SIZE
+    assert list(filter_transactions(transactions, ledger)) == transactions[2:]
+    assert list(filter_transactions(transactions, ImportLedger("other-account"))) == transactions
+
+
+def test_duplicated_transactions_are_told_apart_by_their_counter():
+    first = Transaction(DAY, "Shop", -10.0)
+    ImportLedger("account").add([first])
+
+    transactions = [Transaction(DAY, "Shop", -10.0), Transaction(DAY, "Shop", -10.0)]
+    preprocess_transactions(transactions, None)
+
+    assert list(filter_transactions(transactions, ImportLedger("account"))) == transactions[1:]
+
+
+def test_incomplete_ids_are_ignored():
+    transactions = [Transaction(DAY, "Shop", -10.0), Transaction(DAY, "Other shop", -5.0)]
+    ImportLedger("account").add(transactions[:1])
+    with ImportLedger.path("account").open("ab") as ledger_file:
+        ledger_file.write(b"\x00" * (ID_SIZE - 1))
+
+    ledger = ImportLedger("account")
+    assert len(ledger) == 1
+    ledger.add(transactions[1:])
+
+    assert ImportLedger.path("account").stat().st_size == 2 * ID_SIZE
+    assert all(t in ImportLedger("account") for t in transactions)
@@ -0,0 +1,91 @@
+import datetime as dt
+
+import pytest
+
+from tests.factories import TransactionDetailFactory
+from tests.helpers.generators import BudgetSpec, generate_budget
+from ynab_unlinked.config import ConfigV2
+from ynab_unlinked.context_object import YnabUnlinkedContext
+from ynab_unlinked.matcher import (
+    TIME_WINDOW_MATCH_DAYS,
+    MatchingIndex,
+    match_transactions,
+    match_transactions_windowed,
+)
+from ynab_unlinked.models import Transaction, TransactionWithYnabData
+from ynab_unlinked.process import preprocess_transactions
+
+pytestmark = [pytest.mark.version("V2"), pytest.mark.usefixtures("config")]
+
+SPEC = BudgetSpec(size=500, date_spread_days=200)
+
+
+def matched_transactions(config: ConfigV2, windowed: bool) -> list[tuple]:
+    budget = generate_budget(SPEC)
+    preprocess_transactions(budget.transactions, None)
+    transactions = [TransactionWithYnabData(t) for t in budget.transactions]
+    ynab_transactions = sorted(budget.ynab_transactions, key=lambda t: t.var_date)
+
+    if windowed:
+        match_transactions_windowed(transactions, MatchingIndex(ynab_transactions), False, config)
+    else:
+        match_transactions(transactions, ynab_transactions, False, config)
+
+    return [(t.id, t.match_status, t.ynab_id) for t in transactions]
+
+
+def test_windowed_matching_matches_like_full_matching(context_obj: YnabUnlinkedContext):
+    assert matched_transactions(context_obj.config, windowed=True) == matched_transactions(
+        context_obj.config, windowed=False
+    )
+
+
+def test_index_holds_transactions_around_date():
+    start = dt.date(2025, 1, 1)
+    ynab_transactions = [
+        TransactionDetailFactory(var_date=start + dt.timedelta(days=n), import_id=f"import-{n}")
+        for n in range(100)
+    ]
+    index = MatchingIndex(ynab_transactions)
+
+    dates = [t.var_date for t in index.around(start + dt.timedelta(days=50))]
+
+    assert dates[0] == start + dt.timedelta(days=50 - TIME_WINDOW_MATCH_DAYS)
+    assert dates[-1] == start + dt.timedelta(days=50 + TIME_WINDOW_MATCH_DAYS)
+    assert len(dates) == 2 * TIME_WINDOW_MATCH_DAYS + 1
+    # Import ids are looked up in every transaction, not only in the ones around the date
+    assert set(index.by_import_id) == {t.import_id for t in ynab_transactions}
+
+
+def test_windowed_matching_by_import_id_outside_window(context_obj: YnabUnlinkedContext):
+    day = dt.date(2025, 3, 1)
+    transaction = TransactionWithYnabData(Transaction(day, "Shop", -10.0))
+    # The date of the transaction was edited in YNAB after it was imported
+    ynab_transaction = TransactionDetailFactory(
+        var_date=day + dt.timedelta(days=3 * TIME_WINDOW_MATCH_DAYS),
+        amount=-10000,
+        payee_name="Shop",
+        import_id=transaction.id,
+    )
+
+    match_transactions_windowed(
+        [transaction], MatchingIndex([ynab_transaction]), False, context_obj.config
+    )
+
+    assert transaction.ynab_id == ynab_transaction.id
+
+
+def test_windowed_matching_across_calls(context_obj: YnabUnlinkedContext):
+    day = dt.date(2025, 3, 1)
+    ynab_transaction = TransactionDetailFactory(var_date=day, amount=-10000, payee_name="Shop")
+    index = MatchingIndex([ynab_transaction])
+    ynab_matched: set[str] = set()
+
+    first = [TransactionWithYnabData(Transaction(day, "Shop", -10.0))]
+    second = [TransactionWithYnabData(Transaction(day + dt.timedelta(days=1), "Shop", -10.0))]
+    match_transactions_windowed(first, index, False, context_obj.config, ynab_matched)
+    match_transactions_windowed(second, index, False, context_obj.config, ynab_matched)
+
+    # A YNAB transaction is only matched once
+    assert first[0].ynab_id == ynab_transaction.id
+    assert second[0].ynab_id is None
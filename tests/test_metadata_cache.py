@@ -0,0 +1,74 @@
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from tests.helpers.fake_ynab import DEFAULT_BUDGET_ID, FakeYnab
+from tests.helpers.generators import BudgetSpec, SyntheticBudget, generate_budget
+from ynab_unlinked.profiling import Profiler
+from ynab_unlinked.ynab_api import Client, MetadataCache
+
+ACCOUNTS_PATH = f"/budgets/{DEFAULT_BUDGET_ID}/accounts"
+
+
+@pytest.fixture(scope="module")
+def budget() -> SyntheticBudget:
+    return generate_budget(BudgetSpec(size=10))
+
+
+@pytest.fixture
+def server(budget: SyntheticBudget) -> Generator[FakeYnab]:
+    with FakeYnab(budget) as server:
+        yield server
+
+
+@pytest.fixture
+def client(server: FakeYnab) -> Client:
+    return Client("api-key", host=server.url)
+
+
+def test_cached_accounts_are_refreshed_in_background(
+    server: FakeYnab, client: Client, budget: SyntheticBudget, metadata_cache_dir: Path
+):
+    account_id = budget.spec.account_id
+    first = MetadataCache(client).accounts(DEFAULT_BUDGET_ID)
+    assert [acc.id for acc in first] == [account_id]
+    assert MetadataCache.path("api-key").is_relative_to(metadata_cache_dir)
+
+    server.update_account(account_id, cleared_balance=5000)
+    profiler = Profiler(summary=False)
+    cache = MetadataCache(client, profiler)
+
+    # The stale accounts are served right away
+    assert cache.accounts(DEFAULT_BUDGET_ID)[0].cleared_balance == first[0].cleared_balance
+    cache.wait()
+
+    assert MetadataCache(client).accounts(DEFAULT_BUDGET_ID)[0].cleared_balance == 5000
+    assert profiler.caches["metadata"].hits == 1
+
+
+def test_fresh_accounts_only_request_changes(
+    server: FakeYnab, client: Client, budget: SyntheticBudget
+):
+    cache = MetadataCache(client)
+    cache.accounts(DEFAULT_BUDGET_ID)
+    server.update_account(budget.spec.account_id, name="Renamed")
+    server.requests.clear()
+
+    accounts = cache.accounts(DEFAULT_BUDGET_ID, fresh=True)
+
+    assert [acc.name for acc in accounts] == ["Renamed"]
+    assert server.requests == [("GET", ACCOUNTS_PATH)]
+
+
+def test_failed_background_refresh_keeps_cache(budget: SyntheticBudget):
+    with FakeYnab(budget, rate_limit=1) as server:
+        client = Client("api-key", host=server.url)
+        expected = MetadataCache(client).budgets()
+
+        cache = MetadataCache(client)
+        assert cache.budgets() == expected
+        cache.wait()
+
+    assert MetadataCache(client).budgets() == expected
+    assert len(server.requests) == 2
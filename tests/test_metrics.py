@@ -0,0 +1,39 @@
+import json
+from pathlib import Path
+
+from ynab_unlinked.metrics import RunMetrics, latency_summary, metrics_record, write_metrics
+from ynab_unlinked.profiling import Profiler
+
+
+def test_latency_summary():
+    summary = latency_summary([0.1, 0.2, 0.3, 0.4])
+
+    assert summary is not None
+    assert summary["total_ms"] == 1000
+    assert summary["mean_ms"] == 250
+    assert summary["p50_ms"] == 300
+    assert summary["max_ms"] == 400
+    assert latency_summary([]) is None
+
+
+def test_metrics_record_and_write(tmp_path: Path):
+    input_file = tmp_path / "statement.txt"
+    input_file.write_text("12345")
+    profiler = Profiler(summary=False)
+    with profiler.phase("fetch", rows=2):
+        profiler.record_request(0.5, 2048)
+    profiler.record_cache("payees", hit=True)
+    profiler.record_cache("payees", hit=False)
+    metrics = RunMetrics(entity="sabadell", input_file=input_file, parsed=2, completed=True)
+
+    metrics_file = tmp_path / "metrics" / "yul.jsonl"
+    write_metrics(metrics_file, metrics_record("load", metrics, profiler))
+    write_metrics(metrics_file, metrics_record("load", metrics, profiler))
+
+    first, second = (json.loads(line) for line in metrics_file.read_text().splitlines())
+    assert first["file_size"] == 5
+    assert first["api"]["calls"] == 1
+    assert first["api"]["bytes"] == 2048
+    assert first["cache"] == {"payees": {"hits": 1, "misses": 1, "hit_rate": 0.5}}
+    assert first["phases"]["fetch"]["rows"] == 2
+    assert second["entity"] == "sabadell"
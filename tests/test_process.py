@@ -0,0 +1,178 @@
+import datetime as dt
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from tests.helpers.generators import BudgetSpec, generate_budget
+from tests.helpers.load_entity import StubEntity
+from tests.helpers.ynab_api import YnabClientStub
+from ynab_unlinked import process
+from ynab_unlinked.config import ConfigV2
+from ynab_unlinked.config.models import Checkpoint
+from ynab_unlinked.context_object import YnabUnlinkedContext
+from ynab_unlinked.matcher import match_transactions
+from ynab_unlinked.models import MatchStatus, PartialMatchPolicy, Transaction
+from ynab_unlinked.models import TransactionWithYnabData as YnabTransaction
+from ynab_unlinked.payee import set_payee_from_ynab
+from ynab_unlinked.process import date_chunks, import_in_chunks, preprocess_transactions
+
+pytestmark = [pytest.mark.version("V2"), pytest.mark.usefixtures("config")]
+
+SPEC = BudgetSpec(size=300, date_spread_days=60)
+
+
+def test_date_chunks_do_not_split_dates():
+    day = dt.date(2025, 5, 1)
+    transactions = [
+        Transaction(day + dt.timedelta(days=offset), "Payee", 1.0) for offset in [0, 0, 0, 1, 2, 2]
+    ]
+
+    chunks = list(date_chunks(transactions, 2))
+
+    assert [len(chunk) for chunk in chunks] == [3, 3]
+    assert [t for chunk in chunks for t in chunk] == transactions
+
+
+@pytest.mark.parametrize("policy", [PartialMatchPolicy.ACCEPT, PartialMatchPolicy.REJECT])
+def test_import_in_chunks_matches_like_full_import(
+    context_obj: YnabUnlinkedContext,
+    ynab_api: YnabClientStub,
+    mocker: MockerFixture,
+    policy: PartialMatchPolicy,
+):
+    mocker.patch.object(ConfigV2, "save")
+    mocker.patch.object(process, "PIPELINE_CHUNK_SIZE", 50)
+    budget = generate_budget(SPEC)
+    ynab_api.api(
+        "transactions"
+    ).get_transactions_by_account.return_value.data.transactions = budget.ynab_transactions
+    ynab_api.api("payees").get_payees.return_value.data.payees = budget.payees
+    context_obj.partial_matches = policy
+
+    result = import_in_chunks(
+        StubEntity(budget.transactions), Path(), context_obj, account_id="TestAccountID"
+    )
+
+    # Import the same statement at once to compare
+    expected = generate_budget(SPEC)
+    preprocess_transactions(expected.transactions, None)
+    transactions = [YnabTransaction(t) for t in expected.transactions]
+    match_transactions(transactions, expected.ynab_transactions, False, context_obj.config)
+    set_payee_from_ynab(transactions, ynab_api, context_obj.config, payees=expected.payees)
+    partial_matches = [
+        t for t in transactions if t.match_status is MatchStatus.PARTIAL_MATCH and t.needs_creation
+    ]
+    if policy is PartialMatchPolicy.REJECT:
+        for t in partial_matches:
+            t.reset_matching()
+
+    assert result.chunks > 1
+    assert result.parsed == SPEC.size
+    assert result.created == sum(t.needs_creation for t in transactions)
+    if policy is PartialMatchPolicy.REJECT:
+        # Accepted partial matches add payee rules that turn later partial matches into matches
+        assert result.matched == sum(t.match_status is MatchStatus.MATCHED for t in transactions)
+        assert result.partial_matches == len(partial_matches)
+
+    create_calls = ynab_api.api("transactions").create_transaction.call_args_list
+    assert 1 < len(create_calls) <= result.chunks
+    assert ynab_api.api("payees").get_payees.call_count == 1
+
+
+def test_nothing_newer_than_checkpoint_is_not_imported(
+    context_obj: YnabUnlinkedContext, ynab_api: YnabClientStub, mocker: MockerFixture
+):
+    mocker.patch.object(ConfigV2, "save")
+    day = dt.date(2025, 5, 1)
+    transactions = [Transaction(day - dt.timedelta(days=n), "Shop", -1.0) for n in range(5)]
+    preprocess_transactions(transactions, None)
+    context_obj.config.entities["test"].checkpoint = Checkpoint.from_transactions(transactions)
+    transactions_api = ynab_api.api("transactions")
+
+    statement = [Transaction(t.date, t.payee, t.amount) for t in reversed(transactions)]
+    result = import_in_chunks(
+        StubEntity(statement), Path(), context_obj, account_id="TestAccountID"
+    )
+
+    # Only the transactions since the checkpoint are parsed
+    assert result.parsed == result.skipped == 3
+    assert not transactions_api.mock_calls
+
+    transactions_api.get_transactions_by_account.return_value.data.transactions = []
+    ynab_api.api("payees").get_payees.return_value.data.payees = []
+    statement = [*statement, Transaction(day, "Shop", -1.0)]
+    result = import_in_chunks(
+        StubEntity(statement), Path(), context_obj, account_id="TestAccountID"
+    )
+
+    # The duplicated transaction on the latest day is new
+    assert result.skipped == 0
+    assert result.created == result.parsed == 4
+
+
+def test_checkpoints_are_kept_by_account(
+    context_obj: YnabUnlinkedContext, ynab_api: YnabClientStub, mocker: MockerFixture
+):
+    mocker.patch.object(ConfigV2, "save")
+    day = dt.date(2025, 5, 1)
+    transactions = [Transaction(day - dt.timedelta(days=n), "Shop", -1.0) for n in range(5)]
+    preprocess_transactions(transactions, None)
+    checkpoint = Checkpoint.from_transactions(transactions)
+    entity_config = context_obj.config.entities["test"]
+    entity_config.checkpoint = checkpoint
+    ynab_api.api("transactions").get_transactions_by_account.return_value.data.transactions = []
+    ynab_api.api("payees").get_payees.return_value.data.payees = []
+
+    statement = [Transaction(t.date, t.payee, t.amount) for t in transactions]
+    result = import_in_chunks(
+        StubEntity(statement), Path(), context_obj, account_id="OtherAccountID"
+    )
+
+    # The checkpoint of the entity account says nothing about the other account
+    assert result.parsed == result.created == 5
+    assert entity_config.checkpoint == checkpoint
+    assert entity_config.checkpoint_for("OtherAccountID") == checkpoint
+
+    statement = [Transaction(t.date, t.payee, t.amount) for t in transactions]
+    result = import_in_chunks(
+        StubEntity(statement), Path(), context_obj, account_id="OtherAccountID"
+    )
+
+    assert result.parsed == result.skipped == 3
+    assert result.created == 0
+
+
+def test_import_in_chunks_uploads_while_parsing(
+    context_obj: YnabUnlinkedContext, ynab_api: YnabClientStub, mocker: MockerFixture
+):
+    mocker.patch.object(ConfigV2, "save")
+    mocker.patch.object(process, "PIPELINE_CHUNK_SIZE", 2)
+    day = dt.date(2025, 5, 1)
+    context_obj.config.entities["test"].checkpoint = Checkpoint(
+        latest_date_processed=day - dt.timedelta(days=30)
+    )
+    transactions_api = ynab_api.api("transactions")
+    transactions_api.get_transactions_by_account.return_value.data.transactions = []
+    ynab_api.api("payees").get_payees.return_value.data.payees = []
+    events: list[str] = []
+    transactions_api.create_transaction.side_effect = lambda *args, **kwargs: events.append(
+        "upload"
+    )
+
+    class LoggingEntity(StubEntity):
+        def iter_parse(self, input_file, context, since=None):
+            for t in self.parse(input_file, context, since):
+                events.append("parse")
+                yield t
+
+    statement = [Transaction(day - dt.timedelta(days=n), "Shop", -1.0) for n in range(6)]
+    result = import_in_chunks(
+        LoggingEntity(statement), Path(), context_obj, account_id="TestAccountID"
+    )
+
+    assert result.created == result.parsed == 6
+    # Each chunk is uploaded before the next one is parsed
+    assert events[:4] == ["parse", "parse", "parse", "upload"]
+    assert events.count("upload") == result.chunks == 3
+    assert transactions_api.get_transactions_by_account_without_preload_content.call_count == 1
@@ -0,0 +1,116 @@
+import json
+import pstats
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from ynab.configuration import Configuration
+
+from ynab_unlinked.profiling import NullProfiler, Profiler
+from ynab_unlinked.ynab_api.client import ProfiledApiClient
+
+
+def test_phase_measures_rows_and_time():
+    profiler = Profiler()
+
+    with profiler.phase("parse", rows=10):
+        sum(range(10_000))
+    with profiler.phase("match") as phase:
+        phase.rows = 5
+
+    parse, match = profiler.phases
+    assert (parse.name, parse.rows) == ("parse", 10)
+    assert (match.name, match.rows) == ("match", 5)
+    assert parse.wall > 0
+    assert match.start >= parse.start + parse.wall
+
+
+def test_requests_are_attributed_to_innermost_phase():
+    profiler = Profiler()
+
+    profiler.record_request(1.0, 100)
+    with profiler.phase("outer") as outer:
+        profiler.record_request(0.5, 10)
+        with profiler.phase("inner") as inner:
+            profiler.record_request(0.25, 20)
+            profiler.record_request(0.25, 20)
+
+    assert (outer.api_calls, outer.api_time, outer.api_bytes) == (1, 0.5, 10)
+    assert (inner.api_calls, inner.api_time, inner.api_bytes) == (2, 0.5, 40)
+
+
+def test_phases_of_each_thread_are_kept_apart():
+    profiler = Profiler()
+    inner_opened = threading.Event()
+    main_closed = threading.Event()
+
+    def import_in_thread():
+        with profiler.phase("thread") as phase:
+            inner_opened.set()
+            main_closed.wait()
+            profiler.record_request(0.25, 20)
+        return phase
+
+    thread = threading.Thread(target=import_in_thread)
+    with profiler.phase("main") as main:
+        thread.start()
+        inner_opened.wait()
+        profiler.record_request(0.5, 10)
+    main_closed.set()
+    thread.join()
+
+    (thread_phase,) = [phase for phase in profiler.phases if phase.name == "thread"]
+    assert (main.api_calls, main.api_bytes) == (1, 10)
+    assert (thread_phase.api_calls, thread_phase.api_bytes) == (1, 20)
+    assert [phase.name for phase in profiler.phases] == ["main", "thread"]
+
+
+def test_profiled_api_client_records_response_size():
+    profiler = Profiler()
+    client = ProfiledApiClient(Configuration(access_token="key"), profiler)
+    response = MagicMock()
+    response.read.return_value = b"x" * 42
+    client.rest_client = MagicMock()
+    client.rest_client.request.return_value = response
+
+    with profiler.phase("fetch") as phase:
+        assert client.call_api("GET", "https://api.ynab.com/v1/budgets") is response
+
+    assert phase.api_calls == 1
+    assert phase.api_bytes == 42
+
+
+def test_report_writes_chrome_trace(tmp_path: Path):
+    output = tmp_path / "trace.json"
+    profiler = Profiler(output=output)
+    with profiler.phase("parse", rows=3):
+        pass
+
+    profiler.report()
+
+    (event,) = json.loads(output.read_text())["traceEvents"]
+    assert event["name"] == "parse"
+    assert event["ph"] == "X"
+    assert event["args"]["rows"] == 3
+
+
+def test_report_writes_pstats(tmp_path: Path):
+    output = tmp_path / "profile.pstats"
+    profiler = Profiler(output=output)
+    with profiler.phase("parse"):
+        sorted(range(1000), reverse=True)
+
+    profiler.report()
+
+    assert pstats.Stats(str(output)).total_calls > 0
+
+
+def test_null_profiler_records_nothing():
+    profiler = NullProfiler()
+
+    with profiler.phase("parse", rows=3) as phase:
+        profiler.record_request(1.0, 100)
+
+    assert phase.rows == 3
+    assert phase.api_calls == 0
+    assert profiler.phases == []